@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import os
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, Iterator, List, Optional, Sequence
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class BalancerSettings:
+    strategy: str = "least_outstanding"
+    failure_threshold: int = 3
+    reset_timeout: float = 15.0
+    ewma_alpha: float = 0.3
+
+    @classmethod
+    def from_env(cls) -> "BalancerSettings":
+        return cls(
+            strategy=os.getenv("LLM_BALANCER_STRATEGY", "least_outstanding"),
+            failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "3")),
+            reset_timeout=float(os.getenv("LLM_BREAKER_RESET_SECONDS", "15")),
+            ewma_alpha=float(os.getenv("LLM_BALANCER_EWMA_ALPHA", "0.3")),
+        )
+
+
+@dataclass
+class CircuitBreaker:
+    failure_threshold: int
+    reset_timeout: float
+    state: BreakerState = BreakerState.CLOSED
+    failures: int = 0
+    opened_at: float = 0.0
+    probing: bool = False
+
+    def available(self, now: float) -> bool:
+        if self.state == BreakerState.CLOSED:
+            return True
+        if self.state == BreakerState.OPEN:
+            return now - self.opened_at >= self.reset_timeout
+        return not self.probing
+
+    def on_dispatch(self, now: float) -> bool:
+        """Return True when this call is the half-open probe."""
+        if self.state == BreakerState.OPEN and now - self.opened_at >= self.reset_timeout:
+            self.state = BreakerState.HALF_OPEN
+        if self.state == BreakerState.HALF_OPEN:
+            self.probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self, now: float) -> None:
+        self.probing = False
+        if self.state == BreakerState.HALF_OPEN:
+            self._open(now)
+            return
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self._open(now)
+
+    def release_probe(self) -> None:
+        self.probing = False
+
+    def _open(self, now: float) -> None:
+        self.state = BreakerState.OPEN
+        self.opened_at = now
+        self.failures = 0
+
+
+@dataclass
+class Replica:
+    endpoint: str
+    breaker: CircuitBreaker
+    ewma_alpha: float = 0.3
+    outstanding: int = 0
+    ewma: Optional[float] = None
+
+    def observe_latency(self, seconds: float) -> None:
+        if self.ewma is None:
+            self.ewma = seconds
+        else:
+            self.ewma = self.ewma_alpha * seconds + (1 - self.ewma_alpha) * self.ewma
+
+    @contextmanager
+    def dispatch(self) -> Iterator["ReplicaCall"]:
+        now = time.monotonic()
+        call = ReplicaCall(replica=self, started=now, probe=self.breaker.on_dispatch(now))
+        self.outstanding += 1
+        try:
+            yield call
+        finally:
+            self.outstanding -= 1
+            if call.probe and not call.resolved:
+                self.breaker.release_probe()
+
+
+@dataclass
+class ReplicaCall:
+    replica: Replica
+    started: float
+    probe: bool = False
+    resolved: bool = False
+
+    def succeeded(self) -> None:
+        self.resolved = True
+        self.replica.breaker.record_success()
+        self.replica.observe_latency(time.monotonic() - self.started)
+
+    def failed(self) -> None:
+        self.resolved = True
+        self.replica.breaker.record_failure(time.monotonic())
+        # Penalise the failing replica so the EWMA picker drifts away from it.
+        self.replica.observe_latency(max(time.monotonic() - self.started, self.replica.ewma or 0.0) * 2)
+
+
+@dataclass
+class ReplicaSet:
+    replicas: List[Replica]
+    strategy: str = "least_outstanding"
+    _rng: random.Random = field(default_factory=random.Random, repr=False)
+
+    def pick(self) -> Replica:
+        if len(self.replicas) == 1:
+            # Nothing to fail over to; retries and the rate limiter handle a lone endpoint.
+            return self.replicas[0]
+        now = time.monotonic()
+        candidates = [replica for replica in self.replicas if replica.breaker.available(now)]
+        if not candidates:
+            # Every circuit is open: try the one closest to its half-open probe instead of failing fast.
+            return min(self.replicas, key=lambda replica: replica.breaker.opened_at)
+        if len(candidates) == 1:
+            return candidates[0]
+        # Power of two choices keeps picks cheap and avoids herding on one replica.
+        first, second = self._rng.sample(candidates, 2)
+        return first if self._score(first) <= self._score(second) else second
+
+    def _score(self, replica: Replica) -> float:
+        latency = replica.ewma if replica.ewma is not None else 0.0
+        if self.strategy == "ewma":
+            return latency * (replica.outstanding + 1)
+        return replica.outstanding + latency * 1e-3
+
+
+class ReplicaRegistry:
+    """Replica health is process-wide so every debate benefits from a tripped breaker."""
+
+    def __init__(self, settings: Optional[BalancerSettings] = None) -> None:
+        self.settings = settings or BalancerSettings.from_env()
+        self._replicas: Dict[str, Replica] = {}
+
+    def get(self, endpoint: str) -> Replica:
+        replica = self._replicas.get(endpoint)
+        if replica is None:
+            replica = Replica(
+                endpoint=endpoint,
+                breaker=CircuitBreaker(
+                    failure_threshold=self.settings.failure_threshold,
+                    reset_timeout=self.settings.reset_timeout,
+                ),
+                ewma_alpha=self.settings.ewma_alpha,
+            )
+            self._replicas[endpoint] = replica
+        return replica
+
+    def replica_set(self, endpoints: Sequence[str]) -> ReplicaSet:
+        return ReplicaSet(
+            replicas=[self.get(endpoint) for endpoint in endpoints],
+            strategy=self.settings.strategy,
+        )
+
+
+_shared_replicas: Optional[ReplicaRegistry] = None
+
+
+def get_shared_replicas() -> ReplicaRegistry:
+    global _shared_replicas
+    if _shared_replicas is None:
+        _shared_replicas = ReplicaRegistry()
+    return _shared_replicas
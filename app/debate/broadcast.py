@@ -0,0 +1,325 @@
+"""Fan-out of live debate events to any number of SSE subscribers.
+
+Each debate gets a ``DebateChannel``: events are numbered, kept in bounded logs
+(so reconnecting clients resume from ``Last-Event-ID``) and offered to every
+subscriber's bounded buffer. Deltas and trace spans get a log of their own so a
+long streamed turn cannot push out the turns a reconnecting client needs. Publishing never awaits, so a slow viewer cannot
+stall the orchestrator: its ``turn_delta`` runs are coalesced, then redundant
+events (deltas, trace spans) are dropped, and as a last resort the oldest
+events are replaced by an ``events_dropped`` notice telling it to reconnect.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional, Set, Tuple
+
+from host_service.metrics import get_registry
+
+logger = logging.getLogger(__name__)
+
+SSE_DROPPED_EVENTS = get_registry().counter(
+    "debate_sse_dropped_events_total", "Events dropped or folded into resync notices for slow SSE subscribers."
+)
+
+# Events whose content reaches the client again later (the full turn, the
+# complete response's metadata.trace), so a lagging subscriber may lose them.
+DROPPABLE_EVENTS = frozenset({"turn_delta", "trace_span"})
+DROPPED_EVENT = "events_dropped"
+
+# (event id or None for notices, {"type": ..., "payload": ...})
+LoggedEvent = Tuple[Optional[int], Dict[str, Any]]
+
+
+@dataclass
+class BroadcastSettings:
+    log_size: int = 4096
+    transient_log_size: int = 1024
+    subscriber_buffer: int = 256
+    retention_seconds: float = 300.0
+    reconnect_grace_seconds: float = 10.0
+
+    @classmethod
+    def from_env(cls) -> "BroadcastSettings":
+        return cls(
+            log_size=int(os.getenv("DEBATE_EVENT_LOG_SIZE", "4096")),
+            transient_log_size=int(os.getenv("DEBATE_DELTA_LOG_SIZE", "1024")),
+            subscriber_buffer=int(os.getenv("DEBATE_SUBSCRIBER_BUFFER", "256")),
+            retention_seconds=float(os.getenv("DEBATE_CHANNEL_RETENTION_SECONDS", "300")),
+            reconnect_grace_seconds=float(os.getenv("DEBATE_RECONNECT_GRACE_SECONDS", "10")),
+        )
+
+
+def _coalesce(previous: Dict[str, Any], event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if previous["type"] != "turn_delta" or event["type"] != "turn_delta":
+        return None
+    before, after = previous["payload"], event["payload"]
+    if before.get("stage") != after.get("stage") or before.get("speaker_name") != after.get("speaker_name"):
+        return None
+    return {"type": "turn_delta", "payload": {**before, "delta": before["delta"] + after["delta"]}}
+
+
+class Subscriber:
+    """One viewer: catches up from the channel log, then follows live events in a bounded buffer."""
+
+    def __init__(self, channel: "DebateChannel", after: int) -> None:
+        self.channel = channel
+        self.capacity = max(2, channel.settings.subscriber_buffer)
+        self.cursor = after
+        self.live = False
+        self.dropped = 0
+        self._buffer: Deque[LoggedEvent] = deque()
+        self._wakeup = asyncio.Event()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def offer(self, item: LoggedEvent) -> None:
+        event_id, event = item
+        if self._buffer:
+            merged = _coalesce(self._buffer[-1][1], event)
+            if merged is not None:
+                self._buffer[-1] = (event_id, merged)
+                self._wakeup.set()
+                return
+        if len(self._buffer) >= self.capacity:
+            self._make_room()
+        self._buffer.append(item)
+        self._wakeup.set()
+
+    def _make_room(self) -> None:
+        for index, (_, buffered) in enumerate(self._buffer):
+            if buffered["type"] in DROPPABLE_EVENTS:
+                del self._buffer[index]
+                self.dropped += 1
+                return
+        # Nothing redundant left: fold the oldest events into one resync notice.
+        count = folded = 0
+        first_id = last_id = None
+        while self._buffer and (len(self._buffer) >= self.capacity - 1 or self._buffer[0][0] is None):
+            event_id, buffered = self._buffer.popleft()
+            if event_id is None:
+                # An earlier notice; its events were already counted as dropped.
+                count += buffered["payload"]["count"]
+                first_id = buffered["payload"]["first_id"] if first_id is None else first_id
+                last_id = buffered["payload"]["last_id"]
+                continue
+            count += 1
+            folded += 1
+            first_id = event_id if first_id is None else first_id
+            last_id = event_id
+        self.dropped += folded
+        self._buffer.appendleft(_dropped_notice(count, first_id, last_id))
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    def close(self) -> None:
+        self._closed = True
+        self._wakeup.set()
+
+    def _next(self) -> Optional[LoggedEvent]:
+        if not self.live:
+            lost = self.channel.lost_through
+            if lost > self.cursor:
+                # Turns after the requested point have already rotated out of the log.
+                notice = _dropped_notice(lost - self.cursor, self.cursor + 1, lost)
+                self.cursor = lost
+                return notice
+            item = self.channel.logged_after(self.cursor)
+            if item is not None:
+                # Replay a backlog of deltas as one chunk, like the live buffer would.
+                following = self.channel.logged_after(item[0])
+                while following is not None:
+                    merged = _coalesce(item[1], following[1])
+                    if merged is None:
+                        break
+                    item = (following[0], merged)
+                    following = self.channel.logged_after(item[0])
+                self.cursor = item[0]
+                return item
+            # Caught up; publish() feeds the buffer from here on.
+            self.live = True
+        if self._buffer:
+            return self._buffer.popleft()
+        return None
+
+    async def events(self) -> AsyncIterator[LoggedEvent]:
+        while True:
+            item = self._next()
+            if item is not None:
+                yield item
+                continue
+            if self._closed or self.channel.closed:
+                return
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+
+def _event_id(item: LoggedEvent) -> int:
+    return item[0]
+
+
+def _dropped_notice(count: int, first_id: Optional[int], last_id: Optional[int]) -> LoggedEvent:
+    return (None, {"type": DROPPED_EVENT, "payload": {"count": count, "first_id": first_id, "last_id": last_id}})
+
+
+class DebateChannel:
+    def __init__(
+        self,
+        debate_id: str,
+        settings: BroadcastSettings,
+        on_abandoned: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self.debate_id = debate_id
+        self.settings = settings
+        self.on_abandoned = on_abandoned
+        self._log: Deque[LoggedEvent] = deque(maxlen=settings.log_size)
+        # Deltas and spans are redundant with later events, so losing old ones is harmless.
+        self._transient_log: Deque[LoggedEvent] = deque(maxlen=settings.transient_log_size)
+        self.lost_through = 0
+        self._next_id = 1
+        self._subscribers: Set[Subscriber] = set()
+        self._abandon_timer: Optional[asyncio.TimerHandle] = None
+        self.closed_at: Optional[float] = None
+
+    @property
+    def closed(self) -> bool:
+        return self.closed_at is not None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def last_id(self) -> int:
+        return self._next_id - 1
+
+    def logged_after(self, event_id: int) -> Optional[LoggedEvent]:
+        """The first still-logged event with an id above ``event_id``."""
+        following: Optional[LoggedEvent] = None
+        for log in (self._log, self._transient_log):
+            index = bisect.bisect_right(log, event_id, key=_event_id)
+            if index < len(log) and (following is None or log[index][0] < following[0]):
+                following = log[index]
+        return following
+
+    def queued_events(self) -> int:
+        return sum(len(subscriber) for subscriber in self._subscribers)
+
+    def publish(self, event_type: str, payload: Any) -> int:
+        """Number, log and fan out one event; never blocks."""
+        if self.closed:
+            raise RuntimeError(f"Debate {self.debate_id} channel is closed.")
+        item: LoggedEvent = (self._next_id, {"type": event_type, "payload": payload})
+        self._next_id += 1
+        if event_type in DROPPABLE_EVENTS:
+            self._transient_log.append(item)
+        else:
+            if len(self._log) == self._log.maxlen:
+                self.lost_through = self._log[0][0]
+            self._log.append(item)
+        for subscriber in self._subscribers:
+            if subscriber.live:
+                subscriber.offer(item)
+            else:
+                subscriber.notify()
+        return item[0]
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed_at = time.monotonic()
+        self._cancel_abandon_timer()
+        for subscriber in self._subscribers:
+            subscriber.close()
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscriber:
+        """Replay logged events after ``last_event_id`` (all when None), then follow live."""
+        subscriber = Subscriber(self, max(0, last_event_id or 0))
+        if not self.closed:
+            self._subscribers.add(subscriber)
+            self._cancel_abandon_timer()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+        if subscriber.dropped:
+            SSE_DROPPED_EVENTS.labels().inc(subscriber.dropped)
+        if not self._subscribers:
+            self.arm_abandon_timer()
+
+    def arm_abandon_timer(self) -> None:
+        """Call ``on_abandoned`` unless a viewer (re)connects within the reconnect grace period."""
+        if self.closed or self.on_abandoned is None:
+            return
+        self._cancel_abandon_timer()
+        loop = asyncio.get_running_loop()
+        self._abandon_timer = loop.call_later(self.settings.reconnect_grace_seconds, self._check_abandoned)
+
+    def _cancel_abandon_timer(self) -> None:
+        if self._abandon_timer is not None:
+            self._abandon_timer.cancel()
+            self._abandon_timer = None
+
+    def _check_abandoned(self) -> None:
+        self._abandon_timer = None
+        if not self._subscribers and not self.closed and self.on_abandoned is not None:
+            logger.info("Debate %s has no viewers left; cancelling.", self.debate_id)
+            self.on_abandoned()
+
+
+class BroadcastHub:
+    """Live and recently finished debate channels, by debate id."""
+
+    def __init__(self, settings: Optional[BroadcastSettings] = None) -> None:
+        self.settings = settings or BroadcastSettings.from_env()
+        self._channels: Dict[str, DebateChannel] = {}
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def open(self, debate_id: str, on_abandoned: Optional[Callable[[], Any]] = None) -> DebateChannel:
+        self._evict_expired()
+        existing = self._channels.get(debate_id)
+        if existing is not None and not existing.closed:
+            raise ValueError(f"Debate {debate_id} is already broadcasting.")
+        channel = DebateChannel(debate_id, self.settings, on_abandoned)
+        self._channels[debate_id] = channel
+        # Covers a client that never starts reading.
+        channel.arm_abandon_timer()
+        return channel
+
+    def get(self, debate_id: str) -> Optional[DebateChannel]:
+        self._evict_expired()
+        return self._channels.get(debate_id)
+
+    def channels(self) -> Tuple[DebateChannel, ...]:
+        return tuple(self._channels.values())
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        expired = [
+            debate_id
+            for debate_id, channel in self._channels.items()
+            if channel.closed_at is not None and now - channel.closed_at > self.settings.retention_seconds
+        ]
+        for debate_id in expired:
+            del self._channels[debate_id]
+
+
+_shared_hub: Optional[BroadcastHub] = None
+
+
+def get_broadcast_hub() -> BroadcastHub:
+    global _shared_hub
+    if _shared_hub is None:
+        _shared_hub = BroadcastHub()
+    return _shared_hub
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+
+from host_service.http_utils import env_flag
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+JournalReply = Tuple[str, Dict[str, Any]]
+
+
+@dataclass
+class CheckpointSettings:
+    enabled: bool = False
+    directory: str = "checkpoints"
+    retention_seconds: float = 86400.0
+    shutdown_grace_seconds: float = 10.0
+
+    @classmethod
+    def from_env(cls) -> "CheckpointSettings":
+        return cls(
+            enabled=env_flag("DEBATE_CHECKPOINTS", False),
+            directory=os.getenv("DEBATE_CHECKPOINT_DIR", "checkpoints"),
+            retention_seconds=float(os.getenv("DEBATE_CHECKPOINT_RETENTION_SECONDS", "86400")),
+            shutdown_grace_seconds=float(os.getenv("DEBATE_SHUTDOWN_GRACE_SECONDS", "10")),
+        )
+
+
+@dataclass
+class DebateCheckpoint:
+    debate_id: str
+    request: Dict[str, Any]
+    debater_order: List[int]
+    status: str = "running"
+    completed_stages: List[str] = field(default_factory=list)
+    counters: Dict[str, int] = field(default_factory=dict)
+    truncated_stages: List[str] = field(default_factory=list)
+    debate_remaining_seconds: Optional[float] = None
+    updated_at: float = field(default_factory=time.time)
+    error: Optional[str] = None
+    journal: Dict[str, JournalReply] = field(default_factory=dict, repr=False)
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            "debate_id": self.debate_id,
+            "request": self.request,
+            "debater_order": self.debater_order,
+            "status": self.status,
+            "completed_stages": self.completed_stages,
+            "counters": self.counters,
+            "truncated_stages": self.truncated_stages,
+            "debate_remaining_seconds": self.debate_remaining_seconds,
+            "updated_at": self.updated_at,
+            "error": self.error,
+        }
+
+
+class CheckpointStore:
+    """One small state file (atomically replaced) plus an append-only call journal per debate."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def _state_path(self, debate_id: str) -> Path:
+        return self.directory / f"{debate_id}.json"
+
+    def _journal_path(self, debate_id: str) -> Path:
+        return self.directory / f"{debate_id}.journal.jsonl"
+
+    def write_state(self, state: Dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._state_path(state["debate_id"])
+        encoded = json.dumps(state, ensure_ascii=False, default=str).encode("utf-8")
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        # Not fsynced: the journal is the durable record, and a stale state file only
+        # means a resume re-enters a stage whose calls then replay from the journal.
+        tmp_path.write_bytes(encoded)
+        os.replace(tmp_path, path)
+
+    def append_journal(self, debate_id: str, key: str, reply: JournalReply) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        record = {"key": key, "content": reply[0], "metadata": reply[1]}
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._journal_path(debate_id).open("a", encoding="utf-8") as handle:
+            handle.write(line)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def load(self, debate_id: str) -> Optional[DebateCheckpoint]:
+        path = self._state_path(debate_id)
+        try:
+            state = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError):
+            logger.exception("Unreadable checkpoint %s", path)
+            return None
+        checkpoint = DebateCheckpoint(**state)
+        checkpoint.journal = self._read_journal(debate_id)
+        return checkpoint
+
+    def _read_journal(self, debate_id: str) -> Dict[str, JournalReply]:
+        journal: Dict[str, JournalReply] = {}
+        path = self._journal_path(debate_id)
+        if not path.exists():
+            return journal
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append; that call simply reruns.
+                    logger.warning("Skipping truncated journal line in %s", path)
+                    continue
+                journal[record["key"]] = (str(record["content"]), dict(record.get("metadata") or {}))
+        return journal
+
+    def list_states(self) -> List[Dict[str, Any]]:
+        if not self.directory.exists():
+            return []
+        states = []
+        for path in self.directory.glob("*.json"):
+            try:
+                state = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                continue
+            states.append({key: value for key, value in state.items() if key != "request"})
+        return sorted(states, key=lambda state: state.get("updated_at") or 0, reverse=True)
+
+    def delete(self, debate_id: str) -> None:
+        for path in (self._state_path(debate_id), self._journal_path(debate_id)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def prune(self, max_age_seconds: float) -> int:
+        """Delete non-running checkpoints last updated more than ``max_age_seconds`` ago."""
+        cutoff = time.time() - max_age_seconds
+        stale = [
+            state["debate_id"]
+            for state in self.list_states()
+            if state.get("status") != "running" and (state.get("updated_at") or 0) < cutoff
+        ]
+        for debate_id in stale:
+            self.delete(debate_id)
+        return len(stale)
+
+
+class Checkpointer:
+    """Per-debate writer; serialises writes so concurrent stages never interleave them."""
+
+    def __init__(self, store: CheckpointStore, checkpoint: DebateCheckpoint) -> None:
+        self.store = store
+        self.checkpoint = checkpoint
+        self._lock = asyncio.Lock()
+
+    @property
+    def debate_id(self) -> str:
+        return self.checkpoint.debate_id
+
+    def replay(self, key: str) -> Optional[JournalReply]:
+        return self.checkpoint.journal.get(key)
+
+    def set_counter(self, name: str, value: int) -> None:
+        self.checkpoint.counters[name] = value
+
+    def note_truncation(self, label: str) -> None:
+        if label not in self.checkpoint.truncated_stages:
+            self.checkpoint.truncated_stages.append(label)
+
+    async def save(self, remaining_seconds: Optional[float] = None) -> None:
+        async with self._lock:
+            if remaining_seconds is not None:
+                self.checkpoint.debate_remaining_seconds = round(remaining_seconds, 3)
+            self.checkpoint.updated_at = time.time()
+            await asyncio.to_thread(self.store.write_state, dict(self.checkpoint.state()))
+
+    async def record_call(
+        self,
+        key: str,
+        reply: JournalReply,
+        remaining_seconds: Optional[float] = None,
+    ) -> None:
+        self.checkpoint.journal[key] = reply
+        async with self._lock:
+            await asyncio.to_thread(self.store.append_journal, self.debate_id, key, reply)
+        await self.save(remaining_seconds)
+
+    async def mark_stage(self, name: str) -> None:
+        if name not in self.checkpoint.completed_stages:
+            self.checkpoint.completed_stages.append(name)
+        await self.save()
+
+    async def finish(self, status: str, error: Optional[str] = None) -> None:
+        self.checkpoint.status = status
+        self.checkpoint.error = error
+        if status == "completed":
+            # Nothing left to resume; interrupted and failed debates keep theirs until pruned.
+            async with self._lock:
+                await asyncio.to_thread(self.store.delete, self.debate_id)
+            return
+        await self.save()
+
+
+class RunningDebates:
+    """Tracks in-flight debate tasks so shutdown can drain them before exiting."""
+
+    def __init__(self) -> None:
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def is_running(self, debate_id: str) -> bool:
+        task = self._tasks.get(debate_id)
+        return task is not None and not task.done()
+
+    def start(self, debate_id: str, coroutine: Awaitable[T]) -> "asyncio.Task[T]":
+        task = asyncio.ensure_future(coroutine)
+        self._tasks[debate_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(debate_id, None))
+        return task
+
+    async def drain(self, timeout: float) -> None:
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        if not tasks:
+            return
+        logger.info("Waiting up to %.0fs for %d running debate(s).", timeout, len(tasks))
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            # Cancelled orchestrators mark their checkpoints interrupted before exiting.
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+_shared_store: Optional[CheckpointStore] = None
+_running: Optional[RunningDebates] = None
+
+
+def get_checkpoint_store(settings: Optional[CheckpointSettings] = None) -> Optional[CheckpointStore]:
+    global _shared_store
+    settings = settings or CheckpointSettings.from_env()
+    if not settings.enabled:
+        return None
+    if _shared_store is None:
+        _shared_store = CheckpointStore(Path(settings.directory))
+    return _shared_store
+
+
+def get_running_debates() -> RunningDebates:
+    global _running
+    if _running is None:
+        _running = RunningDebates()
+    return _running
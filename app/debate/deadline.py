@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class Deadline:
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(expires_at=time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def earliest(self, other: Optional["Deadline"]) -> "Deadline":
+        if other is None or self.expires_at <= other.expires_at:
+            return self
+        return other
+
+
+def earliest(*deadlines: Optional[Deadline]) -> Optional[Deadline]:
+    result: Optional[Deadline] = None
+    for deadline in deadlines:
+        if deadline is not None:
+            result = deadline.earliest(result)
+    return result
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass
+class HedgeSettings:
+    quantile: float = 0.95
+    min_samples: int = 20
+    min_delay: float = 0.5
+    budget_ratio: float = 0.1
+    budget_burst: float = 5.0
+
+    @classmethod
+    def from_env(cls) -> "HedgeSettings":
+        return cls(
+            quantile=float(os.getenv("LLM_HEDGE_QUANTILE", "0.95")),
+            min_samples=int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")),
+            min_delay=float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5")),
+            budget_ratio=float(os.getenv("LLM_HEDGE_BUDGET_RATIO", "0.1")),
+            budget_burst=float(os.getenv("LLM_HEDGE_BUDGET_BURST", "5")),
+        )
+
+
+class LatencySketch:
+    """Log-bucketed latency histogram giving quantiles within ``accuracy`` relative error.
+
+    Counts decay by half every ``half_life`` observations so the estimate follows
+    shifts in upstream latency instead of averaging over the whole process life.
+    """
+
+    def __init__(self, accuracy: float = 0.02, half_life: int = 500) -> None:
+        self._gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._half_life = half_life
+        self._buckets: Dict[int, float] = {}
+        self._count = 0.0
+        self._since_decay = 0
+        self.samples = 0
+
+    def record(self, seconds: float) -> None:
+        index = math.ceil(math.log(max(seconds, 1e-3)) / self._log_gamma)
+        self._buckets[index] = self._buckets.get(index, 0.0) + 1.0
+        self._count += 1.0
+        self.samples += 1
+        self._since_decay += 1
+        if self._since_decay >= self._half_life:
+            self._decay()
+
+    def _decay(self) -> None:
+        self._since_decay = 0
+        self._buckets = {key: value / 2 for key, value in self._buckets.items() if value > 0.25}
+        self._count = sum(self._buckets.values())
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self._count <= 0:
+            return None
+        rank = q * self._count
+        seen = 0.0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return 2 * self._gamma ** index / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._buckets) / (self._gamma + 1)
+
+
+class HedgeBudget:
+    """Hedges earn ``ratio`` credit per eligible call, capping extra spend at that fraction."""
+
+    def __init__(self, ratio: float, burst: float) -> None:
+        self.ratio = ratio
+        self.burst = burst
+        self.credit = burst
+        self.eligible = 0
+        self.fired = 0
+
+    def deposit(self) -> None:
+        self.eligible += 1
+        self.credit = min(self.burst, self.credit + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.credit < 1.0:
+            return False
+        self.credit -= 1.0
+        self.fired += 1
+        return True
+
+
+class LatencyTracker:
+    def __init__(self, settings: Optional[HedgeSettings] = None) -> None:
+        self.settings = settings or HedgeSettings.from_env()
+        self.budget = HedgeBudget(self.settings.budget_ratio, self.settings.budget_burst)
+        self._sketches: Dict[str, LatencySketch] = {}
+
+    def sketch(self, endpoint: str) -> LatencySketch:
+        sketch = self._sketches.get(endpoint)
+        if sketch is None:
+            sketch = LatencySketch()
+            self._sketches[endpoint] = sketch
+        return sketch
+
+    def observe(self, endpoint: str, started: float) -> None:
+        self.sketch(endpoint).record(time.monotonic() - started)
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        sketch = self.sketch(endpoint)
+        if sketch.samples < self.settings.min_samples:
+            return None
+        threshold = sketch.quantile(self.settings.quantile)
+        if threshold is None:
+            return None
+        return max(threshold, self.settings.min_delay)
+
+
+_shared_tracker: Optional[LatencyTracker] = None
+
+
+def get_shared_tracker() -> LatencyTracker:
+    global _shared_tracker
+    if _shared_tracker is None:
+        _shared_tracker = LatencyTracker()
+    return _shared_tracker
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import DebateRole, DebateTurn
+from .prompt_budget import estimate_tokens
+
+OrderKey = Tuple[int, int]
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？])\s*|\n+")
+_WORDS = re.compile(r"[a-z0-9][a-z0-9'\-]*|[\u3400-\u4dbf\u4e00-\u9fff]")
+_CJK = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff]")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i if in is it its of on or so that the their "
+    "there they this to was we were will with you your our not do does can should would".split()
+)
+
+MIN_SENTENCE_TERMS = 3
+SENTENCE_CHARS = 240
+DAMPING = 0.85
+DUPLICATE_SIMILARITY = 0.8
+REBUILD_GROWTH = 1.5
+
+
+def split_sentences(text: str) -> List[str]:
+    return [part.strip() for part in _SENTENCE_END.split(text) if part and part.strip()]
+
+
+def sentence_terms(sentence: str) -> List[str]:
+    words = [word for word in _WORDS.findall(sentence.lower()) if word not in _STOPWORDS]
+    # CJK has no spaces: score characters and adjacent character pairs.
+    bigrams = [
+        first + second
+        for first, second in zip(words, words[1:])
+        if _CJK.fullmatch(first) and _CJK.fullmatch(second)
+    ]
+    return words + bigrams
+
+
+@dataclass
+class _Sentence:
+    key: OrderKey
+    index: int
+    speaker_name: str
+    speaker_role: DebateRole
+    text: str
+    term_ids: np.ndarray
+    counts: np.ndarray
+    tokens: int
+
+
+class HighlightIndex:
+    """Extractive TextRank summary over the whole transcript.
+
+    Sentences are split and tokenised once when their turn is added. Scoring is
+    incremental: new sentences are vectorised with the current IDF and only their
+    similarity rows are computed, and the rank iteration restarts from the previous
+    scores. The full TF-IDF matrix is rebuilt (refreshing every IDF weight) only
+    once the sentence count has grown by ``REBUILD_GROWTH``.
+    """
+
+    def __init__(self) -> None:
+        self._sentences: List[_Sentence] = []
+        self._vocabulary: Dict[str, int] = {}
+        self._document_frequency: List[int] = []
+        self._scores: Optional[np.ndarray] = None
+        self._vectors: Optional[np.ndarray] = None
+        self._similarity: Optional[np.ndarray] = None
+        self._rebuilt_at = 0
+
+    def __len__(self) -> int:
+        return len(self._sentences)
+
+    def add(self, turn: DebateTurn, key: OrderKey) -> None:
+        for index, text in enumerate(split_sentences(turn.content)):
+            terms = sentence_terms(text)
+            if len(terms) < MIN_SENTENCE_TERMS:
+                continue
+            ids, counts = self._count_terms(terms)
+            for term_id in ids:
+                self._document_frequency[term_id] += 1
+            if len(text) > SENTENCE_CHARS:
+                text = text[: SENTENCE_CHARS - 1].rstrip() + "…"
+            self._sentences.append(
+                _Sentence(
+                    key=key,
+                    index=index,
+                    speaker_name=turn.speaker_name,
+                    speaker_role=turn.speaker_role,
+                    text=text,
+                    term_ids=ids,
+                    counts=counts,
+                    tokens=estimate_tokens(f"{turn.speaker_name}: {text}"),
+                )
+            )
+
+    def _count_terms(self, terms: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        counts: Dict[int, int] = {}
+        for term in terms:
+            term_id = self._vocabulary.get(term)
+            if term_id is None:
+                term_id = self._vocabulary[term] = len(self._vocabulary)
+                self._document_frequency.append(0)
+            counts[term_id] = counts.get(term_id, 0) + 1
+        return np.fromiter(counts, dtype=np.intp), np.fromiter(counts.values(), dtype=np.float64)
+
+    def _vectorise(self, sentences: Sequence[_Sentence]) -> np.ndarray:
+        count = len(self._sentences)
+        matrix = np.zeros((len(sentences), len(self._vocabulary)))
+        for row, sentence in enumerate(sentences):
+            matrix[row, sentence.term_ids] = 1.0 + np.log(sentence.counts)
+        document_frequency = np.asarray(self._document_frequency, dtype=np.float64)
+        matrix *= np.log((1.0 + count) / (1.0 + document_frequency)) + 1.0
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    def _update_similarity(self) -> Tuple[np.ndarray, np.ndarray]:
+        count = len(self._sentences)
+        vectors, similarity = self._vectors, self._similarity
+        if vectors is None or similarity is None or count >= REBUILD_GROWTH * self._rebuilt_at:
+            vectors = self._vectorise(self._sentences)
+            similarity = vectors @ vectors.T
+            np.fill_diagonal(similarity, 0.0)
+            self._rebuilt_at = count
+        elif len(vectors) < count:
+            added = self._vectorise(self._sentences[len(vectors):])
+            # Older rows keep the IDF weights they were built with until the next rebuild.
+            vectors = np.pad(vectors, ((0, 0), (0, added.shape[1] - vectors.shape[1])))
+            cross = added @ vectors.T
+            inner = added @ added.T
+            np.fill_diagonal(inner, 0.0)
+            similarity = np.block([[similarity, cross.T], [cross, inner]])
+            vectors = np.vstack([vectors, added])
+        self._vectors, self._similarity = vectors, similarity
+        return vectors, similarity
+
+    def _score(self) -> Tuple[np.ndarray, np.ndarray]:
+        count = len(self._sentences)
+        previous = self._scores
+        if previous is not None and len(previous) == count and self._vectors is not None:
+            return previous, self._vectors
+        vectors, similarity = self._update_similarity()
+        weights = similarity.sum(axis=1, keepdims=True)
+        # Isolated sentences jump uniformly instead of trapping the random walk.
+        transition = np.divide(
+            similarity, weights, out=np.full_like(similarity, 1.0 / count), where=weights > 0
+        )
+        if previous is None:
+            scores = np.full(count, 1.0 / count)
+        else:
+            # Warm start: earlier ranks barely move when a few sentences arrive.
+            scores = np.concatenate([previous, np.full(count - len(previous), 1.0 / count)])
+            scores /= scores.sum()
+        for _ in range(50):
+            updated = (1 - DAMPING) / count + DAMPING * (transition.T @ scores)
+            converged = np.abs(updated - scores).sum() < 1e-6
+            scores = updated
+            if converged:
+                break
+        self._scores = scores
+        return scores, vectors
+
+    def select(
+        self,
+        max_tokens: int,
+        balance: Sequence[DebateRole] = (DebateRole.AFFIRMATIVE, DebateRole.NEGATIVE),
+    ) -> List[str]:
+        """Top-ranked sentences within ``max_tokens``, in transcript order.
+
+        Picks alternate between the roles in ``balance`` so neither side can crowd
+        the other out; near-duplicates of an already chosen sentence are skipped.
+        """
+        if not self._sentences or max_tokens <= 0:
+            return []
+        scores, vectors = self._score()
+        ranked = np.argsort(-scores, kind="stable")
+        queues: Dict[Optional[DebateRole], Deque[int]] = {role: deque() for role in balance}
+        queues.setdefault(None, deque())
+        for position in ranked:
+            role = self._sentences[position].speaker_role
+            queues[role if role in queues else None].append(int(position))
+
+        chosen: List[int] = []
+        used = 0
+        order = list(balance) + [None]
+        while any(queues.values()):
+            for role in order:
+                queue = queues[role]
+                while queue:
+                    position = queue.popleft()
+                    sentence = self._sentences[position]
+                    if used + sentence.tokens > max_tokens:
+                        continue
+                    if chosen and float(np.max(vectors[chosen] @ vectors[position])) >= DUPLICATE_SIMILARITY:
+                        continue
+                    chosen.append(position)
+                    used += sentence.tokens
+                    break
+        chosen.sort(key=lambda position: (self._sentences[position].key, self._sentences[position].index))
+        return [
+            f"{self._sentences[position].speaker_name}: {self._sentences[position].text}"
+            for position in chosen
+        ]
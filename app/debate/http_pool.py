@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from host_service.http_utils import env_flag, http2_available
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolSettings:
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 10.0
+    http2: bool = False
+    local_dispatch: bool = True
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        return cls(
+            max_connections=int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "30")),
+            connect_timeout=float(os.getenv("LLM_POOL_CONNECT_TIMEOUT", "10")),
+            http2=env_flag("LLM_POOL_HTTP2", False),
+            local_dispatch=env_flag("LLM_POOL_LOCAL_DISPATCH", True),
+        )
+
+
+def endpoint_origin(endpoint: str) -> str:
+    parts = urlsplit(endpoint)
+    scheme = parts.scheme or "http"
+    host = parts.hostname or ""
+    port = parts.port or (443 if scheme == "https" else 80)
+    return f"{scheme}://{host}:{port}"
+
+
+class LocalAppTransport(httpx.AsyncBaseTransport):
+    """``ASGITransport`` that honours the request timeout and turns app crashes into HTTP 500s."""
+
+    def __init__(self, app: Any) -> None:
+        self._inner = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        timeout = (request.extensions.get("timeout") or {}).get("read")
+        try:
+            return await asyncio.wait_for(self._inner.handle_async_request(request), timeout)
+        except asyncio.TimeoutError as exc:
+            raise httpx.ReadTimeout(f"in-process call timed out after {timeout}s", request=request) from exc
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class HTTPClientPool:
+    """Long-lived ``httpx.AsyncClient`` instances shared per endpoint origin."""
+
+    def __init__(self, settings: Optional[PoolSettings] = None) -> None:
+        self.settings = settings or PoolSettings.from_env()
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._local_apps: Dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+        if self.settings.http2 and not http2_available():
+            logger.warning("LLM_POOL_HTTP2 requested but 'h2' is not installed; using HTTP/1.1.")
+            self.settings.http2 = False
+
+    def register_local_app(self, base_url: str, app: Any) -> None:
+        """Serve ``base_url`` in-process through ``app`` instead of looping back over TCP."""
+        if not self.settings.local_dispatch:
+            return
+        origin = endpoint_origin(base_url)
+        self._local_apps[origin] = app
+        stale = self._clients.pop(origin, None)
+        if stale is not None and not stale.is_closed:
+            asyncio.ensure_future(stale.aclose())
+
+    def is_local(self, endpoint: str) -> bool:
+        return endpoint_origin(endpoint) in self._local_apps
+
+    async def get(self, endpoint: str) -> httpx.AsyncClient:
+        origin = endpoint_origin(endpoint)
+        client = self._clients.get(origin)
+        if client is not None and not client.is_closed:
+            return client
+        async with self._lock:
+            client = self._clients.get(origin)
+            if client is None or client.is_closed:
+                client = self._build_client(self._local_apps.get(origin))
+                self._clients[origin] = client
+        return client
+
+    def _build_client(self, local_app: Any = None) -> httpx.AsyncClient:
+        settings = self.settings
+        if local_app is not None:
+            return httpx.AsyncClient(
+                transport=LocalAppTransport(local_app),
+                timeout=httpx.Timeout(60.0, connect=settings.connect_timeout),
+            )
+        limits = httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        )
+        # Per-request timeouts are supplied by the caller; this is only the fallback.
+        timeout = httpx.Timeout(60.0, connect=settings.connect_timeout)
+        return httpx.AsyncClient(limits=limits, timeout=timeout, http2=settings.http2)
+
+    async def aclose(self) -> None:
+        async with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+_shared_pool: Optional[HTTPClientPool] = None
+
+
+def get_shared_pool() -> HTTPClientPool:
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = HTTPClientPool()
+    return _shared_pool
+
+
+async def close_shared_pool() -> None:
+    global _shared_pool
+    if _shared_pool is None:
+        return
+    pool, _shared_pool = _shared_pool, None
+    await pool.aclose()
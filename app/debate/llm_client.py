@@ -1,15 +1,104 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Dict, Optional, Tuple
+import json
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 
 import httpx
 
+from host_service.http_utils import retry_delay_from_headers
+from host_service.metrics import get_registry
+
+from . import tracing
+from .balancer import ReplicaRegistry, get_shared_replicas
+from .deadline import Deadline
+from .hedging import LatencyTracker, get_shared_tracker
+from .http_pool import HTTPClientPool, get_shared_pool
+from .models import CachePolicy
+from .prompt_budget import estimate_tokens
+from .rate_limit import LimiterRegistry, get_shared_limiters
+from .response_cache import ResponseCache, get_shared_cache, make_cache_key
+
+RETRIABLE_STATUS = {404, 408, 409, 425, 429, 500, 502, 503, 504}
+# Throttling is handled by limiter.defer and 404s by retrying; neither means the replica is down.
+BREAKER_NEUTRAL_STATUS = {"404", "429"}
+TRANSIENT_METADATA_KEYS = {"cache", "rate_limit", "hedge", "replica"}
+MIN_ATTEMPT_SECONDS = 1.0
+DEADLINE_HEADER = "X-Deadline-Ms"
+STREAM_ACCEPT = "text/event-stream, application/x-ndjson;q=0.9, application/json;q=0.8"
+
+DeltaCallback = Callable[[str], Awaitable[None]]
+
+_METRICS = get_registry()
+CALL_SECONDS = _METRICS.histogram(
+    "llm_client_call_seconds",
+    "LLMClient call latency including queueing and retries.",
+    ("endpoint", "stage", "outcome"),
+)
+CALL_ERRORS = _METRICS.counter(
+    "llm_client_errors_total",
+    "Failed LLMClient attempts by HTTP status or 'transport'.",
+    ("endpoint", "status"),
+)
+CALL_RETRIES = _METRICS.counter(
+    "llm_client_retries_total",
+    "LLMClient attempts retried, by the status that triggered the retry.",
+    ("endpoint", "status"),
+)
+
 
 class LLMClientError(RuntimeError):
     pass
 
 
+class DeadlineExceeded(LLMClientError):
+    pass
+
+
+@dataclass
+class _Attempt:
+    endpoint: str
+    timeout: float
+    deadline_ms: Optional[int] = None
+    emitted: bool = False
+    status: Optional[int] = None
+    bytes_out: Optional[int] = None
+    bytes_in: Optional[int] = None
+
+
+class _RetryableAttempt(Exception):
+    def __init__(
+        self,
+        message: str,
+        retry_after: Optional[float] = None,
+        status: str = "",
+    ) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status = status
+
+
+def _backoff_delay(attempt: int) -> float:
+    # Exponential backoff with equal jitter so retrying callers spread out.
+    ceiling = min(8.0, 0.5 * 2 ** (attempt - 1))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+def _deadline_headers(attempt: _Attempt) -> Dict[str, str]:
+    # A header rather than a context key: context is rendered into prompts and cache keys.
+    if attempt.deadline_ms is None:
+        return {}
+    return {DEADLINE_HEADER: str(attempt.deadline_ms)}
+
+
+def _durable_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in metadata.items() if key not in TRANSIENT_METADATA_KEYS}
+
+
 class LLMClient:
     def __init__(
         self,
@@ -17,18 +106,30 @@ class LLMClient:
         endpoint: str,
         timeout: float,
         max_retries: int = 2,
+        pool: Optional[HTTPClientPool] = None,
+        cache: Optional[ResponseCache] = None,
+        limiters: Optional[LimiterRegistry] = None,
+        latency: Optional[LatencyTracker] = None,
+        replicas: Optional[Sequence[str]] = None,
+        replica_registry: Optional[ReplicaRegistry] = None,
     ) -> None:
         self.name = name
         self.endpoint = endpoint
         self.timeout = timeout
         self.max_retries = max(0, max_retries)
+        self.pool = pool or get_shared_pool()
+        self.cache = cache
+        self.limiters = limiters or get_shared_limiters()
+        endpoints = [endpoint, *(item for item in replicas or () if item != endpoint)]
+        self.replicas = (replica_registry or get_shared_replicas()).replica_set(endpoints)
+        self.latency = latency or get_shared_tracker()
 
-    async def complete(
+    def _build_payload(
         self,
         prompt: str,
         context: Dict[str, Any],
-        tags: Optional[Dict[str, Any]] = None,
-    ) -> Tuple[str, Dict[str, Any]]:
+        tags: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
         payload: Dict[str, Any] = {
             "prompt": prompt,
             "context": context,
@@ -36,39 +137,390 @@ class LLMClient:
         }
         if tags:
             payload["tags"] = tags
+        return payload
+
+    def _parse_body(self, data: Any) -> Tuple[str, Dict[str, Any]]:
+        if not isinstance(data, dict) or "content" not in data:
+            raise LLMClientError(f"{self.name} response missing 'content' field")
+        metadata = data.get("metadata") or {}
+        return str(data["content"]), metadata
+
+    async def _with_cache(
+        self,
+        policy: CachePolicy,
+        prompt: str,
+        context: Dict[str, Any],
+        tags: Optional[Dict[str, Any]],
+        fetch: Callable[[], Awaitable[Tuple[str, Dict[str, Any]]]],
+    ) -> Tuple[str, Dict[str, Any]]:
+        if policy == CachePolicy.OFF:
+            return await fetch()
+
+        cache = self.cache or get_shared_cache()
+        key = make_cache_key(self.endpoint, prompt, context, tags)
+        if policy in {CachePolicy.READ_WRITE, CachePolicy.READ_ONLY}:
+            entry, tier = await cache.get(key)
+            if entry is not None:
+                content, metadata = entry
+                return content, {**metadata, "cache": {"hit": True, "tier": tier, **cache.stats()}}
+
+        content, metadata = await fetch()
+        if policy in {CachePolicy.READ_WRITE, CachePolicy.REFRESH}:
+            await cache.put(key, (content, _durable_metadata(metadata)))
+        return content, {**metadata, "cache": {"hit": False, "tier": None, **cache.stats()}}
+
+    async def complete(
+        self,
+        prompt: str,
+        context: Dict[str, Any],
+        tags: Optional[Dict[str, Any]] = None,
+        cache_policy: CachePolicy = CachePolicy.OFF,
+        hedge: bool = False,
+        deadline: Optional[Deadline] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        payload = self._build_payload(prompt, context, tags)
+        fetch = self._complete_hedged if hedge else self._complete
+        return await self._with_cache(
+            cache_policy,
+            prompt,
+            context,
+            tags,
+            lambda: fetch(payload, deadline),
+        )
+
+    async def _complete(
+        self,
+        payload: Dict[str, Any],
+        deadline: Optional[Deadline] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        return await self._with_retries(payload, self._post_attempt, deadline)
+
+    async def _complete_hedged(
+        self,
+        payload: Dict[str, Any],
+        deadline: Optional[Deadline] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Fire a duplicate once the primary outlives the endpoint's observed p95."""
+        budget = self.latency.budget
+        budget.deposit()
+        delay = self.latency.hedge_delay(self.endpoint)
+        if delay is None:
+            return await self._complete(payload, deadline)
+
+        primary = asyncio.create_task(self._complete(payload, deadline))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not budget.try_spend():
+            return await primary
+
+        backup = asyncio.create_task(self._complete(payload, deadline))
+        pending = {primary, backup}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda item: item.exception() is not None):
+                    if task.exception() is None or not pending:
+                        content, metadata = task.result()
+                        hedge = {
+                            "fired": True,
+                            "delay_ms": round(delay * 1000, 1),
+                            "winner": "primary" if task is primary else "backup",
+                        }
+                        return content, {**metadata, "hedge": hedge}
+            raise LLMClientError(f"{self.name} hedged request failed")
+        finally:
+            for task in (primary, backup):
+                if not task.done():
+                    task.cancel()
+
+    async def _post_attempt(
+        self,
+        payload: Dict[str, Any],
+        attempt: _Attempt,
+    ) -> Tuple[str, Dict[str, Any]]:
+        client = await self.pool.get(attempt.endpoint)
+        response = await client.post(
+            attempt.endpoint,
+            json=payload,
+            headers=_deadline_headers(attempt),
+            timeout=attempt.timeout,
+        )
+        attempt.status = response.status_code
+        attempt.bytes_out = len(response.request.content)
+        attempt.bytes_in = len(response.content)
+        if response.status_code >= 400:
+            self._raise_for_status(response.status_code, response.text, response.headers)
+        return self._parse_body(response.json())
+
+    def _raise_for_status(self, status_code: int, body: str, headers: Any) -> None:
+        message = f"{self.name} responded with {status_code}: {body}"
+        CALL_ERRORS.labels(self.endpoint, status_code).inc()
+        if status_code in RETRIABLE_STATUS:
+            raise _RetryableAttempt(
+                message, retry_after=retry_delay_from_headers(headers), status=str(status_code)
+            )
+        raise LLMClientError(message)
+
+    async def _with_retries(
+        self,
+        payload: Dict[str, Any],
+        attempt_fn: Callable[[Dict[str, Any], _Attempt], Awaitable[Tuple[str, Dict[str, Any]]]],
+        deadline: Optional[Deadline] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        stage = str(payload["context"].get("stage", ""))
+        started = time.monotonic()
+        outcome = "error"
+        try:
+            reply = await self._retry_loop(payload, attempt_fn, deadline)
+            outcome = "ok"
+            return reply
+        except DeadlineExceeded:
+            outcome = "deadline"
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            CALL_SECONDS.labels(self.endpoint, stage, outcome).observe(time.monotonic() - started)
+
+    async def _retry_loop(
+        self,
+        payload: Dict[str, Any],
+        attempt_fn: Callable[[Dict[str, Any], _Attempt], Awaitable[Tuple[str, Dict[str, Any]]]],
+        deadline: Optional[Deadline] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        estimated_tokens = estimate_tokens(str(payload.get("prompt", "")))
+        attempt_number = 0
+        queue_wait = 0.0
+        while True:
+            attempt_number += 1
+            timeout = self.timeout
+            deadline_ms: Optional[int] = None
+            if deadline is not None:
+                remaining = deadline.remaining()
+                if remaining < MIN_ATTEMPT_SECONDS:
+                    raise DeadlineExceeded(f"{self.name} call skipped: deadline exhausted")
+                timeout = min(timeout, remaining)
+                deadline_ms = int(remaining * 1000)
+
+            replica = self.replicas.pick()
+            limiter = self.limiters.get(replica.endpoint)
+            attempt = _Attempt(endpoint=replica.endpoint, timeout=timeout, deadline_ms=deadline_ms)
+
+            async def run_attempt() -> Tuple[str, Dict[str, Any], float]:
+                async with limiter.slot(estimated_tokens) as slot, self._attempt_span(
+                    attempt, attempt_number, slot.waited
+                ):
+                    started = time.monotonic()
+                    with replica.dispatch() as call:
+                        try:
+                            content, metadata = await attempt_fn(payload, attempt)
+                        except _RetryableAttempt as exc:
+                            if exc.status not in BREAKER_NEUTRAL_STATUS:
+                                call.failed()
+                            raise
+                        except httpx.HTTPError:
+                            call.failed()
+                            raise
+                        call.succeeded()
+                    self.latency.observe(self.endpoint, started)
+                    return content, metadata, slot.waited
 
-        attempt = 0
-        last_error: Optional[Exception] = None
-        backoff = 0.5
-        while attempt <= self.max_retries:
-            attempt += 1
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(self.endpoint, json=payload)
+                if deadline is None:
+                    content, metadata, waited = await run_attempt()
+                else:
+                    content, metadata, waited = await asyncio.wait_for(
+                        run_attempt(), timeout=deadline.remaining()
+                    )
+            except asyncio.TimeoutError as exc:
+                raise DeadlineExceeded(f"{self.name} call exceeded its deadline") from exc
+            except _RetryableAttempt as exc:
+                if exc.retry_after:
+                    limiter.defer(exc.retry_after)
+                if attempt.emitted or attempt_number > self.max_retries:
+                    raise LLMClientError(str(exc)) from exc
+                await self._sleep_before_retry(attempt_number, deadline, exc, exc.status)
             except httpx.HTTPError as exc:
-                last_error = exc
-                if attempt <= self.max_retries:
-                    await asyncio.sleep(backoff)
-                    backoff = min(backoff * 2, 2.0)
-                    continue
-                raise LLMClientError(f"{self.name} request failed: {exc}") from exc
-
-            if response.status_code < 400:
-                break
-
-            retriable = response.status_code in {404, 408, 409, 425, 429, 500, 502, 503, 504}
-            if retriable and attempt <= self.max_retries:
-                await asyncio.sleep(backoff)
-                backoff = min(backoff * 2, 2.0)
-                continue
-
-            raise LLMClientError(
-                f"{self.name} responded with {response.status_code}: {response.text}"
-            )
+                error = LLMClientError(f"{self.name} request failed: {exc}")
+                CALL_ERRORS.labels(self.endpoint, "transport").inc()
+                if attempt.emitted or attempt_number > self.max_retries:
+                    raise error from exc
+                await self._sleep_before_retry(attempt_number, deadline, error, "transport")
+            else:
+                queue_wait += waited
+                rate_limit = {
+                    "queue_wait_ms": round(queue_wait * 1000, 1),
+                    "attempts": attempt_number,
+                }
+                metadata = {**metadata, "rate_limit": rate_limit}
+                if len(self.replicas.replicas) > 1:
+                    metadata["replica"] = replica.endpoint
+                return content, metadata
 
-        data = response.json()
-        if "content" not in data:
-            raise LLMClientError(f"{self.name} response missing 'content' field")
+    @asynccontextmanager
+    async def _attempt_span(
+        self,
+        attempt: _Attempt,
+        attempt_number: int,
+        queue_wait: float,
+    ) -> AsyncIterator[None]:
+        async with tracing.span(
+            self.name,
+            "attempt",
+            endpoint=attempt.endpoint,
+            attempt=attempt_number,
+            queue_wait_ms=round(queue_wait * 1000, 1),
+        ) as span:
+            try:
+                yield
+            finally:
+                span.set(status=attempt.status, bytes_out=attempt.bytes_out, bytes_in=attempt.bytes_in)
 
-        metadata = data.get("metadata") or {}
-        return str(data["content"]), metadata
+    async def _sleep_before_retry(
+        self,
+        attempt_number: int,
+        deadline: Optional[Deadline],
+        error: Exception,
+        status: str,
+    ) -> None:
+        delay = _backoff_delay(attempt_number)
+        if deadline is not None and deadline.remaining() < delay + MIN_ATTEMPT_SECONDS:
+            raise DeadlineExceeded(f"{error} (no budget left to retry)") from error
+        CALL_RETRIES.labels(self.endpoint, status).inc()
+        await asyncio.sleep(delay)
+
+    async def complete_stream(
+        self,
+        prompt: str,
+        context: Dict[str, Any],
+        tags: Optional[Dict[str, Any]] = None,
+        on_delta: Optional[DeltaCallback] = None,
+        cache_policy: CachePolicy = CachePolicy.OFF,
+        deadline: Optional[Deadline] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Like ``complete`` but asks the endpoint to stream and forwards each delta.
+
+        Endpoints may answer with ``text/event-stream`` or ``application/x-ndjson``
+        frames (``{"delta": ...}`` then an optional ``{"content", "metadata"}``
+        frame) or ignore ``stream`` and return the regular JSON body. Retries only
+        happen before the first delta has been forwarded. Cache hits are returned
+        without forwarding any delta.
+        """
+        payload = self._build_payload(prompt, context, tags)
+        payload["stream"] = True
+        return await self._with_cache(
+            cache_policy,
+            prompt,
+            context,
+            tags,
+            lambda: self._complete_stream(payload, on_delta, deadline),
+        )
+
+    async def _complete_stream(
+        self,
+        payload: Dict[str, Any],
+        on_delta: Optional[DeltaCallback],
+        deadline: Optional[Deadline] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        async def attempt_fn(payload: Dict[str, Any], attempt: _Attempt) -> Tuple[str, Dict[str, Any]]:
+            return await self._stream_attempt(payload, attempt, on_delta)
+
+        return await self._with_retries(payload, attempt_fn, deadline)
+
+    async def _stream_attempt(
+        self,
+        payload: Dict[str, Any],
+        attempt: _Attempt,
+        on_delta: Optional[DeltaCallback],
+    ) -> Tuple[str, Dict[str, Any]]:
+        client = await self.pool.get(attempt.endpoint)
+        async with client.stream(
+            "POST",
+            attempt.endpoint,
+            json=payload,
+            headers={"Accept": STREAM_ACCEPT, **_deadline_headers(attempt)},
+            timeout=attempt.timeout,
+        ) as response:
+            attempt.status = response.status_code
+            attempt.bytes_out = len(response.request.content)
+            try:
+                if response.status_code >= 400:
+                    body = (await response.aread()).decode("utf-8", errors="replace")
+                    self._raise_for_status(response.status_code, body, response.headers)
+
+                content_type = response.headers.get("content-type", "")
+                if "text/event-stream" in content_type:
+                    frames = _iter_sse_frames(response)
+                elif "ndjson" in content_type:
+                    frames = _iter_ndjson_frames(response)
+                else:
+                    body = await response.aread()
+                    try:
+                        data = json.loads(body)
+                    except json.JSONDecodeError as exc:
+                        raise LLMClientError(f"{self.name} returned invalid JSON: {exc.msg}") from exc
+                    return self._parse_body(data)
+
+                pieces: List[str] = []
+                final: Optional[Dict[str, Any]] = None
+                async for frame in frames:
+                    if frame.get("error"):
+                        raise LLMClientError(f"{self.name} stream error: {frame['error']}")
+                    delta = frame.get("delta")
+                    if delta:
+                        pieces.append(str(delta))
+                        attempt.emitted = True
+                        if on_delta is not None:
+                            await on_delta(str(delta))
+                    if "content" in frame:
+                        final = frame
+            finally:
+                attempt.bytes_in = response.num_bytes_downloaded
+
+        if final is not None:
+            content, metadata = self._parse_body(final)
+        elif pieces:
+            content, metadata = "".join(pieces), {}
+        else:
+            raise LLMClientError(f"{self.name} stream ended without content")
+        metadata = {**metadata, "streamed": True, "stream_chunks": len(pieces)}
+        return content, metadata
+
+
+async def _iter_sse_frames(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    data_lines: List[str] = []
+    async for line in response.aiter_lines():
+        if line.startswith("data:"):
+            data_lines.append(line[5:].lstrip())
+            continue
+        if line.strip() or not data_lines:
+            continue
+        raw = "\n".join(data_lines)
+        data_lines = []
+        if raw == "[DONE]":
+            return
+        frame = _decode_frame(raw)
+        if frame is not None:
+            yield frame
+    if data_lines and "\n".join(data_lines) != "[DONE]":
+        frame = _decode_frame("\n".join(data_lines))
+        if frame is not None:
+            yield frame
+
+
+async def _iter_ndjson_frames(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    async for line in response.aiter_lines():
+        if not line.strip():
+            continue
+        frame = _decode_frame(line)
+        if frame is not None:
+            yield frame
+
+
+def _decode_frame(raw: str) -> Optional[Dict[str, Any]]:
+    try:
+        frame = json.loads(raw)
+    except json.JSONDecodeError:
+        # Bare text frames are treated as plain deltas.
+        return {"delta": raw}
+    return frame if isinstance(frame, dict) else None
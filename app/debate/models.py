@@ -3,7 +3,7 @@ from __future__ import annotations
 from enum import Enum
 from typing import Any, Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, field_validator
 
 
 class DebateRole(str, Enum):
@@ -13,9 +13,32 @@ class DebateRole(str, Enum):
     JUDGE = "judge"
 
 
+class StageKind(str, Enum):
+    OPENING = "opening"
+    CROSS_EXAMINATION = "cross_examination"
+    FREE_DEBATE = "free_debate"
+    CLOSING = "closing"
+    JUDGING = "judging"
+    HOST = "host"
+
+
+HEDGEABLE_STAGES = {StageKind.JUDGING, StageKind.HOST}
+
+
+class CachePolicy(str, Enum):
+    OFF = "off"
+    READ_WRITE = "read_write"
+    READ_ONLY = "read_only"
+    REFRESH = "refresh"
+
+
 class ParticipantConfig(BaseModel):
     name: str = Field(..., description="Display name for the participant.")
     endpoint: HttpUrl = Field(..., description="HTTP endpoint accepting POST requests.")
+    replicas: List[HttpUrl] = Field(
+        default_factory=list,
+        description="Optional extra endpoints serving the same participant for load balancing/failover.",
+    )
 
 
 class DebateOptions(BaseModel):
@@ -37,6 +60,70 @@ class DebateOptions(BaseModel):
         le=120,
         description="Timeout for each LLM API call.",
     )
+    debate_budget_seconds: Optional[int] = Field(
+        default=None,
+        ge=30,
+        le=7200,
+        description="Optional wall-clock budget for the whole debate; calls get the remaining time.",
+    )
+    stage_budget_seconds: Dict[StageKind, float] = Field(
+        default_factory=dict,
+        description="Optional wall-clock budget per stage block (e.g. one cross-examination).",
+    )
+    stream_turns: bool = Field(
+        default=True,
+        description="Request token streaming from participants and forward turn_delta events.",
+    )
+    cache_policies: Dict[StageKind, CachePolicy] = Field(
+        default_factory=dict,
+        description="Response cache policy per stage kind; unlisted stages bypass the cache.",
+    )
+    hedge_stages: List[StageKind] = Field(
+        default_factory=list,
+        description="Idempotent stage kinds (judging, host) that may fire a hedged duplicate request.",
+    )
+    concurrent_stages: bool = Field(
+        default=True,
+        description="Run host interludes and independent openings concurrently; events keep canonical order.",
+    )
+    pipelined_cross_examination: bool = Field(
+        default=False,
+        description="Generate the next cross-examination question while the current answer is in flight.",
+    )
+    cross_answer_feedback: bool = Field(
+        default=False,
+        description="Show the questioner the answers received so far (lagged by one when pipelined).",
+    )
+    judge_quorum: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Close judging once this many valid ballots are in or the winner can no longer change.",
+    )
+    judge_grace_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        le=120,
+        description="How long stragglers may still vote after the quorum is reached before being cancelled.",
+    )
+    trace: bool = Field(
+        default=False,
+        description="Record a debate/stage/call span tree in metadata.trace and stream trace_span events.",
+    )
+    prompt_token_budgets: Dict[StageKind, int] = Field(
+        default_factory=dict,
+        description=(
+            "Estimated prompt-token budget per stage kind (e.g. {\"judging\": 3000}); oldest list items "
+            "are dropped or trimmed to fit. Stages not listed are unbounded."
+        ),
+    )
+
+    @field_validator("hedge_stages")
+    @classmethod
+    def _only_idempotent_hedges(cls, value: List[StageKind]) -> List[StageKind]:
+        invalid = [kind.value for kind in value if kind not in HEDGEABLE_STAGES]
+        if invalid:
+            raise ValueError(f"Hedging is only supported for judging/host stages, not {invalid}.")
+        return value
 
 
 class DebateRequest(BaseModel):
@@ -76,7 +163,7 @@ class HostInterlude(BaseModel):
 
 class JudgeVote(BaseModel):
     judge_name: str
-    vote: Literal["affirmative", "negative", "tie"]
+    vote: Literal["affirmative", "negative", "tie", "abstain"]
     rationale: str
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
@@ -99,3 +186,6 @@ class SaveDebateRequest(BaseModel):
 
 class SaveDebateResponse(BaseModel):
     path: str = Field(..., description="Relative path to the saved debate file.")
+    trace_path: Optional[str] = Field(
+        default=None, description="Relative path to the Chrome-trace JSON written beside it, if traced."
+    )
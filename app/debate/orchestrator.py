@@ -1,14 +1,26 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
+import contextlib
 import json
+import logging
 import random
+import time
+import uuid
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
-from . import script_templates
-from .llm_client import LLMClient
+from host_service.metrics import get_registry
+
+from . import script_templates, tracing
+from .checkpoint import Checkpointer, CheckpointStore, DebateCheckpoint
+from .deadline import Deadline, earliest
+from .highlights import HighlightIndex
+from .http_pool import HTTPClientPool, get_shared_pool
+from .llm_client import DeadlineExceeded, LLMClient
 from .models import (
+    CachePolicy,
     DebateOptions,
     DebateRequest,
     DebateResponse,
@@ -17,7 +29,40 @@ from .models import (
     HostInterlude,
     JudgeVote,
     ParticipantConfig,
+    StageKind,
+)
+from .prompt_budget import estimate_tokens, fit_prompt
+from .scheduler import StageNode, StageScheduler
+from .transcript import TranscriptStore
+
+logger = logging.getLogger(__name__)
+
+_METRICS = get_registry()
+DEBATES_CANCELLED = _METRICS.counter(
+    "debates_cancelled_total", "Debates cancelled before finishing.", ("reason",)
 )
+CALLS_SAVED = _METRICS.counter(
+    "debate_calls_saved_total",
+    "Planned participant calls never sent because their debate was cancelled.",
+    ("reason",),
+)
+CALLS_ABORTED = _METRICS.counter(
+    "debate_calls_aborted_total",
+    "Participant calls cancelled in flight when their debate was cancelled.",
+    ("reason",),
+)
+
+# Sequential calls still owed after free debate: pre_closing, two closings,
+# pre_judging, the (parallel) judges and wrap_up. With concurrent stages the
+# two interludes overlap the closings and judges and drop off the critical path.
+CALLS_AFTER_FREE_DEBATE = 6
+CONCURRENT_CALLS_AFTER_FREE_DEBATE = 4
+# Extractive highlight sizes (estimated tokens) for host interludes and unbudgeted judging.
+HOST_HIGHLIGHT_TOKENS = 200
+JUDGE_HIGHLIGHT_TOKENS = 2400
+# introduction, pre_cross_examination, mid_cross_examination, pre_free_debate,
+# pre_closing, pre_judging and wrap_up.
+HOST_INTERLUDE_CALLS = 7
 
 
 @dataclass
@@ -32,13 +77,34 @@ class DebateOrchestrator:
         self,
         request: DebateRequest,
         event_callback: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None,
+        http_pool: Optional[HTTPClientPool] = None,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        resume_from: Optional[DebateCheckpoint] = None,
     ) -> None:
         self.request = request
         options = request.options
         self._event_callback = event_callback
+        self._http_pool = http_pool or get_shared_pool()
 
-        shuffled = request.debaters[:]
-        random.shuffle(shuffled)
+        if resume_from is not None:
+            if checkpoint_store is None:
+                raise ValueError("Resuming a debate requires a checkpoint store.")
+            order = list(resume_from.debater_order)
+        else:
+            order = list(range(len(request.debaters)))
+            random.shuffle(order)
+        shuffled = [request.debaters[index] for index in order]
+        self.debate_id = resume_from.debate_id if resume_from is not None else uuid.uuid4().hex
+        self._checkpointer: Optional[Checkpointer] = None
+        if checkpoint_store is not None:
+            checkpoint = resume_from or DebateCheckpoint(
+                debate_id=self.debate_id,
+                request=request.model_dump(mode="json"),
+                debater_order=order,
+            )
+            self._checkpointer = Checkpointer(checkpoint_store, checkpoint)
+        self._resumed_from = resume_from
+        self._replayed_calls = 0
         self.affirmative = SideAssignment(
             role=DebateRole.AFFIRMATIVE,
             config=shuffled[0],
@@ -59,11 +125,33 @@ class DebateOrchestrator:
             for judge in request.judges
         ]
 
-        self.host_client = self._build_client(request.host, options)
+        self.host = SideAssignment(
+            role=DebateRole.HOST,
+            config=request.host,
+            client=self._build_client(request.host, options),
+        )
+        self.host_client = self.host.client
         self.options = options
-        self.transcript: List[DebateTurn] = []
+        self.transcript_store = TranscriptStore()
+        self.highlight_index = HighlightIndex()
+        self.tracer = tracing.Tracer(sink=self._emit_span)
+        self.transcript: List[DebateTurn] = self.transcript_store.turns
         self.interludes: List[HostInterlude] = []
         self.judge_votes: List[JudgeVote] = []
+        self._debate_deadline: Optional[Deadline] = None
+        self._stage_deadlines: Dict[StageKind, Deadline] = {}
+        self._call_seconds = 0.0
+        self._call_count = 0
+        self._calls_sent = 0
+        self._calls_in_flight = 0
+        self._task: Optional[asyncio.Task] = None
+        self._cancel_reason: Optional[str] = None
+        self._calls_aborted: Optional[int] = None
+        self._truncated_stages: List[str] = []
+        self._scheduler: Optional[StageScheduler] = None
+        self._schedule_report: Dict[str, Any] = {}
+        self._judging_summary: Dict[str, Any] = {}
+        self._interlude_keys: List[Tuple[int, int]] = []
         self._assignments_snapshot = {
             DebateRole.AFFIRMATIVE.value: self.affirmative.config.name,
             DebateRole.NEGATIVE.value: self.negative.config.name,
@@ -71,6 +159,9 @@ class DebateOrchestrator:
             DebateRole.JUDGE.value: [judge.config.name for judge in self.judges],
         }
 
+    async def _emit_span(self, span: tracing.Span) -> None:
+        await self._emit_event("trace_span", span.as_dict())
+
     async def _emit_event(self, event_type: str, payload: Any) -> None:
         if not self._event_callback:
             return
@@ -80,69 +171,303 @@ class DebateOrchestrator:
             data = payload
         else:
             data = payload
+        if self._scheduler is not None:
+            await self._scheduler.emit(event_type, data)
+            return
         await self._event_callback(event_type, data)
 
-    async def run(self) -> DebateResponse:
-        await self._emit_event("assignments", dict(self._assignments_snapshot))
-        await self._host_interlude(
-            stage="introduction",
-            instruction="Welcome the audience, announce the motion, and tease the upcoming debate.",
-            highlights=[
-                f"Motion: {self.request.topic}",
-                f"Participants: {self.affirmative.config.name} vs {self.negative.config.name}",
-            ],
-        )
+    def _order_key(self) -> Tuple[int, int]:
+        if self._scheduler is None:
+            return (len(self.transcript) + len(self.interludes), 0)
+        return self._scheduler.order_key()
+
+    async def _record_turn(self, turn: DebateTurn) -> None:
+        # Concurrent stages may finish out of order; keep the transcript canonical.
+        key = self._order_key()
+        self.transcript_store.insert(turn, key)
+        self.highlight_index.add(turn, key)
+        await self._emit_event("debate_turn", turn)
 
-        await self._handle_opening_statements()
+    async def _record_interlude(self, interlude: HostInterlude) -> None:
+        key = self._order_key()
+        position = bisect.bisect_right(self._interlude_keys, key)
+        self._interlude_keys.insert(position, key)
+        self.interludes.insert(position, interlude)
+        await self._emit_event("host_interlude", interlude)
 
-        await self._host_interlude(
-            stage="pre_cross_examination",
-            instruction="React to the opening statements with a witty remark, foreshadow cross-examination.",
-            highlights=[
-                self._last_turn_summary(self.affirmative.config.name),
-                self._last_turn_summary(self.negative.config.name),
-            ],
-        )
+    async def _invoke(
+        self,
+        side: SideAssignment,
+        prompt: str,
+        context: Dict[str, Any],
+        stage: str,
+        kind: StageKind,
+        stream: bool = True,
+        prompt_info: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        cache_policy = self._cache_policy(kind)
+        hedge = kind in self.options.hedge_stages
+        deadline = self._deadline_for(kind)
+        async with tracing.span(stage, "stage", speaker=side.config.name, stage_kind=kind.value) as span:
+            replayed = self._replay(stage)
+            if replayed is not None:
+                span.set(replayed=True)
+                return replayed
+            started = time.monotonic()
+            try:
+                with self._sending():
+                    # Hedged stages skip streaming: two racing streams cannot share one live draft.
+                    if hedge or not (stream and self._event_callback and self.options.stream_turns):
+                        reply = await side.client.complete(
+                            prompt,
+                            context=context,
+                            cache_policy=cache_policy,
+                            hedge=hedge,
+                            deadline=deadline,
+                        )
+                    else:
+                        reply = await self._invoke_streaming(
+                            side, prompt, context, stage, cache_policy, deadline
+                        )
+            finally:
+                self._call_seconds += time.monotonic() - started
+                self._call_count += 1
+            reply = self._with_prompt_info(reply, prompt, prompt_info)
+            self._annotate_span(span, reply[1])
+            await self._journal(stage, reply)
+            return reply
 
-        await self._handle_cross_examination(attacker=self.affirmative, defender=self.negative, label="affirmative_cross")
+    @contextlib.contextmanager
+    def _sending(self) -> Iterator[None]:
+        self._calls_sent += 1
+        self._calls_in_flight += 1
+        try:
+            yield
+        finally:
+            self._calls_in_flight -= 1
 
-        await self._host_interlude(
-            stage="mid_cross_examination",
-            instruction="Comment on the questioning so far and set up the perspective shift.",
-            highlights=self._recent_turns_summary(limit=4),
+    def planned_calls(self) -> int:
+        """Participant calls a full debate makes (fewer if free debate or judging stop early)."""
+        options = self.options
+        return (
+            HOST_INTERLUDE_CALLS
+            + 2  # openings
+            + 2 * 2 * options.max_cross_questions
+            + 2 * options.max_freeform_rounds
+            + 2  # closings
+            + len(self.judges)
         )
 
-        await self._handle_cross_examination(attacker=self.negative, defender=self.affirmative, label="negative_cross")
+    def cancel(self, reason: str) -> bool:
+        """Cancel a running debate, e.g. when its only listener disconnects.
 
-        await self._host_interlude(
-            stage="pre_free_debate",
-            instruction="Encourage energetic exchanges and make a playful observation about the debate heat.",
-            highlights=self._recent_turns_summary(limit=4),
-        )
+        Cancellation reaches every in-flight ``LLMClient`` request; the checkpoint is
+        left ``interrupted`` so the debate can still be resumed.
+        """
+        if self._task is None or self._task.done():
+            return False
+        if self._cancel_reason is None:
+            self._cancel_reason = reason
+            self._calls_aborted = self._calls_in_flight
+        return self._task.cancel(reason)
 
-        await self._handle_free_debate()
+    def _record_cancellation(self) -> Dict[str, Any]:
+        reason = self._cancel_reason or "cancelled"
+        completed = self._calls_sent - (self._calls_aborted or 0)
+        saved = max(0, self.planned_calls() - self._replayed_calls - self._calls_sent)
+        DEBATES_CANCELLED.labels(reason).inc()
+        CALLS_SAVED.labels(reason).inc(saved)
+        if self._calls_aborted:
+            CALLS_ABORTED.labels(reason).inc(self._calls_aborted)
+        report = {
+            "reason": reason,
+            "calls_planned": self.planned_calls(),
+            "calls_completed": completed,
+            "calls_aborted": self._calls_aborted,
+            "calls_saved": saved,
+        }
+        logger.info("Debate %s cancelled: %s", self.debate_id, report)
+        return report
+
+    @staticmethod
+    def _annotate_span(span: tracing.Span, metadata: Dict[str, Any]) -> None:
+        attempts = (metadata.get("rate_limit") or {}).get("attempts")
+        span.set(
+            retries=attempts - 1 if attempts else None,
+            cache_hit=(metadata.get("cache") or {}).get("hit"),
+            hedged=(metadata.get("hedge") or {}).get("fired"),
+            prompt_tokens_estimate=metadata.get("prompt_tokens_estimate"),
+            **tracing.usage_attributes(metadata),
+        )
 
-        await self._host_interlude(
-            stage="pre_closing",
-            instruction="Cue the closing statements with humor and hint at the stakes.",
-            highlights=self._recent_turns_summary(limit=4),
+    def _budgeted_prompt(
+        self,
+        kind: StageKind,
+        render: Callable[..., str],
+        lists: Dict[str, List[str]],
+        newest_first: Tuple[str, ...] = (),
+    ) -> Tuple[str, Dict[str, Any]]:
+        prompt, report = fit_prompt(
+            render, lists, self.options.prompt_token_budgets.get(kind), newest_first=newest_first
         )
+        return prompt, report.as_metadata()
+
+    @staticmethod
+    def _with_prompt_info(
+        reply: Tuple[str, Dict[str, Any]],
+        prompt: str,
+        prompt_info: Optional[Dict[str, Any]],
+    ) -> Tuple[str, Dict[str, Any]]:
+        content, metadata = reply
+        info = prompt_info or {"prompt_tokens_estimate": estimate_tokens(prompt)}
+        return content, {**metadata, **info}
+
+    def _replay(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        if self._checkpointer is None:
+            return None
+        entry = self._checkpointer.replay(key)
+        if entry is None:
+            return None
+        self._replayed_calls += 1
+        content, metadata = entry
+        return content, {**metadata, "replayed": True}
+
+    def _is_journaled(self, key: str) -> bool:
+        return self._checkpointer is not None and self._checkpointer.replay(key) is not None
+
+    async def _journal(self, key: str, reply: Tuple[str, Dict[str, Any]]) -> None:
+        if self._checkpointer is None:
+            return
+        remaining = self._debate_deadline.remaining() if self._debate_deadline is not None else None
+        await self._checkpointer.record_call(key, reply, remaining)
+
+    def _checkpoint_counter(self, name: str, value: int) -> None:
+        if self._checkpointer is not None:
+            self._checkpointer.set_counter(name, value)
+
+    async def _invoke_streaming(
+        self,
+        side: SideAssignment,
+        prompt: str,
+        context: Dict[str, Any],
+        stage: str,
+        cache_policy: CachePolicy,
+        deadline: Optional[Deadline],
+    ) -> Tuple[str, Dict[str, Any]]:
 
-        await self._handle_closing_statements()
+        async def forward(delta: str) -> None:
+            await self._emit_event(
+                "turn_delta",
+                {
+                    "stage": stage,
+                    "speaker_role": side.role.value,
+                    "speaker_name": side.config.name,
+                    "delta": delta,
+                },
+            )
 
-        await self._host_interlude(
-            stage="pre_judging",
-            instruction="Address the judges, joke about the tough decision, and transition to deliberation.",
-            highlights=self._recent_turns_summary(limit=6),
+        return await side.client.complete_stream(
+            prompt,
+            context=context,
+            on_delta=forward,
+            cache_policy=cache_policy,
+            deadline=deadline,
         )
 
-        await self._handle_judges()
+    def _cache_policy(self, kind: StageKind) -> CachePolicy:
+        return self.options.cache_policies.get(kind, CachePolicy.OFF)
+
+    def _begin_stage(self, kind: StageKind) -> None:
+        budget = self.options.stage_budget_seconds.get(kind)
+        if budget:
+            self._stage_deadlines[kind] = Deadline.after(budget)
 
-        await self._host_interlude(
-            stage="wrap_up",
-            instruction="Celebrate the debate, announce the winner, and leave the audience smiling.",
-            highlights=self._winner_highlights(),
+    def _deadline_for(self, kind: StageKind) -> Optional[Deadline]:
+        return earliest(self._debate_deadline, self._stage_deadlines.get(kind))
+
+    def _average_call_seconds(self) -> float:
+        if not self._call_count:
+            return 0.0
+        return self._call_seconds / self._call_count
+
+    def _free_debate_has_budget(self) -> bool:
+        round_cost = 2 * self._average_call_seconds()
+        stage_deadline = self._stage_deadlines.get(StageKind.FREE_DEBATE)
+        if stage_deadline is not None and stage_deadline.remaining() < round_cost:
+            return False
+        if self._debate_deadline is not None:
+            calls_after = (
+                CONCURRENT_CALLS_AFTER_FREE_DEBATE
+                if self.options.concurrent_stages
+                else CALLS_AFTER_FREE_DEBATE
+            )
+            reserve = calls_after * self._average_call_seconds()
+            if self._debate_deadline.remaining() < round_cost + reserve:
+                return False
+        return True
+
+    def _response_metadata(self) -> Optional[Dict[str, Any]]:
+        extra: Dict[str, Any] = {}
+        if self._schedule_report:
+            extra["schedule"] = self._schedule_report
+        if self.options.trace:
+            extra["trace"] = self.tracer.export()
+        if self._judging_summary.get("closed_early") or self._judging_summary.get("abstentions"):
+            extra["judging"] = self._judging_summary
+        if self._checkpointer is not None:
+            extra["checkpoint"] = {
+                "debate_id": self.debate_id,
+                "resumed": self._resumed_from is not None,
+                "replayed_calls": self._replayed_calls,
+            }
+        if self.options.debate_budget_seconds or self.options.stage_budget_seconds:
+            extra["deadline"] = {
+                "debate_budget_seconds": self.options.debate_budget_seconds,
+                "remaining_seconds": (
+                    round(self._debate_deadline.remaining(), 3)
+                    if self._debate_deadline is not None
+                    else None
+                ),
+                "truncated_stages": list(self._truncated_stages),
+            }
+        if not extra:
+            return self.request.metadata
+        return {**(self.request.metadata or {}), **extra}
+
+    async def run(self) -> DebateResponse:
+        self._task = asyncio.current_task()
+        resumed = self._resumed_from
+        if resumed is not None and resumed.debate_remaining_seconds is not None:
+            self._debate_deadline = Deadline.after(resumed.debate_remaining_seconds)
+        elif self.options.debate_budget_seconds:
+            self._debate_deadline = Deadline.after(self.options.debate_budget_seconds)
+        if self._checkpointer is not None:
+            await self._checkpointer.save()
+        await self._emit_event("assignments", dict(self._assignments_snapshot))
+        self._scheduler = StageScheduler(
+            self._stage_graph(),
+            sink=self._event_callback,
+            on_finished=self._checkpointer.mark_stage if self._checkpointer else None,
         )
+        try:
+            with self.tracer.active() if self.options.trace else contextlib.nullcontext():
+                async with tracing.span(
+                    "debate", "debate", debate_id=self.debate_id, topic=self.request.topic
+                ):
+                    self._schedule_report = await self._scheduler.run()
+        except asyncio.CancelledError:
+            report = self._record_cancellation()
+            if self._checkpointer is not None:
+                await self._checkpointer.finish("interrupted", error=f"Cancelled: {report['reason']}")
+            raise
+        except Exception as exc:
+            if self._checkpointer is not None:
+                await self._checkpointer.finish("failed", error=str(exc) or repr(exc))
+            raise
+        finally:
+            self._scheduler = None
+        if self._checkpointer is not None:
+            await self._checkpointer.finish("completed")
 
         assignments: Dict[DebateRole, Union[str, List[str]]] = {
             DebateRole.AFFIRMATIVE: self.affirmative.config.name,
@@ -157,30 +482,145 @@ class DebateOrchestrator:
             transcript=self.transcript,
             interludes=self.interludes,
             judge_votes=self.judge_votes,
-            metadata=self.request.metadata,
+            metadata=self._response_metadata(),
         )
         await self._emit_event("complete", response)
         return response
 
-    async def _handle_opening_statements(self) -> None:
-        await self._debaters_statement(
-            stage="opening_affirmative",
-            side=self.affirmative,
-            prompt_builder=script_templates.opening_statement_prompt,
-            briefing=[
-                "Establish why the motion should be accepted.",
-                "Highlight core benefits early.",
-            ],
-        )
+    def _stage_graph(self) -> List[StageNode]:
+        """The debate format in canonical order.
+
+        Speaking stages form a chain (each reads the transcript so far) except the
+        two openings, which only see the motion. Interludes feed nothing back, so
+        they hang off the stage they comment on and overlap the next one.
+        """
+        openings = ("opening_affirmative", "opening_negative")
+        nodes = [
+            StageNode(
+                "introduction",
+                lambda: self._host_interlude(
+                    stage="introduction",
+                    instruction="Welcome the audience, announce the motion, and tease the upcoming debate.",
+                    highlights=[
+                        f"Motion: {self.request.topic}",
+                        f"Participants: {self.affirmative.config.name} vs {self.negative.config.name}",
+                    ],
+                ),
+            ),
+            StageNode(
+                "opening_affirmative",
+                lambda: self._handle_opening_statement(
+                    stage="opening_affirmative",
+                    side=self.affirmative,
+                    briefing=[
+                        "Establish why the motion should be accepted.",
+                        "Highlight core benefits early.",
+                    ],
+                ),
+            ),
+            StageNode(
+                "opening_negative",
+                lambda: self._handle_opening_statement(
+                    stage="opening_negative",
+                    side=self.negative,
+                    briefing=[
+                        "Expose vulnerabilities in the motion.",
+                        "Question feasibility and unintended consequences.",
+                    ],
+                ),
+            ),
+            StageNode(
+                "pre_cross_examination",
+                lambda: self._host_interlude(
+                    stage="pre_cross_examination",
+                    instruction="React to the opening statements with a witty remark, foreshadow cross-examination.",
+                    highlights=[
+                        self._last_turn_summary(self.affirmative.config.name),
+                        self._last_turn_summary(self.negative.config.name),
+                    ],
+                ),
+                after=openings,
+            ),
+            StageNode(
+                "affirmative_cross",
+                lambda: self._handle_cross_examination(
+                    attacker=self.affirmative, defender=self.negative, label="affirmative_cross"
+                ),
+                after=openings,
+            ),
+            StageNode(
+                "mid_cross_examination",
+                lambda: self._host_interlude(
+                    stage="mid_cross_examination",
+                    instruction="Comment on the questioning so far and set up the perspective shift.",
+                    highlights=self._debate_highlights(HOST_HIGHLIGHT_TOKENS),
+                ),
+                after=("affirmative_cross",),
+            ),
+            StageNode(
+                "negative_cross",
+                lambda: self._handle_cross_examination(
+                    attacker=self.negative, defender=self.affirmative, label="negative_cross"
+                ),
+                after=("affirmative_cross",),
+            ),
+            StageNode(
+                "pre_free_debate",
+                lambda: self._host_interlude(
+                    stage="pre_free_debate",
+                    instruction="Encourage energetic exchanges and make a playful observation about the debate heat.",
+                    highlights=self._debate_highlights(HOST_HIGHLIGHT_TOKENS),
+                ),
+                after=("negative_cross",),
+            ),
+            StageNode("free_debate", self._handle_free_debate, after=("negative_cross",)),
+            StageNode(
+                "pre_closing",
+                lambda: self._host_interlude(
+                    stage="pre_closing",
+                    instruction="Cue the closing statements with humor and hint at the stakes.",
+                    highlights=self._debate_highlights(HOST_HIGHLIGHT_TOKENS),
+                ),
+                after=("free_debate",),
+            ),
+            StageNode("closing", self._handle_closing_statements, after=("free_debate",)),
+            StageNode(
+                "pre_judging",
+                lambda: self._host_interlude(
+                    stage="pre_judging",
+                    instruction="Address the judges, joke about the tough decision, and transition to deliberation.",
+                    highlights=self._debate_highlights(2 * HOST_HIGHLIGHT_TOKENS),
+                ),
+                after=("closing",),
+            ),
+            StageNode("judging", self._handle_judges, after=("closing",)),
+            StageNode(
+                "wrap_up",
+                lambda: self._host_interlude(
+                    stage="wrap_up",
+                    instruction="Celebrate the debate, announce the winner, and leave the audience smiling.",
+                    highlights=self._winner_highlights(),
+                ),
+                after=("judging",),
+            ),
+        ]
+        if not self.options.concurrent_stages:
+            for previous, node in zip(nodes, nodes[1:]):
+                node.after = (previous.name,)
+        return nodes
 
+    async def _handle_opening_statement(
+        self,
+        stage: str,
+        side: SideAssignment,
+        briefing: List[str],
+    ) -> None:
+        self._begin_stage(StageKind.OPENING)
         await self._debaters_statement(
-            stage="opening_negative",
-            side=self.negative,
+            stage=stage,
+            side=side,
             prompt_builder=script_templates.opening_statement_prompt,
-            briefing=[
-                "Expose vulnerabilities in the motion.",
-                "Question feasibility and unintended consequences.",
-            ],
+            briefing=briefing,
         )
 
     async def _handle_cross_examination(
@@ -189,124 +629,283 @@ class DebateOrchestrator:
         defender: SideAssignment,
         label: str,
     ) -> None:
+        self._begin_stage(StageKind.CROSS_EXAMINATION)
         asked: List[str] = []
         answers: List[str] = []
         opponent_highlights = self._collect_highlights(defender.config.name)
+        if self.options.pipelined_cross_examination:
+            await self._pipelined_cross_examination(
+                attacker, defender, label, asked, answers, opponent_highlights
+            )
+            return
         for turn_index in range(self.options.max_cross_questions):
-            question_prompt = script_templates.cross_question_prompt(
-                side=attacker.role.value,
-                topic=self.request.topic,
-                previous_questions=asked,
-                opponent_highlights=opponent_highlights,
+            question_turn = await self._cross_question(
+                attacker, label, turn_index, list(asked), list(answers), opponent_highlights
             )
-            question, question_meta = await attacker.client.complete(
-                question_prompt,
-                context={
-                    "stage": f"{label}_question",
-                    "turn": turn_index + 1,
-                    "topic": self.request.topic,
-                },
+            asked.append(question_turn.content)
+            await self._record_turn(question_turn)
+
+            answer_turn = await self._cross_answer(
+                defender, label, turn_index, question_turn.content, list(answers)
+            )
+            answers.append(answer_turn.content)
+            await self._record_turn(answer_turn)
+            self._checkpoint_counter(label, turn_index + 1)
+
+    async def _pipelined_cross_examination(
+        self,
+        attacker: SideAssignment,
+        defender: SideAssignment,
+        label: str,
+        asked: List[str],
+        answers: List[str],
+        opponent_highlights: List[str],
+    ) -> None:
+        """Ask question N+1 while answer N is in flight; the transcript stays strictly Q/A.
+
+        The next question only sees answers that had already arrived, so with
+        ``cross_answer_feedback`` the questioner works one answer behind.
+        """
+        # Questions run beside an answer, so they skip streaming to keep one live draft.
+        next_question: Optional[asyncio.Task] = asyncio.create_task(
+            self._cross_question(
+                attacker, label, 0, [], [], opponent_highlights, stream=False
             )
-            asked.append(question)
-            question_turn = DebateTurn(
-                stage=f"{label}_q{turn_index + 1}",
-                speaker_role=attacker.role,
-                speaker_name=attacker.config.name,
-                content=question,
-                metadata=question_meta,
+        )
+        try:
+            for turn_index in range(self.options.max_cross_questions):
+                question_turn = await next_question
+                next_question = None
+                asked.append(question_turn.content)
+                await self._record_turn(question_turn)
+
+                if turn_index + 1 < self.options.max_cross_questions:
+                    next_question = asyncio.create_task(
+                        self._cross_question(
+                            attacker,
+                            label,
+                            turn_index + 1,
+                            list(asked),
+                            list(answers),
+                            opponent_highlights,
+                            stream=False,
+                        )
+                    )
+                answer_turn = await self._cross_answer(
+                    defender, label, turn_index, question_turn.content, list(answers)
+                )
+                answers.append(answer_turn.content)
+                await self._record_turn(answer_turn)
+                self._checkpoint_counter(label, turn_index + 1)
+        finally:
+            if next_question is not None and not next_question.done():
+                next_question.cancel()
+                await asyncio.gather(next_question, return_exceptions=True)
+
+    async def _cross_question(
+        self,
+        attacker: SideAssignment,
+        label: str,
+        turn_index: int,
+        asked: List[str],
+        answers_seen: List[str],
+        opponent_highlights: List[str],
+        stream: bool = True,
+    ) -> DebateTurn:
+        feedback = answers_seen if self.options.cross_answer_feedback else None
+        lists = {"previous_questions": asked, "opponent_highlights": opponent_highlights}
+        if feedback is not None:
+            lists["previous_answers"] = feedback
+
+        def render(**items: List[str]) -> str:
+            return script_templates.cross_question_prompt(
+                side=attacker.role.value, topic=self.request.topic, **items
             )
-            self.transcript.append(question_turn)
-            await self._emit_event("debate_turn", question_turn)
 
-            answer_prompt = script_templates.cross_answer_prompt(
+        question_prompt, prompt_info = self._budgeted_prompt(
+            StageKind.CROSS_EXAMINATION, render, lists, newest_first=("opponent_highlights",)
+        )
+        stage = f"{label}_q{turn_index + 1}"
+        question, question_meta = await self._invoke(
+            attacker,
+            question_prompt,
+            context={
+                "stage": f"{label}_question",
+                "turn": turn_index + 1,
+                "topic": self.request.topic,
+            },
+            stage=stage,
+            kind=StageKind.CROSS_EXAMINATION,
+            stream=stream,
+            prompt_info=prompt_info,
+        )
+        if self.options.pipelined_cross_examination:
+            question_meta = {
+                **question_meta,
+                "pipelined": True,
+                "answers_seen": len(feedback) if feedback is not None else 0,
+            }
+        return DebateTurn(
+            stage=stage,
+            speaker_role=attacker.role,
+            speaker_name=attacker.config.name,
+            content=question,
+            metadata=question_meta,
+        )
+
+    async def _cross_answer(
+        self,
+        defender: SideAssignment,
+        label: str,
+        turn_index: int,
+        question: str,
+        prior_answers: List[str],
+    ) -> DebateTurn:
+        def render(prior_answers: List[str]) -> str:
+            return script_templates.cross_answer_prompt(
                 side=defender.role.value,
                 topic=self.request.topic,
                 question=question,
-                prior_answers=answers,
+                prior_answers=prior_answers,
             )
-            answer, answer_meta = await defender.client.complete(
-                answer_prompt,
-                context={
-                    "stage": f"{label}_answer",
-                    "turn": turn_index + 1,
-                    "topic": self.request.topic,
-                },
-            )
-            answers.append(answer)
-            answer_turn = DebateTurn(
-                stage=f"{label}_a{turn_index + 1}",
-                speaker_role=defender.role,
-                speaker_name=defender.config.name,
-                content=answer,
-                metadata=answer_meta,
-            )
-            self.transcript.append(answer_turn)
-            await self._emit_event("debate_turn", answer_turn)
+
+        answer_prompt, prompt_info = self._budgeted_prompt(
+            StageKind.CROSS_EXAMINATION, render, {"prior_answers": prior_answers}
+        )
+        stage = f"{label}_a{turn_index + 1}"
+        answer, answer_meta = await self._invoke(
+            defender,
+            answer_prompt,
+            context={
+                "stage": f"{label}_answer",
+                "turn": turn_index + 1,
+                "topic": self.request.topic,
+            },
+            stage=stage,
+            kind=StageKind.CROSS_EXAMINATION,
+            prompt_info=prompt_info,
+        )
+        return DebateTurn(
+            stage=stage,
+            speaker_role=defender.role,
+            speaker_name=defender.config.name,
+            content=answer,
+            metadata=answer_meta,
+        )
 
     async def _handle_free_debate(self) -> None:
+        self._begin_stage(StageKind.FREE_DEBATE)
         last_point = self._last_turn_content()
         for round_number in range(1, self.options.max_freeform_rounds + 1):
-            affirmative_prompt = script_templates.free_debate_prompt(
-                side=self.affirmative.role.value,
-                topic=self.request.topic,
-                last_opponent_point=last_point,
-                round_number=round_number,
-            )
-            affirmative_reply, aff_meta = await self.affirmative.client.complete(
-                affirmative_prompt,
-                context={
-                    "stage": "free_debate",
-                    "round": round_number,
-                    "role": self.affirmative.role.value,
-                },
-            )
-            affirmative_turn = DebateTurn(
-                stage=f"free_debate_round{round_number}_affirmative",
-                speaker_role=self.affirmative.role,
-                speaker_name=self.affirmative.config.name,
-                content=affirmative_reply,
-                metadata=aff_meta,
-            )
-            self.transcript.append(affirmative_turn)
-            await self._emit_event("debate_turn", affirmative_turn)
+            # A resumed debate repeats the original stop decision instead of re-timing it.
+            replayed_stop = self._replayed_truncation(f"free_debate_round{round_number}")
+            if replayed_stop is not None:
+                self._truncate_free_debate(round_number, replayed_stop)
+                break
+            replaying = self._is_journaled(f"free_debate_round{round_number}_affirmative")
+            if not replaying and not self._free_debate_has_budget():
+                self._truncate_free_debate(round_number, "budget_exhausted")
+                break
+            try:
+                last_point = await self._free_debate_round(round_number, last_point)
+            except DeadlineExceeded:
+                self._truncate_free_debate(round_number, "deadline_exceeded")
+                break
+            self._checkpoint_counter("free_debate_round", round_number)
+
+    def _truncate_free_debate(self, round_number: int, reason: str) -> None:
+        logger.info("Stopping free debate before round %s: %s", round_number, reason)
+        label = f"free_debate_round{round_number}:{reason}"
+        self._truncated_stages.append(label)
+        if self._checkpointer is not None:
+            self._checkpointer.note_truncation(label)
 
-            last_point = affirmative_reply
+    def _replayed_truncation(self, stage: str) -> Optional[str]:
+        if self._resumed_from is None:
+            return None
+        for label in self._resumed_from.truncated_stages:
+            name, _, reason = label.partition(":")
+            if name == stage:
+                return reason
+        return None
 
-            negative_prompt = script_templates.free_debate_prompt(
-                side=self.negative.role.value,
+    async def _free_debate_round(self, round_number: int, last_point: str) -> str:
+        affirmative_prompt, affirmative_info = self._free_debate_prompt(self.affirmative, last_point, round_number)
+        affirmative_reply, aff_meta = await self._invoke(
+            self.affirmative,
+            affirmative_prompt,
+            context={
+                "stage": "free_debate",
+                "round": round_number,
+                "role": self.affirmative.role.value,
+            },
+            stage=f"free_debate_round{round_number}_affirmative",
+            kind=StageKind.FREE_DEBATE,
+            prompt_info=affirmative_info,
+        )
+        affirmative_turn = DebateTurn(
+            stage=f"free_debate_round{round_number}_affirmative",
+            speaker_role=self.affirmative.role,
+            speaker_name=self.affirmative.config.name,
+            content=affirmative_reply,
+            metadata=aff_meta,
+        )
+        await self._record_turn(affirmative_turn)
+
+        last_point = affirmative_reply
+
+        negative_prompt, negative_info = self._free_debate_prompt(self.negative, last_point, round_number)
+        negative_reply, neg_meta = await self._invoke(
+            self.negative,
+            negative_prompt,
+            context={
+                "stage": "free_debate",
+                "round": round_number,
+                "role": self.negative.role.value,
+            },
+            stage=f"free_debate_round{round_number}_negative",
+            kind=StageKind.FREE_DEBATE,
+            prompt_info=negative_info,
+        )
+        negative_turn = DebateTurn(
+            stage=f"free_debate_round{round_number}_negative",
+            speaker_role=self.negative.role,
+            speaker_name=self.negative.config.name,
+            content=negative_reply,
+            metadata=neg_meta,
+        )
+        await self._record_turn(negative_turn)
+
+        return negative_reply
+
+    def _free_debate_prompt(
+        self,
+        side: SideAssignment,
+        last_point: str,
+        round_number: int,
+    ) -> Tuple[str, Dict[str, Any]]:
+        def render(last_opponent_point: List[str]) -> str:
+            return script_templates.free_debate_prompt(
+                side=side.role.value,
                 topic=self.request.topic,
-                last_opponent_point=last_point,
+                last_opponent_point=last_opponent_point[0] if last_opponent_point else "",
                 round_number=round_number,
             )
-            negative_reply, neg_meta = await self.negative.client.complete(
-                negative_prompt,
-                context={
-                    "stage": "free_debate",
-                    "round": round_number,
-                    "role": self.negative.role.value,
-                },
-            )
-            negative_turn = DebateTurn(
-                stage=f"free_debate_round{round_number}_negative",
-                speaker_role=self.negative.role,
-                speaker_name=self.negative.config.name,
-                content=negative_reply,
-                metadata=neg_meta,
-            )
-            self.transcript.append(negative_turn)
-            await self._emit_event("debate_turn", negative_turn)
 
-            last_point = negative_reply
+        return self._budgeted_prompt(
+            StageKind.FREE_DEBATE, render, {"last_opponent_point": [last_point]}
+        )
 
     async def _handle_closing_statements(self) -> None:
-        negative_prompt = script_templates.closing_statement_prompt(
-            side=self.negative.role.value,
-            topic=self.request.topic,
-            key_moments=self._collect_highlights(self.negative.config.name),
-        )
-        negative_reply, neg_meta = await self.negative.client.complete(
+        self._begin_stage(StageKind.CLOSING)
+        negative_prompt, negative_info = self._closing_prompt(self.negative)
+        negative_reply, neg_meta = await self._invoke(
+            self.negative,
             negative_prompt,
             context={"stage": "closing_negative", "topic": self.request.topic},
+            stage="closing_negative",
+            kind=StageKind.CLOSING,
+            prompt_info=negative_info,
         )
         negative_turn = DebateTurn(
             stage="closing_negative",
@@ -315,17 +914,16 @@ class DebateOrchestrator:
             content=negative_reply,
             metadata=neg_meta,
         )
-        self.transcript.append(negative_turn)
-        await self._emit_event("debate_turn", negative_turn)
+        await self._record_turn(negative_turn)
 
-        affirmative_prompt = script_templates.closing_statement_prompt(
-            side=self.affirmative.role.value,
-            topic=self.request.topic,
-            key_moments=self._collect_highlights(self.affirmative.config.name),
-        )
-        affirmative_reply, aff_meta = await self.affirmative.client.complete(
+        affirmative_prompt, affirmative_info = self._closing_prompt(self.affirmative)
+        affirmative_reply, aff_meta = await self._invoke(
+            self.affirmative,
             affirmative_prompt,
             context={"stage": "closing_affirmative", "topic": self.request.topic},
+            stage="closing_affirmative",
+            kind=StageKind.CLOSING,
+            prompt_info=affirmative_info,
         )
         affirmative_turn = DebateTurn(
             stage="closing_affirmative",
@@ -334,38 +932,151 @@ class DebateOrchestrator:
             content=affirmative_reply,
             metadata=aff_meta,
         )
-        self.transcript.append(affirmative_turn)
-        await self._emit_event("debate_turn", affirmative_turn)
+        await self._record_turn(affirmative_turn)
+
+    def _closing_prompt(self, side: SideAssignment) -> Tuple[str, Dict[str, Any]]:
+        def render(key_moments: List[str]) -> str:
+            return script_templates.closing_statement_prompt(
+                side=side.role.value, topic=self.request.topic, key_moments=key_moments
+            )
+
+        return self._budgeted_prompt(
+            StageKind.CLOSING,
+            render,
+            {"key_moments": self._collect_highlights(side.config.name)},
+            newest_first=("key_moments",),
+        )
 
     async def _handle_judges(self) -> None:
-        transcript_summary = "\n".join(self._recent_turns_summary(limit=12))
-        tasks = []
-        for judge in self.judges:
-            prompt = script_templates.judge_prompt(
+        self._begin_stage(StageKind.JUDGING)
+        deadline = self._deadline_for(StageKind.JUDGING)
+
+        def render(highlights: List[str]) -> str:
+            return script_templates.judge_prompt(
                 topic=self.request.topic,
-                transcript_summary=transcript_summary,
+                transcript_summary="\n".join(highlights),
                 required_vote="affirmative_or_negative",
             )
-            tasks.append(
-                judge.client.complete(
+
+        # Every judge gets the same prompt, so it is fitted to the budget once.
+        budget = self.options.prompt_token_budgets.get(StageKind.JUDGING)
+        room = JUDGE_HIGHLIGHT_TOKENS if budget is None else budget - estimate_tokens(render([]))
+        prompt, prompt_info = self._budgeted_prompt(
+            StageKind.JUDGING, render, {"highlights": self._debate_highlights(room)}
+        )
+        tasks = [
+            self._judge_ballot(index, judge, prompt, deadline, prompt_info)
+            for index, judge in enumerate(self.judges)
+        ]
+
+        await self._collect_ballots(tasks)
+
+    async def _collect_ballots(
+        self,
+        ballots: List[Awaitable[Tuple[str, Dict[str, Any]]]],
+    ) -> None:
+        """Record ballots in completion order; failures and stragglers become abstentions."""
+        loop = asyncio.get_running_loop()
+        tasks = {asyncio.ensure_future(ballot): judge for ballot, judge in zip(ballots, self.judges)}
+        pending = set(tasks)
+        quorum = self.options.judge_quorum
+        closes_at: Optional[float] = None
+        try:
+            while pending:
+                timeout = None if closes_at is None else max(0.0, closes_at - loop.time())
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    judge = tasks[task]
+                    try:
+                        content, metadata = task.result()
+                    except Exception as exc:  # noqa: BLE001
+                        logger.warning("Judge %s failed: %s", judge.config.name, exc)
+                        await self._record_abstention(judge, "failed", str(exc) or repr(exc))
+                        continue
+                    await self._record_ballot(judge, content, metadata)
+                if closes_at is None and quorum is not None and self._ballots_settled(quorum, len(pending)):
+                    closes_at = loop.time() + self.options.judge_grace_seconds
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        for task in pending:
+            await self._record_abstention(tasks[task], "cancelled", "Quorum reached before this ballot arrived.")
+        self._judging_summary = {
+            "quorum": quorum,
+            "closed_early": bool(pending),
+            "valid_ballots": sum(1 for vote in self.judge_votes if vote.vote != "abstain"),
+            "abstentions": sum(1 for vote in self.judge_votes if vote.vote == "abstain"),
+        }
+
+    def _ballots_settled(self, quorum: int, outstanding: int) -> bool:
+        valid = [vote.vote for vote in self.judge_votes if vote.vote != "abstain"]
+        if len(valid) >= quorum:
+            return True
+        lead = abs(valid.count("affirmative") - valid.count("negative"))
+        return lead > outstanding
+
+    async def _record_ballot(
+        self,
+        judge: SideAssignment,
+        content: str,
+        metadata: Dict[str, Any],
+    ) -> None:
+        vote_line, rationale_line, extra_meta = self._parse_judge_response(content)
+        combined_meta = {**metadata}
+        combined_meta.update(extra_meta)
+        judge_vote = JudgeVote(
+            judge_name=judge.config.name,
+            vote=vote_line,
+            rationale=rationale_line,
+            metadata=combined_meta,
+        )
+        self.judge_votes.append(judge_vote)
+        await self._emit_event("judge_vote", judge_vote)
+
+    async def _record_abstention(self, judge: SideAssignment, reason: str, detail: str) -> None:
+        judge_vote = JudgeVote(
+            judge_name=judge.config.name,
+            vote="abstain",
+            rationale=f"No ballot recorded ({reason}).",
+            metadata={"abstained": True, "reason": reason, "detail": detail},
+        )
+        self.judge_votes.append(judge_vote)
+        await self._emit_event("judge_vote", judge_vote)
+
+    async def _judge_ballot(
+        self,
+        index: int,
+        judge: SideAssignment,
+        prompt: str,
+        deadline: Optional[Deadline],
+        prompt_info: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        key = f"judging_{index}"
+        async with tracing.span(
+            key, "stage", speaker=judge.config.name, stage_kind=StageKind.JUDGING.value
+        ) as span:
+            replayed = self._replay(key)
+            if replayed is not None:
+                span.set(replayed=True)
+                return replayed
+            with self._sending():
+                reply = await judge.client.complete(
                     prompt,
                     context={"stage": "judging", "topic": self.request.topic},
+                    cache_policy=self._cache_policy(StageKind.JUDGING),
+                    hedge=StageKind.JUDGING in self.options.hedge_stages,
+                    deadline=deadline,
                 )
-            )
-
-        judge_outputs = await asyncio.gather(*tasks)
-        for judge, (content, metadata) in zip(self.judges, judge_outputs):
-            vote_line, rationale_line, extra_meta = self._parse_judge_response(content)
-            combined_meta = {**metadata}
-            combined_meta.update(extra_meta)
-            judge_vote = JudgeVote(
-                judge_name=judge.config.name,
-                vote=vote_line,
-                rationale=rationale_line,
-                metadata=combined_meta,
-            )
-            self.judge_votes.append(judge_vote)
-            await self._emit_event("judge_vote", judge_vote)
+            reply = self._with_prompt_info(reply, prompt, prompt_info)
+            self._annotate_span(span, reply[1])
+            await self._journal(key, reply)
+            return reply
 
     async def _debaters_statement(
         self,
@@ -379,9 +1090,12 @@ class DebateOrchestrator:
             topic=self.request.topic,
             briefing=briefing,
         )
-        reply, metadata = await side.client.complete(
+        reply, metadata = await self._invoke(
+            side,
             prompt,
             context={"stage": stage, "topic": self.request.topic},
+            stage=stage,
+            kind=StageKind.OPENING,
         )
         turn = DebateTurn(
             stage=stage,
@@ -390,8 +1104,7 @@ class DebateOrchestrator:
             content=reply,
             metadata=metadata,
         )
-        self.transcript.append(turn)
-        await self._emit_event("debate_turn", turn)
+        await self._record_turn(turn)
 
     async def _host_interlude(
         self,
@@ -399,18 +1112,22 @@ class DebateOrchestrator:
         instruction: str,
         highlights: List[str],
     ) -> None:
-        prompt = self._build_host_prompt(stage, instruction, highlights)
-        content, metadata = await self.host_client.complete(
+        self._begin_stage(StageKind.HOST)
+        prompt, prompt_info = self._budgeted_prompt(
+            StageKind.HOST,
+            lambda highlights: self._build_host_prompt(stage, instruction, highlights),
+            {"highlights": highlights},
+        )
+        content, metadata = await self._invoke(
+            self.host,
             prompt,
-            context={
-                "stage": stage,
-                "topic": self.request.topic,
-                "highlights": highlights,
-            },
+            context={"stage": stage, "topic": self.request.topic},
+            stage=stage,
+            kind=StageKind.HOST,
+            prompt_info=prompt_info,
         )
         interlude = HostInterlude(stage=stage, content=content, metadata=metadata)
-        self.interludes.append(interlude)
-        await self._emit_event("host_interlude", interlude)
+        await self._record_interlude(interlude)
 
     def _build_host_prompt(
         self,
@@ -419,42 +1136,34 @@ class DebateOrchestrator:
         highlights: List[str],
     ) -> str:
         highlight_text = "\n".join(f"- {item}" for item in highlights if item)
+        # Fixed instructions first so successive host calls share a cacheable prefix.
         return (
-            f"You are the charismatic debate host. Stage: {stage}.\n"
+            "You are the charismatic debate host.\n"
+            "Keep it under 80 words, inject light humor without derailing the competition.\n"
+            "Return a single paragraph.\n"
+            f"Stage: {stage}.\n"
             f"Objective: {instruction}\n"
-            f"Keep it under 80 words, inject light humor without derailing the competition.\n"
-            f"Highlights to reference:\n{highlight_text}\n"
-            "Return a single paragraph."
+            f"Highlights to reference:\n{highlight_text}"
         )
 
     def _collect_highlights(self, speaker_name: str, limit: int = 4) -> List[str]:
-        highlights = [
-            turn.content
-            for turn in reversed(self.transcript)
-            if turn.speaker_name == speaker_name
-        ]
-        return highlights[:limit]
+        return self.transcript_store.recent_contents(speaker_name, limit)
 
     def _last_turn_summary(self, speaker_name: str) -> str:
-        for turn in reversed(self.transcript):
-            if turn.speaker_name == speaker_name:
-                snippet = turn.content
-                return f"{speaker_name} just said: {snippet[:120]}"
-        return f"{speaker_name} is preparing to speak."
+        summary = self.transcript_store.last_summary(speaker_name)
+        if summary is None:
+            return f"{speaker_name} is preparing to speak."
+        return summary
+
+    def _debate_highlights(self, max_tokens: int) -> List[str]:
+        return self.highlight_index.select(max_tokens)
 
     def _recent_turns_summary(self, limit: int = 6) -> List[str]:
-        recent = []
-        for turn in reversed(self.transcript):
-            label = f"{turn.speaker_name}: {turn.content}"
-            recent.append(label[:160])
-            if len(recent) >= limit:
-                break
-        return list(reversed(recent))
+        return self.transcript_store.recent_snippets(limit)
 
     def _last_turn_content(self) -> str:
-        if not self.transcript:
-            return ""
-        return self.transcript[-1].content
+        turn = self.transcript_store.last()
+        return turn.content if turn is not None else ""
 
     def _parse_judge_response(self, content: str) -> Tuple[str, str, Dict[str, Any]]:
         try:
@@ -523,6 +1232,9 @@ class DebateOrchestrator:
         scoreboard = f"Final tally — Affirmative: {affirmative_votes}, Negative: {negative_votes}"
         if tie_votes:
             scoreboard += f", Ties: {tie_votes}"
+        abstentions = sum(1 for vote in self.judge_votes if vote.vote == "abstain")
+        if abstentions:
+            scoreboard += f", Abstentions: {abstentions}"
 
         return [winner_line, scoreboard]
 
@@ -531,4 +1243,6 @@ class DebateOrchestrator:
             name=config.name,
             endpoint=str(config.endpoint),
             timeout=options.request_timeout_seconds,
+            pool=self._http_pool,
+            replicas=[str(replica) for replica in config.replicas],
         )
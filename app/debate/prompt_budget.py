@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
+
+# Full-width punctuation, kana, CJK ideographs and half/full-width forms.
+_WIDE_CHARS = re.compile(r"[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef]")
+
+# Below this an item is dropped outright rather than trimmed to a useless stub.
+MIN_ITEM_TOKENS = 12
+ELLIPSIS = "…"
+
+
+def estimate_tokens(text: str) -> int:
+    """Offline token estimate using DeepSeek's rough ratios: ~0.3/Latin char, ~0.6/CJK char."""
+    if not text:
+        return 0
+    wide = len(_WIDE_CHARS.findall(text))
+    return max(1, math.ceil(0.3 * (len(text) - wide) + 0.6 * wide))
+
+
+def trim_text(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    keep = len(text)
+    while keep > 0:
+        keep = min(keep - 1, int(keep * max_tokens / max(estimate_tokens(text[:keep]), 1)))
+        candidate = text[: max(keep, 0)].rstrip() + ELLIPSIS
+        if estimate_tokens(candidate) <= max_tokens:
+            return candidate
+    return ELLIPSIS
+
+
+@dataclass
+class BudgetReport:
+    budget: Optional[int]
+    tokens: int
+    dropped: int = 0
+    trimmed: int = 0
+
+    def as_metadata(self) -> Dict[str, Any]:
+        metadata: Dict[str, Any] = {"prompt_tokens_estimate": self.tokens}
+        if self.budget is not None:
+            metadata["prompt_budget"] = {
+                "budget": self.budget,
+                "dropped_items": self.dropped,
+                "trimmed_items": self.trimmed,
+            }
+        return metadata
+
+
+def fit_prompt(
+    render: Callable[..., str],
+    lists: Dict[str, List[str]],
+    budget: Optional[int],
+    newest_first: Collection[str] = (),
+) -> Tuple[str, BudgetReport]:
+    """Render ``render(**lists)`` within ``budget`` estimated tokens.
+
+    Deterministic: while over budget the list holding the most tokens loses its
+    oldest item (lists named in ``newest_first`` are ordered newest-first). Once
+    every list is down to one item, the largest item is trimmed, then dropped.
+    """
+    lists = {name: list(items) for name, items in lists.items()}
+    prompt = render(**lists)
+    tokens = estimate_tokens(prompt)
+    report = BudgetReport(budget=budget, tokens=tokens)
+    if budget is None:
+        return prompt, report
+
+    while tokens > budget:
+        sizes = {name: sum(estimate_tokens(item) for item in items) for name, items in lists.items()}
+        droppable = [(sizes[name], name) for name, items in lists.items() if len(items) > 1]
+        if droppable:
+            _, name = max(droppable)
+            lists[name].pop(-1 if name in newest_first else 0)
+            report.dropped += 1
+        else:
+            remaining = [(sizes[name], name) for name, items in lists.items() if items]
+            if not remaining:
+                break
+            size, name = max(remaining)
+            target = size - (tokens - budget)
+            if target < MIN_ITEM_TOKENS:
+                lists[name] = []
+                report.dropped += 1
+            else:
+                lists[name] = [trim_text(lists[name][0], target)]
+                report.trimmed += 1
+        prompt = render(**lists)
+        tokens = estimate_tokens(prompt)
+
+    report.tokens = tokens
+    return prompt, report
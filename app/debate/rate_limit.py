@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any, AsyncIterator, Dict, Optional
+
+from host_service.http_utils import MAX_RETRY_DELAY_SECONDS
+from host_service.metrics import get_registry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LimiterSettings:
+    max_in_flight: int = 8
+    requests_per_second: float = 0.0
+    tokens_per_minute: float = 0.0
+
+    @classmethod
+    def from_env(cls) -> "LimiterSettings":
+        return cls(
+            max_in_flight=int(os.getenv("LLM_LIMIT_MAX_IN_FLIGHT", "8")),
+            requests_per_second=float(os.getenv("LLM_LIMIT_RPS", "0")),
+            tokens_per_minute=float(os.getenv("LLM_LIMIT_TPM", "0")),
+        )
+
+
+def _overrides_from_env(base: LimiterSettings) -> Dict[str, LimiterSettings]:
+    raw = os.getenv("LLM_LIMIT_OVERRIDES")
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError:
+        logger.warning("Ignoring malformed LLM_LIMIT_OVERRIDES value.")
+        return {}
+    return {
+        endpoint: replace(base, **values)
+        for endpoint, values in data.items()
+        if isinstance(values, dict)
+    }
+
+
+class TokenBucket:
+    """Reservation-style bucket: callers take tokens up front and sleep off any debt."""
+
+    def __init__(self, rate_per_second: float, capacity: float) -> None:
+        self.rate = rate_per_second
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float) -> float:
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= min(amount, self.capacity)
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+@dataclass
+class LimiterSlot:
+    waited: float = 0.0
+
+
+@dataclass
+class EndpointLimiter:
+    settings: LimiterSettings
+    in_flight: int = 0
+    queued: int = 0
+    blocked_until: float = 0.0
+    _semaphore: asyncio.Semaphore = field(init=False, repr=False)
+    _requests: TokenBucket = field(init=False, repr=False)
+    _tokens: TokenBucket = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        settings = self.settings
+        self._semaphore = asyncio.Semaphore(max(1, settings.max_in_flight))
+        rps = settings.requests_per_second
+        self._requests = TokenBucket(rps, capacity=rps)
+        tpm = settings.tokens_per_minute
+        self._tokens = TokenBucket(tpm / 60.0, capacity=tpm)
+
+    def defer(self, seconds: float) -> None:
+        """Honour a ``Retry-After`` by pausing every caller of this endpoint, capped like the gateway's."""
+        seconds = min(seconds, MAX_RETRY_DELAY_SECONDS)
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0) -> AsyncIterator[LimiterSlot]:
+        started = time.monotonic()
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        try:
+            delay = max(
+                self.blocked_until - time.monotonic(),
+                self._requests.reserve(1),
+                self._tokens.reserve(estimated_tokens),
+            )
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.in_flight += 1
+            try:
+                yield LimiterSlot(waited=time.monotonic() - started)
+            finally:
+                self.in_flight -= 1
+        finally:
+            self._semaphore.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"in_flight": self.in_flight, "queued": self.queued}
+
+
+class LimiterRegistry:
+    def __init__(
+        self,
+        defaults: Optional[LimiterSettings] = None,
+        overrides: Optional[Dict[str, LimiterSettings]] = None,
+    ) -> None:
+        self.defaults = defaults or LimiterSettings.from_env()
+        self.overrides = overrides if overrides is not None else _overrides_from_env(self.defaults)
+        self._limiters: Dict[str, EndpointLimiter] = {}
+
+    def get(self, endpoint: str) -> EndpointLimiter:
+        limiter = self._limiters.get(endpoint)
+        if limiter is None:
+            limiter = EndpointLimiter(self.overrides.get(endpoint, self.defaults))
+            self._limiters[endpoint] = limiter
+        return limiter
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {endpoint: limiter.snapshot() for endpoint, limiter in self._limiters.items()}
+
+
+_shared_limiters: Optional[LimiterRegistry] = None
+
+
+def get_shared_limiters() -> LimiterRegistry:
+    global _shared_limiters
+    if _shared_limiters is None:
+        _shared_limiters = LimiterRegistry()
+        _export_gauges(_shared_limiters)
+    return _shared_limiters
+
+
+def _export_gauges(registry: LimiterRegistry) -> None:
+    metrics = get_registry()
+    for field_name, documentation in (
+        ("queued", "Calls waiting for a per-endpoint limiter slot."),
+        ("in_flight", "Calls currently holding a per-endpoint limiter slot."),
+    ):
+        gauge = metrics.gauge(f"llm_limiter_{field_name}", documentation, ("endpoint",))
+        gauge.set_function(
+            lambda field_name=field_name: {
+                (endpoint,): state[field_name] for endpoint, state in registry.snapshot().items()
+            }
+        )
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CachedReply = Tuple[str, Dict[str, Any]]
+
+
+def make_cache_key(
+    endpoint: str,
+    prompt: str,
+    context: Dict[str, Any],
+    tags: Optional[Dict[str, Any]] = None,
+) -> str:
+    material = json.dumps(
+        {"endpoint": endpoint, "prompt": prompt, "context": context, "tags": tags or {}},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheSettings:
+    memory_entries: int = 512
+    disk_dir: Optional[str] = None
+    disk_ttl_seconds: float = 7 * 24 * 3600
+    disk_max_bytes: int = 256 * 1024 * 1024
+
+    @classmethod
+    def from_env(cls) -> "CacheSettings":
+        return cls(
+            memory_entries=int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "512")),
+            disk_dir=os.getenv("LLM_CACHE_DIR") or None,
+            disk_ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+            disk_max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+        )
+
+
+class MemoryLRU:
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max(0, max_entries)
+        self._entries: "OrderedDict[str, CachedReply]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[CachedReply]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, value: CachedReply) -> None:
+        if self.max_entries == 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache:
+    """JSON files sharded by key prefix, expired by TTL and evicted oldest-first by size."""
+
+    def __init__(self, directory: Path, ttl_seconds: float, max_bytes: int) -> None:
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._approx_bytes: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[CachedReply]:
+        path = self._path(key)
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                record = json.load(handle)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError):
+            logger.warning("Discarding unreadable cache entry %s", path)
+            self._unlink(path)
+            return None
+
+        if time.time() - float(record.get("stored_at", 0)) > self.ttl_seconds:
+            self._unlink(path)
+            return None
+        return str(record["content"]), dict(record.get("metadata") or {})
+
+    def put(self, key: str, value: CachedReply) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {"stored_at": time.time(), "content": value[0], "metadata": value[1]}
+        encoded = json.dumps(record, ensure_ascii=False, default=str).encode("utf-8")
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        with tmp_path.open("wb") as handle:
+            handle.write(encoded)
+        os.replace(tmp_path, path)
+
+        if self._approx_bytes is None:
+            self._approx_bytes = self._scan_size()
+        else:
+            self._approx_bytes += len(encoded)
+        if self._approx_bytes > self.max_bytes:
+            self._evict()
+
+    def _scan_size(self) -> int:
+        return sum(path.stat().st_size for path in self.directory.glob("*/*.json"))
+
+    def _evict(self) -> None:
+        entries: List[Tuple[float, int, Path]] = []
+        now = time.time()
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.ttl_seconds:
+                self._unlink(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        # Trim to 90% of the budget so we do not rescan on every write.
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            self._unlink(path)
+            total -= size
+        self._approx_bytes = total
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ResponseCache:
+    def __init__(self, settings: Optional[CacheSettings] = None) -> None:
+        self.settings = settings or CacheSettings.from_env()
+        self.memory = MemoryLRU(self.settings.memory_entries)
+        self.disk: Optional[DiskCache] = None
+        if self.settings.disk_dir:
+            self.disk = DiskCache(
+                Path(self.settings.disk_dir),
+                ttl_seconds=self.settings.disk_ttl_seconds,
+                max_bytes=self.settings.disk_max_bytes,
+            )
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Tuple[Optional[CachedReply], Optional[str]]:
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry, "memory"
+        if self.disk is not None:
+            entry = await asyncio.to_thread(self.disk.get, key)
+            if entry is not None:
+                self.memory.put(key, entry)
+                self.hits += 1
+                return entry, "disk"
+        self.misses += 1
+        return None, None
+
+    async def put(self, key: str, value: CachedReply) -> None:
+        self.memory.put(key, value)
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(self.disk.put, key, value)
+            except OSError:
+                logger.exception("Failed to persist cache entry %s", key)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "memory_entries": len(self.memory)}
+
+
+_shared_cache: Optional[ResponseCache] = None
+
+
+def get_shared_cache() -> ResponseCache:
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ResponseCache()
+    return _shared_cache
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Sequence, Tuple
+
+from . import tracing
+
+EventSink = Callable[[str, Any], Awaitable[None]]
+
+_current_node: contextvars.ContextVar[Optional["_NodeState"]] = contextvars.ContextVar(
+    "debate_stage_node", default=None
+)
+
+
+@dataclass
+class StageNode:
+    """One block of the debate format.
+
+    ``start`` is called when every node named in ``after`` has finished, so any
+    transcript-derived arguments it captures see exactly its dependencies' output.
+    """
+
+    name: str
+    start: Callable[[], Awaitable[None]]
+    after: Tuple[str, ...] = ()
+
+
+@dataclass
+class _NodeState:
+    node: StageNode
+    index: int
+    pending: Deque[Tuple[str, Any]] = field(default_factory=deque)
+    task: Optional[asyncio.Task] = None
+    finished: bool = False
+    started: float = 0.0
+    ended: float = 0.0
+    seq: int = 0
+
+
+def _coalesce_deltas(pending: Deque[Tuple[str, Any]]) -> None:
+    """Merge buffered ``turn_delta`` runs so a late node's draft replays as one chunk."""
+    merged: Deque[Tuple[str, Any]] = deque()
+    for event_type, data in pending:
+        if event_type == "turn_delta" and merged and merged[-1][0] == "turn_delta":
+            previous = merged[-1][1]
+            if previous.get("stage") == data.get("stage"):
+                merged[-1] = (event_type, {**previous, "delta": previous["delta"] + data["delta"]})
+                continue
+        merged.append((event_type, data))
+    pending.clear()
+    pending.extend(merged)
+
+
+class StageScheduler:
+    """Runs stage nodes as soon as their dependencies finish.
+
+    Events emitted by a node pass through a reorder buffer: only the earliest
+    unfinished node (in canonical order) streams live; later nodes are held back
+    and flushed once everything before them has committed.
+    """
+
+    def __init__(
+        self,
+        nodes: Sequence[StageNode],
+        sink: Optional[EventSink] = None,
+        on_finished: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> None:
+        self._states = [_NodeState(node=node, index=index) for index, node in enumerate(nodes)]
+        self._by_name = {state.node.name: state for state in self._states}
+        for state in self._states:
+            for dependency in state.node.after:
+                if dependency not in self._by_name:
+                    raise ValueError(f"Stage '{state.node.name}' depends on unknown stage '{dependency}'.")
+                if self._by_name[dependency].index >= state.index:
+                    raise ValueError(f"Stage '{state.node.name}' must come after '{dependency}'.")
+        self._sink = sink
+        self._on_finished = on_finished
+        self._head = 0
+        self._lock = asyncio.Lock()
+        self._origin = 0.0
+        self._finished_at = 0.0
+
+    async def run(self) -> Dict[str, Any]:
+        self._origin = time.monotonic()
+        running: Dict[asyncio.Task, _NodeState] = {}
+        self._launch_ready(running)
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    running.pop(task)
+                    task.result()
+                self._launch_ready(running)
+        except BaseException:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+        self._finished_at = time.monotonic() - self._origin
+        return self.report()
+
+    def _launch_ready(self, running: Dict[asyncio.Task, _NodeState]) -> None:
+        for state in self._states:
+            if state.task is not None:
+                continue
+            if all(self._by_name[name].finished for name in state.node.after):
+                state.started = time.monotonic() - self._origin
+                state.task = asyncio.create_task(self._execute(state, state.node.start()))
+                running[state.task] = state
+
+    async def _execute(self, state: _NodeState, body: Awaitable[None]) -> None:
+        _current_node.set(state)
+        try:
+            async with tracing.span(state.node.name, "block", after=list(state.node.after)):
+                await body
+            if self._on_finished is not None:
+                await self._on_finished(state.node.name)
+        finally:
+            state.ended = time.monotonic() - self._origin
+            state.finished = True
+            await self._drain()
+
+    async def emit(self, event_type: str, data: Any) -> None:
+        state = _current_node.get()
+        if state is None or self._by_name.get(state.node.name) is not state:
+            if self._sink is not None:
+                await self._sink(event_type, data)
+            return
+        if self._sink is None:
+            return
+        state.pending.append((event_type, data))
+        await self._drain()
+
+    async def _drain(self) -> None:
+        async with self._lock:
+            while self._head < len(self._states):
+                head = self._states[self._head]
+                while head.pending:
+                    event_type, data = head.pending.popleft()
+                    if self._sink is not None:
+                        await self._sink(event_type, data)
+                if not head.finished:
+                    return
+                self._head += 1
+                if self._head < len(self._states):
+                    _coalesce_deltas(self._states[self._head].pending)
+
+    def order_key(self) -> Tuple[int, int]:
+        """Canonical position for a record produced by the current node."""
+        state = _current_node.get()
+        if state is None or self._by_name.get(state.node.name) is not state:
+            return (len(self._states), 0)
+        state.seq += 1
+        return (state.index, state.seq)
+
+    def report(self) -> Dict[str, Any]:
+        ran = [state for state in self._states if state.task is not None]
+        if not ran:
+            return {}
+        path = [max(ran, key=lambda state: state.ended)]
+        while path[-1].node.after:
+            gate = max((self._by_name[name] for name in path[-1].node.after), key=lambda s: s.ended)
+            path.append(gate)
+        path.reverse()
+        busy = sum(state.ended - state.started for state in ran)
+        wall = self._finished_at or max(state.ended for state in ran)
+        return {
+            "wall_seconds": round(wall, 3),
+            "busy_seconds": round(busy, 3),
+            "parallelism": round(busy / wall, 2) if wall else None,
+            "critical_path": [state.node.name for state in path],
+            "critical_path_seconds": round(sum(s.ended - s.started for s in path), 3),
+            "stages": {
+                state.node.name: {
+                    "start": round(state.started, 3),
+                    "end": round(state.ended, 3),
+                    "after": list(state.node.after),
+                }
+                for state in ran
+            },
+        }
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from textwrap import dedent
-from typing import List
+from typing import List, Optional
 
 
 def opening_statement_prompt(side: str, topic: str, briefing: List[str]) -> str:
@@ -19,6 +19,7 @@ def cross_question_prompt(
     topic: str,
     previous_questions: List[str],
     opponent_highlights: List[str],
+    previous_answers: Optional[List[str]] = None,
 ) -> str:
     asked = "\n".join(f"- {item}" for item in previous_questions)
     highlights = "\n".join(f"- {item}" for item in opponent_highlights)
@@ -28,6 +29,9 @@ The question must be concise (max 60 words) and cannot contain multiple question
 """
     if previous_questions:
         prompt += "Questions already asked:\n" + asked + "\n"
+    if previous_answers:
+        answered = "\n".join(f"- {item}" for item in previous_answers)
+        prompt += "Opponent's answers so far:\n" + answered + "\n"
     if opponent_highlights:
         prompt += "Opponent talking points worth pressing:\n" + highlights + "\n"
     prompt += "Return only the question."
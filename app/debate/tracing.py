@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+# Summed from children into parents that did not set them, so blocks and the
+# debate span report totals for everything under them.
+ROLLUP_KEYS = ("bytes_in", "bytes_out", "prompt_tokens", "completion_tokens", "prompt_cache_hit_tokens")
+
+SpanSink = Callable[["Span"], Awaitable[None]]
+
+_current: contextvars.ContextVar[Tuple[Optional["Tracer"], Optional["Span"]]] = contextvars.ContextVar(
+    "debate_trace", default=(None, None)
+)
+
+
+@dataclass
+class Span:
+    span_id: int
+    name: str
+    kind: str
+    parent_id: Optional[int]
+    start: float
+    end: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update({key: value for key, value in attributes.items() if value is not None})
+
+    def as_dict(self) -> Dict[str, Any]:
+        end = self.end if self.end is not None else self.start
+        return {
+            "id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": round(self.start, 6),
+            "end": round(end, 6),
+            "duration_ms": round((end - self.start) * 1000, 3),
+            "attributes": self.attributes,
+        }
+
+
+class Tracer:
+    """Per-debate span tree: debate -> block -> stage -> LLMClient attempt.
+
+    Times are seconds since the tracer was created; ``started_at`` anchors them to
+    the wall clock. Spans are recorded (and sent to ``sink``) when they end.
+    """
+
+    def __init__(self, sink: Optional[SpanSink] = None) -> None:
+        self.started_at = time.time()
+        self._origin = time.monotonic()
+        self._ids = itertools.count(1)
+        self._sink = sink
+        self._rollups: Dict[int, Dict[str, float]] = {}
+        self.spans: List[Span] = []
+
+    @contextmanager
+    def active(self) -> Iterator[None]:
+        """Make this the tracer for the enclosed code and the tasks it spawns."""
+        token = _current.set((self, None))
+        try:
+            yield
+        finally:
+            _current.reset(token)
+
+    def now(self) -> float:
+        return time.monotonic() - self._origin
+
+    @asynccontextmanager
+    async def span(self, name: str, kind: str, **attributes: Any) -> AsyncIterator[Span]:
+        tracer, parent = _current.get()
+        parent_id = parent.span_id if tracer is self and parent is not None else None
+        span = Span(span_id=next(self._ids), name=name, kind=kind, parent_id=parent_id, start=self.now())
+        span.set(**attributes)
+        token = _current.set((self, span))
+        cancelled = False
+        try:
+            yield span
+        except asyncio.CancelledError:
+            cancelled = True
+            span.set(error="cancelled")
+            raise
+        except BaseException as exc:
+            span.set(error=str(exc) or repr(exc))
+            raise
+        finally:
+            _current.reset(token)
+            span.end = self.now()
+            self._roll_up(span)
+            self.spans.append(span)
+            # A cancelled task must not await again on its way out.
+            if self._sink is not None and not cancelled:
+                await self._sink(span)
+
+    def _roll_up(self, span: Span) -> None:
+        totals = self._rollups.pop(span.span_id, {})
+        for key, value in totals.items():
+            span.attributes.setdefault(key, value)
+        if span.parent_id is None:
+            return
+        parent_totals = self._rollups.setdefault(span.parent_id, {})
+        for key in ROLLUP_KEYS:
+            value = span.attributes.get(key)
+            if isinstance(value, (int, float)):
+                parent_totals[key] = parent_totals.get(key, 0) + value
+
+    def export(self) -> Dict[str, Any]:
+        spans = sorted(self.spans, key=lambda span: (span.start, span.span_id))
+        return {"started_at": self.started_at, "spans": [span.as_dict() for span in spans]}
+
+
+@asynccontextmanager
+async def span(name: str, kind: str, **attributes: Any) -> AsyncIterator[Span]:
+    """Open a child span under the active tracer; a detached no-op span when tracing is off."""
+    tracer, _ = _current.get()
+    if tracer is None:
+        yield Span(span_id=0, name=name, kind=kind, parent_id=None, start=0.0)
+        return
+    async with tracer.span(name, kind, **attributes) as active:
+        yield active
+
+
+def _assign_lanes(spans: List[Mapping[str, Any]]) -> Dict[int, int]:
+    """Pack spans onto lanes where every pair either nests or does not overlap."""
+    lanes: List[List[Mapping[str, Any]]] = []
+    assigned: Dict[int, int] = {}
+    for item in sorted(spans, key=lambda item: (item["start"], -item["end"], item["id"])):
+        for index, stack in enumerate(lanes):
+            while stack and stack[-1]["end"] <= item["start"]:
+                stack.pop()
+            if not stack or stack[-1]["end"] >= item["end"]:
+                stack.append(item)
+                assigned[item["id"]] = index
+                break
+        else:
+            lanes.append([item])
+            assigned[item["id"]] = len(lanes) - 1
+    return assigned
+
+
+def chrome_trace(trace: Mapping[str, Any], label: str = "debate") -> Dict[str, Any]:
+    """Convert ``Tracer.export()`` output into Chrome trace-event JSON (chrome://tracing, Perfetto)."""
+    spans: List[Mapping[str, Any]] = list(trace.get("spans") or [])
+    lanes = _assign_lanes(spans)
+    events: List[Dict[str, Any]] = [
+        {"ph": "M", "name": "process_name", "pid": 1, "tid": 0, "args": {"name": label}}
+    ]
+    for lane in sorted(set(lanes.values())):
+        events.append(
+            {"ph": "M", "name": "thread_name", "pid": 1, "tid": lane, "args": {"name": f"lane {lane}"}}
+        )
+    for item in spans:
+        events.append(
+            {
+                "ph": "X",
+                "name": item["name"],
+                "cat": item["kind"],
+                "pid": 1,
+                "tid": lanes[item["id"]],
+                "ts": round(item["start"] * 1_000_000),
+                "dur": round((item["end"] - item["start"]) * 1_000_000),
+                "args": {"span_id": item["id"], "parent_id": item["parent_id"], **item["attributes"]},
+            }
+        )
+    return {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {"started_at": trace.get("started_at")},
+    }
+
+
+def usage_attributes(metadata: Mapping[str, Any]) -> Dict[str, Any]:
+    """Token usage reported by a participant, flattened for span attributes."""
+    usage = metadata.get("usage")
+    if not isinstance(usage, Mapping):
+        return {}
+    return {
+        key: usage[key]
+        for key in ("prompt_tokens", "completion_tokens", "prompt_cache_hit_tokens")
+        if isinstance(usage.get(key), (int, float))
+    }
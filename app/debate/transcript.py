@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import bisect
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from .models import DebateTurn
+from .prompt_budget import estimate_tokens
+
+OrderKey = Tuple[int, int]
+
+SNIPPET_CHARS = 160
+SUMMARY_CHARS = 120
+
+
+@dataclass
+class TranscriptEntry:
+    key: OrderKey
+    turn: DebateTurn
+    snippet: str
+    summary: str
+    chars: int
+    tokens: int
+
+
+class TranscriptStore:
+    """Canonically ordered debate transcript with per-speaker/per-stage indexes.
+
+    Snippets used by prompts are truncated once on insert. Turns normally arrive
+    in order and are O(1) appends; an out-of-order insert (concurrent stages)
+    costs a bisect plus a rebuild of the recent-turn ring buffer.
+    """
+
+    def __init__(self, recent_limit: int = 16) -> None:
+        self.turns: List[DebateTurn] = []
+        self._entries: List[TranscriptEntry] = []
+        self._keys: List[OrderKey] = []
+        self._by_speaker: Dict[str, List[TranscriptEntry]] = {}
+        self._by_stage: Dict[str, List[TranscriptEntry]] = {}
+        self._recent: Deque[TranscriptEntry] = deque(maxlen=recent_limit)
+        self.chars = 0
+        self.tokens = 0
+        self.chars_by_speaker: Dict[str, int] = {}
+        self.tokens_by_speaker: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+    def __iter__(self) -> Iterator[DebateTurn]:
+        return iter(self.turns)
+
+    def insert(self, turn: DebateTurn, key: Optional[OrderKey] = None) -> None:
+        if key is None:
+            key = (self._keys[-1][0] + 1, 0) if self._keys else (0, 0)
+        content = turn.content
+        entry = TranscriptEntry(
+            key=key,
+            turn=turn,
+            snippet=f"{turn.speaker_name}: {content}"[:SNIPPET_CHARS],
+            summary=f"{turn.speaker_name} just said: {content[:SUMMARY_CHARS]}",
+            chars=len(content),
+            tokens=estimate_tokens(content),
+        )
+        position = bisect.bisect_right(self._keys, key)
+        appended = position == len(self._keys)
+        self._keys.insert(position, key)
+        self._entries.insert(position, entry)
+        self.turns.insert(position, turn)
+        self._index(self._by_speaker.setdefault(turn.speaker_name, []), entry)
+        self._index(self._by_stage.setdefault(turn.stage, []), entry)
+
+        if appended:
+            self._recent.append(entry)
+        else:
+            self._recent.clear()
+            self._recent.extend(self._entries[-(self._recent.maxlen or 0):])
+
+        speaker = turn.speaker_name
+        self.chars += entry.chars
+        self.tokens += entry.tokens
+        self.chars_by_speaker[speaker] = self.chars_by_speaker.get(speaker, 0) + entry.chars
+        self.tokens_by_speaker[speaker] = self.tokens_by_speaker.get(speaker, 0) + entry.tokens
+
+    @staticmethod
+    def _index(bucket: List[TranscriptEntry], entry: TranscriptEntry) -> None:
+        if not bucket or bucket[-1].key <= entry.key:
+            bucket.append(entry)
+            return
+        position = bisect.bisect_right([item.key for item in bucket], entry.key)
+        bucket.insert(position, entry)
+
+    def last(self, speaker: Optional[str] = None) -> Optional[DebateTurn]:
+        if speaker is None:
+            return self.turns[-1] if self.turns else None
+        bucket = self._by_speaker.get(speaker)
+        return bucket[-1].turn if bucket else None
+
+    def by_speaker(self, speaker: str) -> List[DebateTurn]:
+        return [entry.turn for entry in self._by_speaker.get(speaker, [])]
+
+    def by_stage(self, stage: str) -> List[DebateTurn]:
+        return [entry.turn for entry in self._by_stage.get(stage, [])]
+
+    def recent_contents(self, speaker: str, limit: int) -> List[str]:
+        """Newest-first contents of ``speaker``'s last ``limit`` turns."""
+        bucket = self._by_speaker.get(speaker, [])
+        return [entry.turn.content for entry in reversed(bucket[-limit:])] if limit > 0 else []
+
+    def recent_snippets(self, limit: int) -> List[str]:
+        """Oldest-first ``speaker: content`` snippets of the last ``limit`` turns."""
+        if limit <= 0:
+            return []
+        if limit <= len(self._recent):
+            return [entry.snippet for entry in list(self._recent)[-limit:]]
+        return [entry.snippet for entry in self._entries[-limit:]]
+
+    def last_summary(self, speaker: str) -> Optional[str]:
+        bucket = self._by_speaker.get(speaker)
+        return bucket[-1].summary if bucket else None
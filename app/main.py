@@ -4,15 +4,18 @@ import hashlib
 import json
 import os
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from fastapi import FastAPI, HTTPException, Response
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
+from host_service.metrics import get_registry, metrics_response
+from host_service.upstream import close_gateway
 from host_service.judges import (
     arbiter as preset_arbiter,
     coach as preset_coach,
@@ -21,6 +24,9 @@ from host_service.judges import (
     rhetoric as preset_rhetoric,
 )
 
+from .debate.broadcast import DebateChannel, get_broadcast_hub
+from .debate.checkpoint import CheckpointSettings, get_checkpoint_store, get_running_debates
+from .debate.http_pool import close_shared_pool, get_shared_pool
 from .debate.models import (
     DebateRequest,
     DebateResponse,
@@ -28,6 +34,7 @@ from .debate.models import (
     SaveDebateResponse,
 )
 from .debate.orchestrator import DebateOrchestrator
+from .debate.tracing import chrome_trace
 from .personas.models import (
     PersonaCatalog,
     PersonaDetail,
@@ -39,10 +46,27 @@ from .personas.models import (
 from .personas.runtime import run_persona
 from .personas.storage import PersonaStorage
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Preset judges and persona endpoints live on PUBLIC_BASE_URL; call them in-process.
+    get_shared_pool().register_local_app(PUBLIC_BASE_URL, app)
+    if CHECKPOINT_STORE is not None:
+        await asyncio.to_thread(CHECKPOINT_STORE.prune, CHECKPOINT_SETTINGS.retention_seconds)
+    try:
+        yield
+    finally:
+        # Let running debates finish; stragglers are cancelled and left resumable.
+        await get_running_debates().drain(CHECKPOINT_SETTINGS.shutdown_grace_seconds)
+        await close_shared_pool()
+        await close_gateway()
+
+
 app = FastAPI(
     title="AI Debate Arena",
     description="Coordinate multi-agent LLM debates with host interludes and judge voting.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -51,6 +75,17 @@ SAVED_DIR = BASE_DIR / "saved_debates"
 PERSONA_DIR = BASE_DIR / "personas"
 PERSONA_STORE = PersonaStorage(PERSONA_DIR / "registry.json")
 PUBLIC_BASE_URL = os.getenv("PUBLIC_APP_URL", "http://localhost:8000")
+CHECKPOINT_SETTINGS = CheckpointSettings.from_env()
+CHECKPOINT_STORE = get_checkpoint_store(CHECKPOINT_SETTINGS)
+
+_METRICS = get_registry()
+_METRICS.gauge("debates_active", "Debates currently running in this process.").set_function(
+    lambda: len(get_running_debates())
+)
+SSE_SUBSCRIBERS = _METRICS.gauge("debate_sse_subscribers", "Open debate event streams.")
+_METRICS.gauge(
+    "debate_sse_queue_depth", "Events buffered for SSE subscribers but not yet written."
+).set_function(lambda: sum(channel.queued_events() for channel in get_broadcast_hub().channels()))
 
 PRESET_JUDGE_APPS = {
     "logic_professor": preset_logic_professor.app,
@@ -134,6 +169,11 @@ async def root() -> dict[str, str]:
     return {"status": "ready", "message": "AI Debate Arena is online."}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return metrics_response()
+
+
 @app.get("/api/judges")
 async def list_judge_presets() -> list[dict[str, str]]:
     return JUDGE_PRESETS
@@ -203,43 +243,132 @@ async def persona_runtime(
 @app.post("/api/debate/start", response_model=DebateResponse)
 async def start_debate(request: DebateRequest) -> DebateResponse:
     try:
-        orchestrator = DebateOrchestrator(request)
-        return await orchestrator.run()
+        orchestrator = DebateOrchestrator(request, checkpoint_store=CHECKPOINT_STORE)
+        return await get_running_debates().start(orchestrator.debate_id, orchestrator.run())
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
 @app.post("/api/debate/stream")
-async def stream_debate(request: DebateRequest) -> StreamingResponse:
-    queue: asyncio.Queue[Optional[dict[str, object]]] = asyncio.Queue()
+async def stream_debate(request: DebateRequest, detach: bool = False) -> StreamingResponse:
+    """Start a debate and stream its events (also served to other viewers at ``/api/debate/{id}/events``).
+
+    Once every viewer has been gone for the reconnect grace period the debate is
+    cancelled, unless ``detach`` is set.
+    """
+    return _stream_orchestrator(
+        lambda callback: DebateOrchestrator(
+            request, event_callback=callback, checkpoint_store=CHECKPOINT_STORE
+        ),
+        detach=detach,
+    )
+
+
+@app.get("/api/debate/checkpoints")
+async def list_checkpoints() -> list[dict[str, object]]:
+    if CHECKPOINT_STORE is None:
+        return []
+    states = await asyncio.to_thread(CHECKPOINT_STORE.list_states)
+    running = get_running_debates()
+    for state in states:
+        state["running"] = running.is_running(str(state.get("debate_id")))
+    return states
+
+
+@app.post("/api/debate/{debate_id}/resume", response_model=DebateResponse)
+async def resume_debate(debate_id: str, stream: bool = False, detach: bool = False) -> Response:
+    """Continue a checkpointed debate; journaled calls are replayed, not re-sent."""
+    if CHECKPOINT_STORE is None:
+        raise HTTPException(status_code=404, detail="Checkpointing is disabled.")
+    if get_running_debates().is_running(debate_id):
+        raise HTTPException(status_code=409, detail="Debate is already running.")
+    checkpoint = await asyncio.to_thread(CHECKPOINT_STORE.load, debate_id)
+    if checkpoint is None:
+        raise HTTPException(status_code=404, detail="Checkpoint not found.")
+    request = DebateRequest.model_validate(checkpoint.request)
+
+    def build(callback=None) -> DebateOrchestrator:
+        return DebateOrchestrator(
+            request,
+            event_callback=callback,
+            checkpoint_store=CHECKPOINT_STORE,
+            resume_from=checkpoint,
+        )
+
+    if stream:
+        return _stream_orchestrator(build, detach=detach)
+    try:
+        orchestrator = build()
+        return await get_running_debates().start(debate_id, orchestrator.run())
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@app.get("/api/debate/{debate_id}/events")
+async def debate_events(
+    debate_id: str,
+    last_event_id: Optional[int] = None,
+    last_event_header: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """Watch a live (or recently finished) debate; resumes after ``Last-Event-ID`` when given."""
+    channel = get_broadcast_hub().get(debate_id)
+    if channel is None:
+        raise HTTPException(status_code=404, detail="No live or recent debate with this id.")
+    if last_event_id is None and last_event_header and last_event_header.strip().isdigit():
+        last_event_id = int(last_event_header)
+    return _event_stream(channel, last_event_id)
+
+
+def _stream_orchestrator(build, detach: bool = False) -> StreamingResponse:
+    channel: Optional[DebateChannel] = None
 
     async def event_callback(event_type: str, payload: dict[str, object]) -> None:
-        await queue.put({"type": event_type, "payload": payload})
+        # Encoded once here and shared by every subscriber; publishing never waits on them.
+        channel.publish(event_type, jsonable_encoder(payload))
 
-    orchestrator = DebateOrchestrator(request, event_callback=event_callback)
+    orchestrator = build(event_callback)
+    on_abandoned = None if detach else (lambda: orchestrator.cancel("client_disconnected"))
+    try:
+        channel = get_broadcast_hub().open(orchestrator.debate_id, on_abandoned)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
 
     async def run_debate() -> None:
         try:
             await orchestrator.run()
+        except asyncio.CancelledError:
+            channel.publish("error", {"message": "Debate cancelled."})
+            raise
         except Exception as exc:  # noqa: BLE001
             message = str(exc).strip()
             if not message:
                 message = repr(exc)
-            await queue.put({"type": "error", "payload": {"message": message}})
+            channel.publish("error", {"message": message})
         finally:
-            await queue.put(None)
+            channel.close()
 
-    asyncio.create_task(run_debate())
+    get_running_debates().start(orchestrator.debate_id, run_debate())
+    return _event_stream(channel)
 
+
+def _event_stream(channel: DebateChannel, last_event_id: Optional[int] = None) -> StreamingResponse:
     async def event_generator():
-        while True:
-            item = await queue.get()
-            if item is None:
-                break
-            encoded = jsonable_encoder(item)
-            yield f"data: {json.dumps(encoded, ensure_ascii=False)}\n\n"
-
-    headers = {"Cache-Control": "no-cache", "Connection": "keep-alive"}
+        subscriber = channel.subscribe(last_event_id)
+        SSE_SUBSCRIBERS.labels().inc()
+        try:
+            async for event_id, item in subscriber.events():
+                data = json.dumps(item, ensure_ascii=False)
+                # Notices carry no id, so a reconnect resumes before anything they skipped.
+                yield f"id: {event_id}\ndata: {data}\n\n" if event_id is not None else f"data: {data}\n\n"
+        finally:
+            SSE_SUBSCRIBERS.labels().dec()
+            channel.unsubscribe(subscriber)
+
+    headers = {
+        "Cache-Control": "no-cache",
+        "Connection": "keep-alive",
+        "X-Debate-Id": channel.debate_id,
+    }
     return StreamingResponse(event_generator(), media_type="text/event-stream", headers=headers)
 
 
@@ -269,14 +398,31 @@ def _write_debate(payload: SaveDebateRequest) -> Path:
     return path
 
 
+def _write_trace(debate_path: Path, payload: SaveDebateRequest) -> Optional[Path]:
+    trace = (payload.debate.metadata or {}).get("trace")
+    if not isinstance(trace, dict):
+        return None
+    path = debate_path.with_suffix(".trace.json")
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(chrome_trace(trace, label=payload.debate.topic), handle, ensure_ascii=False)
+    return path
+
+
+def _relative_to_base(path: Path) -> str:
+    try:
+        return str(path.relative_to(BASE_DIR))
+    except ValueError:
+        return str(path)
+
+
 @app.post("/api/debate/save", response_model=SaveDebateResponse)
 async def save_debate(payload: SaveDebateRequest) -> SaveDebateResponse:
     try:
         path = _write_debate(payload)
-        try:
-            relative_path = path.relative_to(BASE_DIR)
-        except ValueError:
-            relative_path = path
-        return SaveDebateResponse(path=str(relative_path))
+        trace_path = _write_trace(path, payload)
+        return SaveDebateResponse(
+            path=_relative_to_base(path),
+            trace_path=_relative_to_base(trace_path) if trace_path is not None else None,
+        )
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=500, detail=str(exc)) from exc
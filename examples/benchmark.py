@@ -0,0 +1,416 @@
+"""End-to-end load benchmark for the debate arena, driven by mock participants.
+
+Starts the mock participant server (one process can stand in for many personas),
+starts ``app.main`` unless ``--arena-url`` is given, fires ``--debates`` debates
+with ``--concurrency`` in flight at ``/api/debate/start`` and/or
+``/api/debate/stream`` and writes a JSON report::
+
+    python examples/benchmark.py --debates 20 --concurrency 5 --endpoint both \\
+        --latency lognormal:0.8,0.4 --429-rate 0.02 --output bench.json --baseline last.json
+
+Per-stage percentiles come from each debate's ``metadata.trace``; orchestrator
+CPU and peak RSS are read from ``/proc`` (or ``psutil`` when installed) for the
+arena process. ``--in-process`` skips HTTP and runs ``DebateOrchestrator``
+directly, which isolates orchestrator overhead from the web stack.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+HEADLINE_METRICS = ("debates_per_minute", "debate_seconds.p95", "arena.cpu_seconds_per_debate", "arena.peak_rss_mb")
+
+
+@dataclass
+class BenchmarkConfig:
+    debates: int = 10
+    concurrency: int = 4
+    endpoint: str = "start"
+    debaters: int = 4
+    judges: int = 5
+    hosts: int = 1
+    mock_processes: int = 1
+    latency: str = "fixed:0.05"
+    response_chars: int = 0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    seed: Optional[int] = 7
+    options: Dict[str, Any] = field(default_factory=dict)
+    arena_url: Optional[str] = None
+    arena_pid: Optional[int] = None
+    in_process: bool = False
+
+
+@dataclass
+class DebateSample:
+    endpoint: str
+    seconds: float
+    ok: bool
+    error: Optional[str] = None
+    first_event_seconds: Optional[float] = None
+    stages: List[Tuple[str, float]] = field(default_factory=list)
+
+
+def percentiles(values: Sequence[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"count": 0, "p50": None, "p95": None, "p99": None}
+    ordered = sorted(values)
+
+    def rank(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))], 4)
+
+    return {"count": len(ordered), "p50": rank(0.50), "p95": rank(0.95), "p99": rank(0.99)}
+
+
+class ProcessProbe:
+    """CPU seconds and peak RSS of a process, from /proc or psutil."""
+
+    def __init__(self, pid: Optional[int]) -> None:
+        self.pid = pid
+
+    def cpu_seconds(self) -> Optional[float]:
+        if self.pid is None:
+            return None
+        try:
+            fields = Path(f"/proc/{self.pid}/stat").read_text().rsplit(")", 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+        except (OSError, IndexError, ValueError):
+            pass
+        try:
+            import psutil
+
+            times = psutil.Process(self.pid).cpu_times()
+            return times.user + times.system
+        except Exception:  # noqa: BLE001
+            return None
+
+    def peak_rss_mb(self) -> Optional[float]:
+        if self.pid is None:
+            return None
+        try:
+            for line in Path(f"/proc/{self.pid}/status").read_text().splitlines():
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+        except OSError:
+            pass
+        try:
+            import psutil
+
+            return round(psutil.Process(self.pid).memory_info().rss / 2**20, 1)
+        except Exception:  # noqa: BLE001
+            return None
+
+
+class InProcessProbe:
+    def cpu_seconds(self) -> float:
+        return time.process_time()
+
+    def peak_rss_mb(self) -> float:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KiB on Linux, bytes on macOS.
+        return round(peak / (2**20 if sys.platform == "darwin" else 1024), 1)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_uvicorn(app_path: str, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app_path, "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env={**os.environ, **env},
+    )
+
+
+def wait_ready(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server for {url} exited with code {process.returncode}.")
+        try:
+            httpx.get(f"{url}/openapi.json", timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become ready within {timeout:.0f}s.")
+
+
+def _participants(config: BenchmarkConfig, mock_urls: Sequence[str]) -> Dict[str, List[Dict[str, str]]]:
+    roles = {"debater": config.debaters, "judge": config.judges, "host": config.hosts}
+    pools: Dict[str, List[Dict[str, str]]] = {}
+    index = 0
+    for role, count in roles.items():
+        pools[role] = []
+        for number in range(1, count + 1):
+            name = f"{role.title()}-{number}"
+            base = mock_urls[index % len(mock_urls)]
+            index += 1
+            pools[role].append({"name": name, "endpoint": f"{base}/{role}/{name}/respond"})
+    return pools
+
+
+def build_request(config: BenchmarkConfig, pools: Dict[str, List[Dict[str, str]]], number: int) -> Dict[str, Any]:
+    debaters, judges, hosts = pools["debater"], pools["judge"], pools["host"]
+    return {
+        "topic": f"Benchmark motion #{number}: cities should ban private cars downtown",
+        "debaters": [debaters[(2 * number) % len(debaters)], debaters[(2 * number + 1) % len(debaters)]],
+        "judges": [judges[(number + offset) % len(judges)] for offset in range(5)],
+        "host": hosts[number % len(hosts)],
+        # Per-stage percentiles are read from metadata.trace.
+        "options": {"trace": True, **config.options},
+    }
+
+
+def _stage_durations(metadata: Optional[Dict[str, Any]]) -> List[Tuple[str, float]]:
+    trace = (metadata or {}).get("trace") or {}
+    return [
+        (str(span["attributes"].get("stage_kind", span["name"])), span["duration_ms"] / 1000)
+        for span in trace.get("spans", [])
+        if span.get("kind") == "stage" and not span["attributes"].get("replayed")
+    ]
+
+
+async def _run_start(client: httpx.AsyncClient, arena: str, payload: Dict[str, Any]) -> DebateSample:
+    started = time.monotonic()
+    response = await client.post(f"{arena}/api/debate/start", json=payload)
+    seconds = time.monotonic() - started
+    if response.status_code != 200:
+        return DebateSample("start", seconds, False, f"{response.status_code}: {response.text[:200]}")
+    return DebateSample("start", seconds, True, stages=_stage_durations(response.json().get("metadata")))
+
+
+async def _run_stream(client: httpx.AsyncClient, arena: str, payload: Dict[str, Any]) -> DebateSample:
+    started = time.monotonic()
+    first_event: Optional[float] = None
+    async with client.stream("POST", f"{arena}/api/debate/stream", json=payload) as response:
+        if response.status_code != 200:
+            body = (await response.aread()).decode("utf-8", errors="replace")
+            return DebateSample("stream", time.monotonic() - started, False, f"{response.status_code}: {body[:200]}")
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            if first_event is None:
+                first_event = time.monotonic() - started
+            event = json.loads(line[5:])
+            if event["type"] == "error":
+                return DebateSample(
+                    "stream", time.monotonic() - started, False, event["payload"].get("message"), first_event
+                )
+            if event["type"] == "complete":
+                stages = _stage_durations(event["payload"].get("metadata"))
+                return DebateSample("stream", time.monotonic() - started, True, None, first_event, stages)
+    return DebateSample("stream", time.monotonic() - started, False, "stream ended without complete", first_event)
+
+
+async def _run_in_process(payload: Dict[str, Any]) -> DebateSample:
+    sys.path.insert(0, str(ROOT))
+    from app.debate.models import DebateRequest
+    from app.debate.orchestrator import DebateOrchestrator
+
+    started = time.monotonic()
+    try:
+        response = await DebateOrchestrator(DebateRequest.model_validate(payload)).run()
+    except Exception as exc:  # noqa: BLE001
+        return DebateSample("in_process", time.monotonic() - started, False, str(exc) or repr(exc))
+    return DebateSample("in_process", time.monotonic() - started, True, stages=_stage_durations(response.metadata))
+
+
+async def drive(config: BenchmarkConfig, arena: Optional[str], pools: Dict[str, List[Dict[str, str]]]) -> List[DebateSample]:
+    endpoints = ["start", "stream"] if config.endpoint == "both" else [config.endpoint]
+    semaphore = asyncio.Semaphore(config.concurrency)
+    timeout = httpx.Timeout(None, connect=10.0)
+    limits = httpx.Limits(max_connections=config.concurrency * 2)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+
+        async def one(number: int) -> DebateSample:
+            payload = build_request(config, pools, number)
+            async with semaphore:
+                if config.in_process:
+                    return await _run_in_process(payload)
+                if endpoints[number % len(endpoints)] == "stream":
+                    return await _run_stream(client, arena or "", payload)
+                return await _run_start(client, arena or "", payload)
+
+        return await asyncio.gather(*(one(number) for number in range(config.debates)))
+
+
+def summarise(
+    config: BenchmarkConfig,
+    samples: List[DebateSample],
+    wall: float,
+    cpu_seconds: Optional[float],
+    peak_rss_mb: Optional[float],
+) -> Dict[str, Any]:
+    completed = [sample for sample in samples if sample.ok]
+    stage_seconds: Dict[str, List[float]] = {}
+    for sample in completed:
+        for kind, seconds in sample.stages:
+            stage_seconds.setdefault(kind, []).append(seconds)
+    by_endpoint: Dict[str, List[float]] = {}
+    for sample in completed:
+        by_endpoint.setdefault(sample.endpoint, []).append(sample.seconds)
+    first_events = [sample.first_event_seconds for sample in completed if sample.first_event_seconds is not None]
+    return {
+        "config": asdict(config),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - wall)),
+        "wall_seconds": round(wall, 3),
+        "debates": {"completed": len(completed), "failed": len(samples) - len(completed)},
+        "debates_per_minute": round(len(completed) / wall * 60, 2) if wall else None,
+        "debate_seconds": percentiles([sample.seconds for sample in completed]),
+        "endpoints": {name: percentiles(values) for name, values in sorted(by_endpoint.items())},
+        "stream_first_event_seconds": percentiles(first_events) if first_events else None,
+        "stages": {kind: percentiles(values) for kind, values in sorted(stage_seconds.items())},
+        "arena": {
+            "cpu_seconds_per_debate": round(cpu_seconds / len(completed), 4) if cpu_seconds is not None and completed else None,
+            "peak_rss_mb": peak_rss_mb,
+        },
+        "errors": [sample.error for sample in samples if not sample.ok][:10],
+    }
+
+
+def _lookup(report: Dict[str, Any], dotted: str) -> Optional[float]:
+    value: Any = report
+    for part in dotted.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value if isinstance(value, (int, float)) else None
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], metrics: Sequence[str] = HEADLINE_METRICS
+) -> List[str]:
+    lines = []
+    for metric in metrics:
+        current, previous = _lookup(report, metric), _lookup(baseline, metric)
+        if current is None or previous is None:
+            continue
+        change = (current - previous) / previous * 100 if previous else 0.0
+        lines.append(f"{metric:32s} {previous:>10} -> {current:>10} ({change:+.1f}%)")
+    return lines
+
+
+def _mock_env(config: BenchmarkConfig, index: int) -> Dict[str, str]:
+    env = {
+        "MOCK_LATENCY": config.latency,
+        "MOCK_RESPONSE_CHARS": str(config.response_chars),
+        "MOCK_ERROR_RATE": str(config.error_rate),
+        "MOCK_429_RATE": str(config.throttle_rate),
+    }
+    if config.seed is not None:
+        env["MOCK_SEED"] = str(config.seed + index)
+    return env
+
+
+def run(config: BenchmarkConfig) -> Dict[str, Any]:
+    processes: List[subprocess.Popen] = []
+    try:
+        mock_urls = []
+        for index in range(config.mock_processes):
+            port = free_port()
+            process = start_uvicorn("examples.mock_participant:app", port, _mock_env(config, index))
+            processes.append(process)
+            mock_urls.append(f"http://127.0.0.1:{port}")
+        for url, process in zip(mock_urls, processes):
+            wait_ready(url, process)
+
+        arena = config.arena_url
+        probe: Any = InProcessProbe() if config.in_process else ProcessProbe(config.arena_pid)
+        if arena is None and not config.in_process:
+            port = free_port()
+            arena_process = start_uvicorn("app.main:app", port, {"DEBATE_CHECKPOINTS": "false"})
+            processes.append(arena_process)
+            arena = f"http://127.0.0.1:{port}"
+            wait_ready(arena, arena_process)
+            probe = ProcessProbe(arena_process.pid)
+
+        pools = _participants(config, mock_urls)
+        cpu_before = probe.cpu_seconds()
+        started = time.monotonic()
+        samples = asyncio.run(drive(config, arena, pools))
+        wall = time.monotonic() - started
+        cpu_after = probe.cpu_seconds()
+        cpu = cpu_after - cpu_before if cpu_before is not None and cpu_after is not None else None
+        return summarise(config, samples, wall, cpu, probe.peak_rss_mb())
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> Tuple[BenchmarkConfig, argparse.Namespace]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--debates", type=int, default=10, help="Total debates to run (M).")
+    parser.add_argument("--concurrency", type=int, default=4, help="Debates in flight at once.")
+    parser.add_argument("--endpoint", choices=["start", "stream", "both"], default="start")
+    parser.add_argument("--debaters", type=int, default=4, help="Distinct mock debater endpoints (N).")
+    parser.add_argument("--judges", type=int, default=5, help="Distinct mock judge endpoints (>= 5).")
+    parser.add_argument("--hosts", type=int, default=1, help="Distinct mock host endpoints.")
+    parser.add_argument("--mock-processes", type=int, default=1, help="Mock server processes to spread endpoints over.")
+    parser.add_argument("--latency", default="fixed:0.05", help="fixed:S, lognormal:MEDIAN,SIGMA or replay:PATH.")
+    parser.add_argument("--response-chars", type=int, default=0, help="Pad mock replies to this many characters.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of mock calls answering 500.")
+    parser.add_argument("--429-rate", dest="throttle_rate", type=float, default=0.0, help="Fraction answering 429.")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for mock latency and error sampling.")
+    parser.add_argument("--options", default="{}", help="JSON DebateOptions overrides for every debate.")
+    parser.add_argument("--arena-url", help="Benchmark an already running arena instead of starting one.")
+    parser.add_argument("--arena-pid", type=int, help="PID of --arena-url's process, for CPU/RSS readings.")
+    parser.add_argument("--in-process", action="store_true", help="Run orchestrators in this process, no HTTP.")
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write the JSON report.")
+    parser.add_argument("--baseline", help="Earlier report to compare headline numbers against.")
+    args = parser.parse_args(argv)
+    if args.judges < 5:
+        parser.error("--judges must be at least 5 (every debate seats five judges).")
+    config = BenchmarkConfig(
+        debates=args.debates,
+        concurrency=args.concurrency,
+        endpoint=args.endpoint,
+        debaters=args.debaters,
+        judges=args.judges,
+        hosts=args.hosts,
+        mock_processes=max(1, args.mock_processes),
+        latency=args.latency,
+        response_chars=args.response_chars,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=args.seed,
+        options=json.loads(args.options),
+        arena_url=args.arena_url,
+        arena_pid=args.arena_pid,
+        in_process=args.in_process,
+    )
+    return config, args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    config, args = parse_args(argv)
+    report = run(config)
+    Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(json.dumps({key: report[key] for key in ("debates", "debates_per_minute", "debate_seconds", "arena")}, indent=2))
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        print("\n".join(compare(report, baseline)))
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
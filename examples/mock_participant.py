@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import itertools
+import json
+import math
 import os
 import random
 import textwrap
-from typing import Any, Dict, Optional
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 PERSONA = os.getenv("MOCK_PERSONA", "generalist thinker")
@@ -23,6 +30,67 @@ TONE_CHOICES = {
     ],
 }
 
+
+def _recorded_latencies(path: Path) -> List[float]:
+    """Attempt durations (seconds) from a saved debate, ``metadata.trace``, a Chrome trace or a JSON list."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, list):
+        return [float(value) for value in data]
+    if "traceEvents" in data:
+        return [
+            event["dur"] / 1_000_000
+            for event in data["traceEvents"]
+            if event.get("ph") == "X" and event.get("cat") == "attempt"
+        ]
+    trace = (data.get("metadata") or {}).get("trace", data)
+    return [span["duration_ms"] / 1000 for span in trace.get("spans", []) if span.get("kind") == "attempt"]
+
+
+def parse_latency(spec: str, rng: random.Random) -> Callable[[], float]:
+    """``fixed:SECONDS``, ``lognormal:MEDIAN,SIGMA`` or ``replay:PATH`` (cycled in order)."""
+    kind, _, argument = spec.partition(":")
+    if kind == "fixed":
+        seconds = float(argument or 0)
+        return lambda: seconds
+    if kind == "lognormal":
+        median, _, sigma = argument.partition(",")
+        mu = math.log(float(median))
+        return lambda: rng.lognormvariate(mu, float(sigma or 0.5))
+    if kind == "replay":
+        samples = _recorded_latencies(Path(argument))
+        if not samples:
+            raise ValueError(f"No attempt latencies found in {argument}.")
+        cycle: Iterator[float] = itertools.cycle(samples)
+        return lambda: next(cycle)
+    raise ValueError(f"Unknown MOCK_LATENCY '{spec}'; use fixed:, lognormal: or replay:.")
+
+
+@dataclass
+class MockSettings:
+    latency: str = "fixed:0"
+    response_chars: int = 0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after_seconds: float = 1.0
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> "MockSettings":
+        seed = os.getenv("MOCK_SEED")
+        return cls(
+            latency=os.getenv("MOCK_LATENCY", "fixed:0"),
+            response_chars=int(os.getenv("MOCK_RESPONSE_CHARS", "0")),
+            error_rate=float(os.getenv("MOCK_ERROR_RATE", "0")),
+            throttle_rate=float(os.getenv("MOCK_429_RATE", "0")),
+            retry_after_seconds=float(os.getenv("MOCK_RETRY_AFTER_SECONDS", "1")),
+            seed=int(seed) if seed else None,
+        )
+
+
+SETTINGS = MockSettings.from_env()
+RNG = random.Random(SETTINGS.seed)
+SAMPLE_LATENCY = parse_latency(SETTINGS.latency, RNG)
+
 app = FastAPI(
     title=f"Mock Participant ({PERSONA})",
     description="Lightweight mock endpoint for local testing.",
@@ -47,13 +115,33 @@ def _summarise_prompt(prompt: str, limit: int = 140) -> str:
     return compact[:limit]
 
 
-def _build_debater_line(req: LLMRequest) -> str:
+def _pad(content: str, size: int) -> str:
+    if size <= len(content):
+        return content
+    filler = " Furthermore, the evidence keeps pointing the same way."
+    return (content + filler * (1 + (size - len(content)) // len(filler)))[:size]
+
+
+def _injected_failure() -> Optional[JSONResponse]:
+    roll = RNG.random()
+    if roll < SETTINGS.throttle_rate:
+        return JSONResponse(
+            {"detail": "mock rate limit"},
+            status_code=429,
+            headers={"Retry-After": f"{SETTINGS.retry_after_seconds:g}"},
+        )
+    if roll < SETTINGS.throttle_rate + SETTINGS.error_rate:
+        return JSONResponse({"detail": "mock upstream failure"}, status_code=500)
+    return None
+
+
+def _build_debater_line(req: LLMRequest, persona: str = PERSONA) -> str:
     stage = req.context.get("stage", "unspecified stage")
     topic = req.context.get("topic", "the motion at hand")
     tone = random.choice(TONE_CHOICES.get("debater", ["thoughtful"]))
     return textwrap.dedent(
         f"""
-        ({PERSONA}, {tone}) Stage {stage}: Regarding {topic}, my stance is crystal clear—
+        ({persona}, {tone}) Stage {stage}: Regarding {topic}, my stance is crystal clear—
         I'm combining logic, a dash of rhetoric, and references from the prompt: {_summarise_prompt(req.prompt)}.
         """
     ).strip()
@@ -73,17 +161,32 @@ def _build_judge_line(req: LLMRequest) -> str:
 
 
 @app.post("/respond", response_model=LLMResponse)
-async def respond(req: LLMRequest) -> LLMResponse:
-    if ROLE.lower() == "judge":
+async def respond(req: LLMRequest):
+    return await _respond(req, ROLE, PERSONA)
+
+
+@app.post("/{role}/{persona}/respond", response_model=LLMResponse)
+async def respond_as(role: str, persona: str, req: LLMRequest):
+    """Let one process stand in for many participants, each with its own endpoint URL."""
+    return await _respond(req, role, persona)
+
+
+async def _respond(req: LLMRequest, role: str, persona: str):
+    await asyncio.sleep(max(0.0, SAMPLE_LATENCY()))
+    failure = _injected_failure()
+    if failure is not None:
+        return failure
+
+    if role.lower() == "judge":
         content = _build_judge_line(req)
     else:
-        content = _build_debater_line(req)
+        content = _build_debater_line(req, persona)
 
     return LLMResponse(
-        content=content,
+        content=_pad(content, SETTINGS.response_chars),
         metadata={
-            "persona": PERSONA,
-            "role": ROLE,
+            "persona": persona,
+            "role": role,
             "prompt_excerpt": _summarise_prompt(req.prompt, limit=80),
         },
     )
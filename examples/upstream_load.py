@@ -0,0 +1,337 @@
+"""Throughput harness for the host_service apps against the fake upstream.
+
+Starts ``host_service.fake_upstream`` and the service under test (debater, host or
+a judge persona) pointed at it, fires ``--requests`` calls with ``--concurrency``
+in flight and writes a JSON report::
+
+    python examples/upstream_load.py --service debater --stream --requests 300 --concurrency 30 \\
+        --ttft 0.4 --tps 50 --429-rate 0.02 --output upstream.json --baseline last.json
+
+Requests replay ``--debates`` growing transcripts, so consecutive calls share a
+prompt prefix and the fake's simulated prefix cache reports realistic hit rates.
+``--in-process`` runs both apps inside this process over ASGI transports (no
+sockets; streamed replies then arrive whole, so TTFT is not meaningful).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from examples.benchmark import (  # noqa: E402
+    InProcessProbe,
+    ProcessProbe,
+    compare,
+    free_port,
+    percentiles,
+    start_uvicorn,
+    wait_ready,
+)
+
+SERVICES = {
+    "debater": ("host_service.debater_api:app", "/debater/respond"),
+    "host": ("host_service.host_api:app", "/host/respond"),
+    "judge": ("host_service.judges.arbiter:app", "/respond"),
+}
+IN_PROCESS_UPSTREAM = "http://fake-upstream.local/v1/chat/completions"
+HEADLINE_METRICS = ("requests_per_second", "latency_seconds.p95", "first_token_seconds.p95", "service.cpu_ms_per_request")
+STAGES = ("opening", "cross_examination", "free_debate", "closing")
+
+
+@dataclass
+class LoadConfig:
+    service: str = "debater"
+    judge_persona: str = "arbiter"
+    requests: int = 100
+    concurrency: int = 10
+    stream: bool = False
+    debates: int = 4
+    ttft: float = 0.3
+    tps: float = 60.0
+    completion_tokens: int = 120
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    disconnect_rate: float = 0.0
+    seed: Optional[int] = 7
+    in_process: bool = False
+
+
+@dataclass
+class CallSample:
+    seconds: float
+    status: int
+    ok: bool
+    first_token_seconds: Optional[float] = None
+    error: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def build_payload(config: LoadConfig, number: int) -> Dict[str, Any]:
+    debate = number % config.debates
+    turn = number // config.debates
+    topic = f"Debate {debate}: cities should ban private cars downtown"
+    transcript = "\n".join(
+        f"[{STAGES[index % len(STAGES)]}] {'Affirmative' if index % 2 == 0 else 'Negative'}: "
+        f"point {index} of debate {debate} weighs congestion, air quality, access for workers and local trade."
+        for index in range(turn)
+    )
+    stage = "judging" if config.service == "judge" else STAGES[turn % len(STAGES)]
+    payload: Dict[str, Any] = {
+        "prompt": f"Transcript so far:\n{transcript}\n\nRespond for turn {turn}.",
+        "context": {"topic": topic, "stage": stage, "turn": turn},
+        "client": {"harness": "upstream_load"},
+    }
+    if config.service == "debater":
+        payload["context"].update({"side": "affirmative" if turn % 2 == 0 else "negative", "role": "debater"})
+    if config.service != "judge":
+        payload["stream"] = config.stream
+    return payload
+
+
+async def _call(client: httpx.AsyncClient, path: str, payload: Dict[str, Any]) -> CallSample:
+    started = time.monotonic()
+    if not payload.get("stream"):
+        response = await client.post(path, json=payload)
+        seconds = time.monotonic() - started
+        if response.status_code != 200:
+            return CallSample(seconds, response.status_code, False, error=response.text[:200])
+        return CallSample(seconds, 200, True, metadata=response.json().get("metadata") or {})
+
+    first_token: Optional[float] = None
+    async with client.stream("POST", path, json=payload) as response:
+        if response.status_code != 200:
+            body = (await response.aread()).decode("utf-8", errors="replace")
+            return CallSample(time.monotonic() - started, response.status_code, False, error=body[:200])
+        async for line in response.aiter_lines():
+            if not line.startswith("data:") or line[5:].strip() == "[DONE]":
+                continue
+            frame = json.loads(line[5:])
+            if "delta" in frame and first_token is None:
+                first_token = time.monotonic() - started
+            if "error" in frame:
+                return CallSample(time.monotonic() - started, 200, False, first_token, frame["error"])
+            if "content" in frame:
+                return CallSample(time.monotonic() - started, 200, True, first_token, metadata=frame.get("metadata") or {})
+    return CallSample(time.monotonic() - started, 200, False, first_token, "stream ended without content")
+
+
+async def drive(config: LoadConfig, client: httpx.AsyncClient, path: str) -> List[CallSample]:
+    semaphore = asyncio.Semaphore(config.concurrency)
+
+    async def one(number: int) -> CallSample:
+        async with semaphore:
+            try:
+                return await _call(client, path, build_payload(config, number))
+            except httpx.HTTPError as exc:
+                return CallSample(0.0, 0, False, error=str(exc) or repr(exc))
+
+    return await asyncio.gather(*(one(number) for number in range(config.requests)))
+
+
+def _fake_env(config: LoadConfig) -> Dict[str, str]:
+    env = {
+        "FAKE_UPSTREAM_TTFT_SECONDS": str(config.ttft),
+        "FAKE_UPSTREAM_TOKENS_PER_SECOND": str(config.tps),
+        "FAKE_UPSTREAM_COMPLETION_TOKENS": str(config.completion_tokens),
+        "FAKE_UPSTREAM_ERROR_RATE": str(config.error_rate),
+        "FAKE_UPSTREAM_429_RATE": str(config.throttle_rate),
+        "FAKE_UPSTREAM_DISCONNECT_RATE": str(config.disconnect_rate),
+        "FAKE_UPSTREAM_RETRY_AFTER_SECONDS": "0.5",
+    }
+    if config.seed is not None:
+        env["FAKE_UPSTREAM_SEED"] = str(config.seed)
+    return env
+
+
+def _service_target(config: LoadConfig) -> Tuple[str, str]:
+    app_path, path = SERVICES[config.service]
+    if config.service == "judge":
+        app_path = f"host_service.judges.{config.judge_persona}:app"
+    return app_path, path
+
+
+async def _run_in_process(config: LoadConfig) -> Tuple[List[CallSample], float, Dict[str, Any]]:
+    # The services read these at import time.
+    os.environ.update(_fake_env(config))
+    os.environ["DEEPSEEK_API_URL"] = IN_PROCESS_UPSTREAM
+    os.environ.setdefault("DEEPSEEK_API_KEY", "fake")
+    from host_service.fake_upstream import build_app, mount_in_process
+    from host_service.upstream import close_gateway
+
+    app_path, path = _service_target(config)
+    module_name, _, attribute = app_path.partition(":")
+    service_app = getattr(import_module(module_name), attribute)
+    fake_app = build_app()
+    mount_in_process(fake_app, IN_PROCESS_UPSTREAM)
+    transport = httpx.ASGITransport(app=service_app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://service.local", timeout=None) as client:
+            started = time.monotonic()
+            samples = await drive(config, client, path)
+            wall = time.monotonic() - started
+    finally:
+        await close_gateway()
+    return samples, wall, fake_app.state.upstream.stats.as_dict()
+
+
+def run(config: LoadConfig) -> Dict[str, Any]:
+    if config.in_process:
+        probe = InProcessProbe()
+        cpu_before = probe.cpu_seconds()
+        samples, wall, upstream_stats = asyncio.run(_run_in_process(config))
+        cpu = probe.cpu_seconds() - cpu_before
+        return summarise(config, samples, wall, cpu, probe.peak_rss_mb(), upstream_stats)
+
+    processes: List[subprocess.Popen] = []
+    try:
+        fake_port = free_port()
+        fake = start_uvicorn("host_service.fake_upstream:app", fake_port, _fake_env(config))
+        processes.append(fake)
+        fake_url = f"http://127.0.0.1:{fake_port}"
+        wait_ready(fake_url, fake)
+
+        app_path, path = _service_target(config)
+        service_port = free_port()
+        service = start_uvicorn(
+            app_path,
+            service_port,
+            {
+                "DEEPSEEK_API_URL": f"{fake_url}/v1/chat/completions",
+                "DEEPSEEK_API_KEY": os.getenv("DEEPSEEK_API_KEY", "fake"),
+            },
+        )
+        processes.append(service)
+        service_url = f"http://127.0.0.1:{service_port}"
+        wait_ready(service_url, service)
+
+        probe = ProcessProbe(service.pid)
+        cpu_before = probe.cpu_seconds()
+        limits = httpx.Limits(max_connections=config.concurrency * 2)
+
+        async def go() -> Tuple[List[CallSample], float]:
+            async with httpx.AsyncClient(base_url=service_url, timeout=None, limits=limits) as client:
+                started = time.monotonic()
+                samples = await drive(config, client, path)
+                return samples, time.monotonic() - started
+
+        samples, wall = asyncio.run(go())
+        cpu_after = probe.cpu_seconds()
+        cpu = cpu_after - cpu_before if cpu_before is not None and cpu_after is not None else None
+        upstream_stats = httpx.get(f"{fake_url}/stats", timeout=5.0).json()
+        return summarise(config, samples, wall, cpu, probe.peak_rss_mb(), upstream_stats)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def summarise(
+    config: LoadConfig,
+    samples: List[CallSample],
+    wall: float,
+    cpu_seconds: Optional[float],
+    peak_rss_mb: Optional[float],
+    upstream_stats: Dict[str, Any],
+) -> Dict[str, Any]:
+    completed = [sample for sample in samples if sample.ok]
+    statuses: Dict[str, int] = {}
+    for sample in samples:
+        statuses[str(sample.status)] = statuses.get(str(sample.status), 0) + 1
+    first_tokens = [sample.first_token_seconds for sample in completed if sample.first_token_seconds is not None]
+    upstream_latency = [
+        sample.metadata["upstream_latency_ms"] / 1000
+        for sample in completed
+        if isinstance(sample.metadata.get("upstream_latency_ms"), (int, float))
+    ]
+    attempts = [sample.metadata.get("upstream_attempts") or 1 for sample in completed]
+    return {
+        "config": asdict(config),
+        "wall_seconds": round(wall, 3),
+        "requests": {"completed": len(completed), "failed": len(samples) - len(completed), "statuses": statuses},
+        "requests_per_second": round(len(completed) / wall, 2) if wall else None,
+        "latency_seconds": percentiles([sample.seconds for sample in completed]),
+        "first_token_seconds": percentiles(first_tokens) if first_tokens else None,
+        "upstream_latency_seconds": percentiles(upstream_latency),
+        "upstream_attempts_per_request": round(sum(attempts) / len(attempts), 3) if attempts else None,
+        "service": {
+            "cpu_ms_per_request": round(cpu_seconds / len(completed) * 1000, 3)
+            if cpu_seconds is not None and completed
+            else None,
+            "peak_rss_mb": peak_rss_mb,
+        },
+        "upstream": upstream_stats,
+        "errors": [sample.error for sample in samples if not sample.ok][:10],
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> Tuple[LoadConfig, argparse.Namespace]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--service", choices=sorted(SERVICES), default="debater")
+    parser.add_argument("--judge-persona", default="arbiter", help="Module under host_service/judges for --service judge.")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--stream", action="store_true", help="Request relayed SSE replies (debater/host only).")
+    parser.add_argument("--debates", type=int, default=4, help="Distinct growing transcripts to cycle through.")
+    parser.add_argument("--ttft", type=float, default=0.3, help="Fake upstream median time to first token (s).")
+    parser.add_argument("--tps", type=float, default=60.0, help="Fake upstream tokens per second.")
+    parser.add_argument("--completion-tokens", type=int, default=120)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of upstream calls answering 500.")
+    parser.add_argument("--429-rate", dest="throttle_rate", type=float, default=0.0)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0, help="Fraction dropped mid-stream.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--in-process", action="store_true", help="No subprocesses or sockets.")
+    parser.add_argument("--output", default="upstream-load-results.json")
+    parser.add_argument("--baseline", help="Earlier report to compare headline numbers against.")
+    args = parser.parse_args(argv)
+    config = LoadConfig(
+        service=args.service,
+        judge_persona=args.judge_persona,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        stream=args.stream and args.service != "judge",
+        debates=max(1, args.debates),
+        ttft=args.ttft,
+        tps=args.tps,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        disconnect_rate=args.disconnect_rate,
+        seed=args.seed,
+        in_process=args.in_process,
+    )
+    return config, args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    config, args = parse_args(argv)
+    report = run(config)
+    Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    headline = ("requests", "requests_per_second", "latency_seconds", "first_token_seconds", "service")
+    print(json.dumps({key: report[key] for key in headline}, indent=2))
+    print(f"upstream prompt cache hit rate: {report['upstream'].get('prompt_cache_hit_rate')}")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        print("\n".join(compare(report, baseline, HEADLINE_METRICS)))
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
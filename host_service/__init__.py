@@ -1,3 +1,3 @@
 """Service package containing FastAPI apps for debate participants."""
 
-__all__ = ["debater_api", "host_api", "judge_common", "judges"]
+__all__ = ["debater_api", "host_api", "judge_common", "judges", "singleflight", "upstream"]
@@ -2,16 +2,39 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import httpx
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from .metrics import metrics_response
+from .upstream import (
+    ChatResult,
+    ChatStream,
+    close_gateway,
+    get_gateway,
+    prompt_cache_usage,
+    relay_chat_stream,
+    require_api_key,
+)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    try:
+        yield
+    finally:
+        await close_gateway()
+
+
 app = FastAPI(
     title="Debater LLM",
     description="Logic-focused debater persona powered by DeepSeek Chat.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 logger = logging.getLogger(__name__)
@@ -28,6 +51,7 @@ class DebaterRequest(BaseModel):
     context: Dict[str, Any] = Field(default_factory=dict)
     client: Dict[str, Any]
     tags: Optional[Dict[str, Any]] = None
+    stream: bool = Field(False, description="Relay upstream deltas as text/event-stream.")
 
 
 class DebaterResponse(BaseModel):
@@ -35,65 +59,75 @@ class DebaterResponse(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
-def _format_context(context: Dict[str, Any]) -> str:
-    if not context:
-        return ""
+STABLE_CONTEXT_KEYS = ["topic", "side", "role", "opponent"]
+CALL_CONTEXT_KEYS = ["stage", "round", "turn"]
 
-    ordered_keys = ["stage", "topic", "role", "side", "round", "turn", "opponent"]
-    lines: List[str] = []
 
-    for key in ordered_keys:
-        if key in context and context[key] is not None:
-            lines.append(f"{key}: {context[key]}")
+def _format_context(context: Dict[str, Any], keys: List[str]) -> str:
+    return "\n".join(f"{key}: {context[key]}" for key in keys if context.get(key) is not None)
 
-    extra = {k: v for k, v in context.items() if k not in ordered_keys}
-    for key, value in extra.items():
-        if value is not None:
-            lines.append(f"{key}: {value}")
 
-    return "\n".join(lines)
+def _split_context(context: Dict[str, Any]) -> Tuple[str, str]:
+    """Stable debate facts, and per-call keys (plus any extras) that go after the prompt."""
+    extra = [key for key in context if key not in STABLE_CONTEXT_KEYS and key not in CALL_CONTEXT_KEYS]
+    return (
+        _format_context(context, STABLE_CONTEXT_KEYS),
+        _format_context(context, CALL_CONTEXT_KEYS + extra),
+    )
 
 
-async def _call_deepseek(messages: List[Dict[str, str]]) -> Dict[str, Any]:
-    api_key = os.getenv("DEEPSEEK_API_KEY")
-    if not api_key:
-        logger.error("Missing DEEPSEEK_API_KEY environment variable.")
-        raise HTTPException(status_code=500, detail="Deepseek API key is not configured.")
-
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
-    payload = {
+def _deepseek_payload(messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    return {
         "model": DEEPSEEK_MODEL,
         "messages": messages,
         "temperature": DEFAULT_TEMPERATURE,
     }
 
+
+async def _call_deepseek(messages: List[Dict[str, str]]) -> ChatResult:
+    api_key = require_api_key(provider="Deepseek")
     timeout = httpx.Timeout(20.0, connect=10.0)
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        try:
-            response = await client.post(DEEPSEEK_API_URL, headers=headers, json=payload)
-        except httpx.HTTPError as exc:
-            logger.exception("Deepseek API request failed.")
-            raise HTTPException(status_code=502, detail=f"Deepseek API request failed: {exc}") from exc
+    return await get_gateway().chat_completion(
+        DEEPSEEK_API_URL, api_key, _deepseek_payload(messages), timeout=timeout, provider="Deepseek"
+    )
 
-    if response.status_code >= 400:
-        detail = response.text
-        logger.error("Deepseek API returned error %s: %s", response.status_code, detail)
-        raise HTTPException(status_code=response.status_code, detail="Deepseek API error: " + detail)
 
-    return response.json()
+async def _stream_deepseek(messages: List[Dict[str, str]]) -> ChatStream:
+    api_key = require_api_key(provider="Deepseek")
+    timeout = httpx.Timeout(20.0, connect=10.0, read=60.0)
+    return await get_gateway().open_chat_stream(
+        DEEPSEEK_API_URL, api_key, _deepseek_payload(messages), timeout=timeout, provider="Deepseek"
+    )
 
 
-@app.post("/debater/respond", response_model=DebaterResponse)
-async def debater_reply(request: DebaterRequest) -> DebaterResponse:
-    context_block = _format_context(request.context)
+def _build_metadata(
+    request: DebaterRequest,
+    completion: Dict[str, Any],
+    upstream: Dict[str, Any],
+) -> Dict[str, Any]:
+    metadata = {
+        "model": DEEPSEEK_MODEL,
+        "usage": completion.get("usage"),
+        "prompt_id": completion.get("id"),
+        **prompt_cache_usage(completion.get("usage")),
+        "stage": request.context.get("stage"),
+        "role": request.context.get("role"),
+    }
+    metadata.update(upstream)
+    return metadata
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return metrics_response()
+
 
-    sections: List[str] = []
-    if context_block:
-        sections.append(context_block)
-    sections.append(request.prompt)
+@app.post("/debater/respond", response_model=DebaterResponse)
+async def debater_reply(request: DebaterRequest) -> Union[DebaterResponse, StreamingResponse]:
+    # Stable facts and the transcript prompt lead; stage/round/turn go last so the
+    # prefix stays cacheable from one call to the next.
+    stable_block, call_block = _split_context(request.context)
+    sections = [stable_block, request.prompt, call_block]
 
     user_message = "\n\n".join(section for section in sections if section)
 
@@ -102,7 +136,28 @@ async def debater_reply(request: DebaterRequest) -> DebaterResponse:
         {"role": "user", "content": user_message or "依据赛制进行辩论发言。"},
     ]
 
-    api_result = await _call_deepseek(messages)
+    if request.stream:
+        stream = await _stream_deepseek(messages)
+        return StreamingResponse(
+            relay_chat_stream(
+                stream,
+                lambda opened, summary: _build_metadata(
+                    request,
+                    summary,
+                    {
+                        "upstream_latency_ms": opened.latency_ms,
+                        "upstream_first_token_ms": opened.first_token_ms,
+                        "upstream_attempts": opened.attempts,
+                        "streamed": True,
+                    },
+                ),
+            ),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    result = await _call_deepseek(messages)
+    api_result = result.data
 
     try:
         choice = api_result["choices"][0]
@@ -111,11 +166,9 @@ async def debater_reply(request: DebaterRequest) -> DebaterResponse:
         logger.exception("Unexpected Deepseek API payload: %s", api_result)
         raise HTTPException(status_code=502, detail="Deepseek API returned an unexpected payload.") from exc
 
-    metadata = {
-        "model": DEEPSEEK_MODEL,
-        "usage": api_result.get("usage"),
-        "prompt_id": api_result.get("id"),
-        "stage": request.context.get("stage"),
-        "role": request.context.get("role"),
-    }
+    metadata = _build_metadata(
+        request,
+        api_result,
+        {"upstream_latency_ms": result.latency_ms, "upstream_attempts": result.attempts},
+    )
     return DebaterResponse(content=content, metadata=metadata)
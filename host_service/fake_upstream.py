@@ -0,0 +1,358 @@
+"""Offline stand-in for an OpenAI/DeepSeek ``chat/completions`` endpoint.
+
+Point the host_service apps at it to load-test them without credentials::
+
+    uvicorn host_service.fake_upstream:app --port 9100
+    DEEPSEEK_API_URL=http://127.0.0.1:9100/v1/chat/completions DEEPSEEK_API_KEY=fake \\
+        uvicorn host_service.debater_api:app --port 9001
+
+Replies honour ``stream`` (SSE chunks, a trailing usage chunk when
+``stream_options.include_usage`` is set, then ``[DONE]``) and
+``response_format: json_object`` (a JudgeOutput v1 ballot scored with the weights
+listed in the judge's system prompt). Usage blocks carry DeepSeek's
+``prompt_cache_hit_tokens`` / ``prompt_cache_miss_tokens`` from a simulated prefix
+cache, so prompt-ordering work shows up in the numbers. Time to first token,
+tokens per second and injected 500/429/disconnect faults are set by
+``FakeUpstreamSettings`` (``FAKE_UPSTREAM_*`` environment variables).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# The arena's offline estimator, so reported usage can be checked against its budgets.
+from app.debate.prompt_budget import estimate_tokens
+
+from .upstream import ChatGateway, base_url, get_gateway
+
+SCORE_DIMENSIONS = ("logic", "responsiveness", "clarity", "evidence", "rule_adherence", "style", "strategy")
+CACHE_BLOCK_CHARS = 256
+CACHE_MAX_BLOCKS = 20_000
+_WEIGHT_LINE = re.compile(r"^- (\w+) (\d+(?:\.\d+)?)\s*$", re.MULTILINE)
+_FILLER = (
+    "the evidence shows that this policy changes incentives for every household while the opposing case "
+    "ignores long term costs because a fair comparison must weigh both benefits and risks so we conclude"
+).split()
+
+
+@dataclass
+class FakeUpstreamSettings:
+    ttft_seconds: float = 0.3
+    ttft_jitter: float = 0.2
+    tokens_per_second: float = 60.0
+    completion_tokens: int = 120
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: float = 1.0
+    disconnect_rate: float = 0.0
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> "FakeUpstreamSettings":
+        seed = os.getenv("FAKE_UPSTREAM_SEED")
+        return cls(
+            ttft_seconds=float(os.getenv("FAKE_UPSTREAM_TTFT_SECONDS", "0.3")),
+            ttft_jitter=float(os.getenv("FAKE_UPSTREAM_TTFT_JITTER", "0.2")),
+            tokens_per_second=float(os.getenv("FAKE_UPSTREAM_TOKENS_PER_SECOND", "60")),
+            completion_tokens=int(os.getenv("FAKE_UPSTREAM_COMPLETION_TOKENS", "120")),
+            error_rate=float(os.getenv("FAKE_UPSTREAM_ERROR_RATE", "0")),
+            rate_limit_rate=float(os.getenv("FAKE_UPSTREAM_429_RATE", "0")),
+            retry_after_seconds=float(os.getenv("FAKE_UPSTREAM_RETRY_AFTER_SECONDS", "1")),
+            disconnect_rate=float(os.getenv("FAKE_UPSTREAM_DISCONNECT_RATE", "0")),
+            seed=int(seed) if seed else None,
+        )
+
+
+@dataclass
+class FakeUpstreamStats:
+    requests: int = 0
+    streamed: int = 0
+    json_mode: int = 0
+    faults: Dict[str, int] = field(default_factory=dict)
+    prompt_tokens: int = 0
+    prompt_cache_hit_tokens: int = 0
+    completion_tokens: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["prompt_cache_hit_rate"] = (
+            round(self.prompt_cache_hit_tokens / self.prompt_tokens, 3) if self.prompt_tokens else None
+        )
+        return data
+
+
+class PrefixCache:
+    """DeepSeek-style prompt prefix cache: hits are the longest previously seen run of whole blocks."""
+
+    def __init__(self, block_chars: int = CACHE_BLOCK_CHARS, max_blocks: int = CACHE_MAX_BLOCKS) -> None:
+        self.block_chars = block_chars
+        self.max_blocks = max_blocks
+        self._blocks: "OrderedDict[bytes, None]" = OrderedDict()
+
+    def lookup(self, text: str) -> int:
+        """Characters of ``text`` served from cache; every full block is then remembered."""
+        digest = hashlib.blake2b(digest_size=16)
+        hit_chars = 0
+        missed = False
+        for start in range(0, len(text) - self.block_chars + 1, self.block_chars):
+            digest.update(text[start : start + self.block_chars].encode("utf-8"))
+            key = digest.digest()
+            if not missed and key in self._blocks:
+                self._blocks.move_to_end(key)
+                hit_chars = start + self.block_chars
+                continue
+            missed = True
+            self._blocks[key] = None
+            if len(self._blocks) > self.max_blocks:
+                self._blocks.popitem(last=False)
+        return hit_chars
+
+
+def _judge_weights(system_prompt: str) -> Dict[str, float]:
+    weights = {name: float(value) for name, value in _WEIGHT_LINE.findall(system_prompt) if name in SCORE_DIMENSIONS}
+    return weights if sum(weights.values()) > 0 else {name: 1.0 for name in SCORE_DIMENSIONS}
+
+
+def judge_output(system_prompt: str, rng: random.Random) -> Dict[str, Any]:
+    """A schema-valid JudgeOutput v1 ballot whose totals and winner agree with its scores."""
+    weights = _judge_weights(system_prompt)
+    scores = {
+        side: {name: round(rng.uniform(4.0, 9.5) * 2) / 2 for name in SCORE_DIMENSIONS}
+        for side in ("affirmative", "negative")
+    }
+    total_weight = sum(weights.values())
+    totals = {
+        side: int(round(sum(scores[side][name] * weight for name, weight in weights.items()) / total_weight * 10))
+        for side in scores
+    }
+    margin = totals["affirmative"] - totals["negative"]
+    winner = "tie" if abs(margin) <= 2 else ("affirmative" if margin > 0 else "negative")
+    return {
+        "schema": "JudgeOutput",
+        "version": "v1",
+        "winner": winner,
+        "scores": scores,
+        "weighted_scores": {**totals, "margin": margin},
+        "summary": {
+            "overall": f"Fake upstream ballot: {winner} by a margin of {margin}.",
+            "affirmative_highlights": ["Clear framing of the motion."],
+            "negative_highlights": ["Direct rebuttal of the key claim."],
+        },
+        "violations": [],
+    }
+
+
+def _split_completion(content: str, json_mode: bool) -> List[str]:
+    """Stream pieces, one per simulated token."""
+    if json_mode:
+        return [content[start : start + 4] for start in range(0, len(content), 4)]
+    return [word + " " for word in content.split(" ")]
+
+
+class FakeUpstream:
+    def __init__(self, settings: Optional[FakeUpstreamSettings] = None) -> None:
+        self.settings = settings or FakeUpstreamSettings.from_env()
+        self.rng = random.Random(self.settings.seed)
+        self.cache = PrefixCache()
+        self.stats = FakeUpstreamStats()
+
+    def _fault(self) -> Optional[str]:
+        roll = self.rng.random()
+        settings = self.settings
+        for kind, rate in (
+            ("rate_limited", settings.rate_limit_rate),
+            ("server_error", settings.error_rate),
+            ("disconnect", settings.disconnect_rate),
+        ):
+            if roll < rate:
+                self.stats.faults[kind] = self.stats.faults.get(kind, 0) + 1
+                return kind
+            roll -= rate
+        return None
+
+    def _first_token_delay(self) -> float:
+        settings = self.settings
+        if settings.ttft_seconds <= 0:
+            return 0.0
+        if settings.ttft_jitter <= 0:
+            return settings.ttft_seconds
+        return self.rng.lognormvariate(0.0, settings.ttft_jitter) * settings.ttft_seconds
+
+    def _usage(self, messages: Sequence[Dict[str, Any]], completion_tokens: int, reasoning_tokens: int) -> Dict[str, Any]:
+        prompt = "\n".join(f"{message.get('role')}: {message.get('content') or ''}" for message in messages)
+        prompt_tokens = estimate_tokens(prompt)
+        hit_tokens = min(prompt_tokens, estimate_tokens(prompt[: self.cache.lookup(prompt)]))
+        self.stats.prompt_tokens += prompt_tokens
+        self.stats.prompt_cache_hit_tokens += hit_tokens
+        self.stats.completion_tokens += completion_tokens
+        usage: Dict[str, Any] = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_cache_hit_tokens": hit_tokens,
+            "prompt_cache_miss_tokens": prompt_tokens - hit_tokens,
+            "prompt_tokens_details": {"cached_tokens": hit_tokens},
+        }
+        if reasoning_tokens:
+            usage["completion_tokens_details"] = {"reasoning_tokens": reasoning_tokens}
+        return usage
+
+    def _content(self, payload: Dict[str, Any], json_mode: bool) -> str:
+        if json_mode:
+            system = next(
+                (message.get("content") or "" for message in payload.get("messages", []) if message.get("role") == "system"),
+                "",
+            )
+            return json.dumps(judge_output(system, self.rng), ensure_ascii=False)
+        tokens = self.settings.completion_tokens
+        if isinstance(payload.get("max_tokens"), int):
+            tokens = min(tokens, payload["max_tokens"])
+        start = self.rng.randrange(len(_FILLER))
+        return " ".join(_FILLER[(start + index) % len(_FILLER)] for index in range(max(1, tokens)))
+
+    async def handle(self, request: Request):
+        if not request.headers.get("authorization", "").startswith("Bearer "):
+            return JSONResponse({"error": {"message": "Missing bearer token.", "type": "authentication_error"}}, 401)
+        payload = await request.json()
+        self.stats.requests += 1
+        fault = self._fault()
+        if fault == "rate_limited":
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached.", "type": "rate_limit_error"}},
+                429,
+                headers={"Retry-After": f"{self.settings.retry_after_seconds:g}"},
+            )
+        if fault == "server_error":
+            return JSONResponse({"error": {"message": "Injected upstream failure.", "type": "server_error"}}, 500)
+
+        model = str(payload.get("model") or "fake-chat")
+        json_mode = (payload.get("response_format") or {}).get("type") == "json_object"
+        self.stats.json_mode += json_mode
+        content = self._content(payload, json_mode)
+        pieces = _split_completion(content, json_mode)
+        # Reasoner models think before answering; the thinking counts as completion tokens.
+        reasoning = _split_completion(self._content({}, False), False)[: len(pieces) // 2] if "reasoner" in model else []
+        usage = self._usage(payload.get("messages") or [], len(pieces) + len(reasoning), len(reasoning))
+        completion_id = f"fake-{uuid.uuid4().hex[:12]}"
+        first_token = self._first_token_delay()
+
+        if payload.get("stream"):
+            self.stats.streamed += 1
+            include_usage = bool((payload.get("stream_options") or {}).get("include_usage"))
+            return StreamingResponse(
+                self._stream(completion_id, model, reasoning, pieces, usage if include_usage else None, first_token, fault),
+                media_type="text/event-stream",
+            )
+
+        await asyncio.sleep(first_token + (len(pieces) + len(reasoning)) / self.settings.tokens_per_second)
+        if fault == "disconnect":
+            return JSONResponse({"error": {"message": "Injected upstream disconnect.", "type": "server_error"}}, 502)
+        message: Dict[str, Any] = {"role": "assistant", "content": content}
+        if reasoning:
+            message["reasoning_content"] = "".join(reasoning).strip()
+        return JSONResponse(
+            {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+                "usage": usage,
+            }
+        )
+
+    async def _stream(
+        self,
+        completion_id: str,
+        model: str,
+        reasoning: List[str],
+        pieces: List[str],
+        usage: Optional[Dict[str, Any]],
+        first_token: float,
+        fault: Optional[str],
+    ) -> AsyncIterator[str]:
+        created = int(time.time())
+
+        def chunk(delta: Optional[Dict[str, Any]], finish_reason: Optional[str] = None, **extra: Any) -> str:
+            body = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if delta is not None else [],
+                **extra,
+            }
+            return f"data: {json.dumps(body, ensure_ascii=False)}\n\n"
+
+        deltas: List[Tuple[str, str]] = [("reasoning_content", piece) for piece in reasoning]
+        deltas += [("content", piece) for piece in pieces]
+        cutoff = len(deltas) // 2 if fault == "disconnect" else None
+        yield chunk({"role": "assistant", "content": ""})
+        started = time.monotonic() + first_token
+        for index, (key, piece) in enumerate(deltas):
+            if index == cutoff:
+                raise ConnectionResetError("Injected upstream disconnect.")
+            delay = started + index / self.settings.tokens_per_second - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield chunk({key: piece})
+        yield chunk({}, "stop")
+        if usage is not None:
+            yield chunk(None, usage=usage)
+        yield "data: [DONE]\n\n"
+
+
+def build_app(settings: Optional[FakeUpstreamSettings] = None) -> FastAPI:
+    upstream = FakeUpstream(settings)
+    app = FastAPI(title="Fake chat/completions upstream", version="1.0.0")
+    app.state.upstream = upstream
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        return await upstream.handle(request)
+
+    @app.get("/stats")
+    async def stats() -> Dict[str, Any]:
+        return {"settings": asdict(upstream.settings), **upstream.stats.as_dict()}
+
+    return app
+
+
+def mount_in_process(fake_app: FastAPI, url: str, gateway: Optional[ChatGateway] = None) -> None:
+    """Route the gateway's calls for ``url``'s origin straight into ``fake_app`` (no sockets).
+
+    ``httpx.ASGITransport`` buffers whole responses, so streamed replies arrive at
+    once; run the fake as a subprocess when time to first token matters.
+    """
+    gateway = gateway or get_gateway()
+    gateway.register_client(
+        base_url(url), httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_app), base_url=base_url(url))
+    )
+
+
+app = build_app()
+
+
+__all__ = [
+    "FakeUpstream",
+    "FakeUpstreamSettings",
+    "PrefixCache",
+    "build_app",
+    "judge_output",
+    "mount_in_process",
+]
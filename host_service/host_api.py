@@ -2,16 +2,39 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Union
 
 import httpx
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from .metrics import metrics_response
+from .upstream import (
+    ChatResult,
+    ChatStream,
+    close_gateway,
+    get_gateway,
+    prompt_cache_usage,
+    relay_chat_stream,
+    require_api_key,
+)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    try:
+        yield
+    finally:
+        await close_gateway()
+
+
 app = FastAPI(
     title="Debate Host LLM",
     description="LLM-powered host persona orchestrating debate stages with Deepseek Chat.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 logger = logging.getLogger(__name__)
@@ -36,6 +59,7 @@ class HostRequest(BaseModel):
     context: Dict[str, Any]
     client: Dict[str, Any]
     tags: Optional[Dict[str, Any]] = None
+    stream: bool = Field(False, description="Relay upstream deltas as text/event-stream.")
 
 
 class HostResponse(BaseModel):
@@ -43,74 +67,105 @@ class HostResponse(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
-def _format_context_block(context: Dict[str, Any]) -> str:
-    stage = context.get("stage")
+STABLE_CONTEXT_KEYS = {"topic", "judges"}
+CALL_CONTEXT_KEYS = {"stage", "highlights", "round_info", "progress"}
+
+
+def _stable_context_block(context: Dict[str, Any], prompt: str = "") -> str:
+    """Debate-wide facts that lead the user message; the topic is skipped when ``prompt`` has it."""
     topic = context.get("topic")
-    highlights = context.get("highlights") or []
     judges = context.get("judges")
+
+    lines: List[str] = []
+    if topic and topic not in prompt:
+        lines.append(f"辩题: {topic}")
+    if judges:
+        lines.append(f"评委信息: {judges}")
+    return "\n".join(lines)
+
+
+def _call_context_block(context: Dict[str, Any]) -> str:
+    """Per-call progress that follows the instruction so it never splits the cached prefix."""
+    stage = context.get("stage")
+    highlights = context.get("highlights") or []
     round_info = context.get("round_info") or context.get("progress")
 
     lines: List[str] = []
     if stage:
         lines.append(f"当前赛程环节: {stage}")
-    if topic:
-        lines.append(f"辩题: {topic}")
     if round_info:
         lines.append(f"赛程进度: {round_info}")
     if highlights:
         cleaned = [h for h in highlights if h]
         if cleaned:
             lines.append("上一环节亮点: " + " | ".join(cleaned[:5]))
-    if judges:
-        lines.append(f"评委信息: {judges}")
 
-    extra_keys = {k: v for k, v in context.items() if k not in {"stage", "topic", "highlights", "judges", "round_info", "progress"}}
+    extra_keys = {k: v for k, v in context.items() if k not in STABLE_CONTEXT_KEYS | CALL_CONTEXT_KEYS}
     for key, value in extra_keys.items():
         lines.append(f"{key}: {value}")
 
     return "\n".join(lines)
 
 
-async def _call_deepseek(messages: List[Dict[str, str]]) -> Dict[str, Any]:
-    api_key = os.getenv("DEEPSEEK_API_KEY")
-    if not api_key:
-        logger.error("Missing DEEPSEEK_API_KEY environment variable.")
-        raise HTTPException(status_code=500, detail="Deepseek API key is not configured.")
-
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
-    payload = {
+def _deepseek_payload(messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    return {
         "model": DEEPSEEK_MODEL,
         "messages": messages,
         "temperature": DEFAULT_TEMPERATURE,
     }
 
+
+async def _call_deepseek(messages: List[Dict[str, str]]) -> ChatResult:
+    api_key = require_api_key(provider="Deepseek")
     timeout = httpx.Timeout(20.0, connect=10.0)
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        try:
-            response = await client.post(DEEPSEEK_API_URL, headers=headers, json=payload)
-        except httpx.HTTPError as exc:
-            logger.exception("Deepseek API request failed.")
-            raise HTTPException(status_code=502, detail=f"Deepseek API request failed: {exc}") from exc
+    return await get_gateway().chat_completion(
+        DEEPSEEK_API_URL, api_key, _deepseek_payload(messages), timeout=timeout, provider="Deepseek"
+    )
+
+
+async def _stream_deepseek(messages: List[Dict[str, str]]) -> ChatStream:
+    api_key = require_api_key(provider="Deepseek")
+    timeout = httpx.Timeout(20.0, connect=10.0, read=60.0)
+    return await get_gateway().open_chat_stream(
+        DEEPSEEK_API_URL, api_key, _deepseek_payload(messages), timeout=timeout, provider="Deepseek"
+    )
+
+
+def _build_metadata(
+    request: HostRequest,
+    completion: Dict[str, Any],
+    upstream: Dict[str, Any],
+) -> Dict[str, Any]:
+    metadata = {
+        "stage": request.context.get("stage"),
+        "host_persona": "deepseek_chat_moderator",
+        "model": DEEPSEEK_MODEL,
+        "usage": completion.get("usage"),
+        "prompt_id": completion.get("id"),
+        **prompt_cache_usage(completion.get("usage")),
+    }
+    metadata.update(upstream)
+    return metadata
 
-    if response.status_code >= 400:
-        detail = response.text
-        logger.error("Deepseek API returned error %s: %s", response.status_code, detail)
-        raise HTTPException(status_code=response.status_code, detail="Deepseek API error: " + detail)
 
-    return response.json()
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return metrics_response()
 
 
 @app.post("/host/respond", response_model=HostResponse)
-async def host_reply(request: HostRequest) -> HostResponse:
-    context_block = _format_context_block(request.context)
+async def host_reply(request: HostRequest) -> Union[HostResponse, StreamingResponse]:
+    # Debate-wide facts, then the instruction, then per-call context, so consecutive
+    # calls share the longest possible prefix.
     user_sections = []
-    if context_block:
-        user_sections.append(context_block)
+    stable_block = _stable_context_block(request.context, request.prompt)
+    if stable_block:
+        user_sections.append(stable_block)
     if request.prompt:
         user_sections.append(f"执行以下主持指令:\n{request.prompt}")
+    call_block = _call_context_block(request.context)
+    if call_block:
+        user_sections.append(call_block)
     user_message = "\n\n".join(user_sections) if user_sections else "依据规则进行主持发言。"
 
     messages = [
@@ -118,7 +173,28 @@ async def host_reply(request: HostRequest) -> HostResponse:
         {"role": "user", "content": user_message},
     ]
 
-    api_result = await _call_deepseek(messages)
+    if request.stream:
+        stream = await _stream_deepseek(messages)
+        return StreamingResponse(
+            relay_chat_stream(
+                stream,
+                lambda opened, summary: _build_metadata(
+                    request,
+                    summary,
+                    {
+                        "upstream_latency_ms": opened.latency_ms,
+                        "upstream_first_token_ms": opened.first_token_ms,
+                        "upstream_attempts": opened.attempts,
+                        "streamed": True,
+                    },
+                ),
+            ),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    result = await _call_deepseek(messages)
+    api_result = result.data
 
     try:
         choice = api_result["choices"][0]
@@ -127,11 +203,9 @@ async def host_reply(request: HostRequest) -> HostResponse:
         logger.exception("Unexpected Deepseek API payload: %s", api_result)
         raise HTTPException(status_code=502, detail="Deepseek API returned an unexpected payload.") from exc
 
-    metadata = {
-        "stage": request.context.get("stage"),
-        "host_persona": "deepseek_chat_moderator",
-        "model": DEEPSEEK_MODEL,
-        "usage": api_result.get("usage"),
-        "prompt_id": api_result.get("id"),
-    }
+    metadata = _build_metadata(
+        request,
+        api_result,
+        {"upstream_latency_ms": result.latency_ms, "upstream_attempts": result.attempts},
+    )
     return HostResponse(content=content, metadata=metadata)
@@ -0,0 +1,69 @@
+"""Small HTTP/env helpers shared by host_service and the arena's LLM client."""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+# Upper bound on any single retry wait, including upstream-supplied Retry-After hints.
+MAX_RETRY_DELAY_SECONDS = 8.0
+RATE_LIMIT_RESET_HEADERS = (
+    "x-ratelimit-reset-requests",
+    "x-ratelimit-reset-tokens",
+    "x-ratelimit-reset",
+)
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+
+
+def env_flag(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    scale = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+
+def retry_delay_from_headers(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds to wait according to ``Retry-After`` or provider rate-limit reset headers."""
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        seconds = _parse_duration(retry_after)
+        if seconds is None:
+            try:
+                seconds = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                seconds = None
+        if seconds is not None:
+            return max(0.0, seconds)
+
+    delays = []
+    for name in RATE_LIMIT_RESET_HEADERS:
+        raw = headers.get(name)
+        if raw:
+            seconds = _parse_duration(raw)
+            if seconds is not None:
+                delays.append(seconds)
+    return max(delays) if delays else None
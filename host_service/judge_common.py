@@ -3,12 +3,23 @@ from __future__ import annotations
 import json
 import logging
 import os
+from contextlib import asynccontextmanager
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import httpx
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from pydantic import BaseModel, Field
 
+from .metrics import metrics_response
+from .singleflight import get_single_flight, request_key
+from .upstream import (
+    ChatResult,
+    close_gateway,
+    get_gateway,
+    prompt_cache_usage,
+    require_api_key,
+)
+
 logger = logging.getLogger(__name__)
 
 DEEPSEEK_API_URL = os.getenv(
@@ -100,8 +111,8 @@ def _format_context(context: Dict[str, Any]) -> str:
         return ""
 
     ordered = [
-        "stage",
         "topic",
+        "stage",
         "round",
         "turn",
         "speaker",
@@ -132,16 +143,14 @@ def _format_context(context: Dict[str, Any]) -> str:
 
 
 def _build_system_prompt(config: PersonaConfig) -> str:
+    # The shared rules and schema lead so every persona's calls hit the same cached prefix.
     weight_lines = "\n".join(
         f"- {metric} {weight:.2f}" for metric, weight in config.weights
     )
     notes = config.system_notes.strip() if config.system_notes else ""
     base_prompt = (
-        f"{config.introduction.strip()}\n\n"
         "坚持“文本记录唯一可信来源”，只依据提供的内容评分。"
         " 可在内部进行充分推理，但严禁在输出中泄露推理过程或思维链。\n"
-        "评价维度与权重（总和=1）：\n"
-        f"{weight_lines}\n\n"
         "计分流程：\n"
         "1. 各分项以0-10分打分，可用小数表示半分。\n"
         "2. 依据权重计算加权平均，并×10 换算为0-100的总分，取整。\n"
@@ -150,7 +159,10 @@ def _build_system_prompt(config: PersonaConfig) -> str:
         "禁止输出除JSON以外的任何字符（包括前后缀说明、Markdown等）。\n"
         "Important: output must be a valid json object (json). No extra text.\n"
         "严格输出以下 JudgeOutput v1 JSON 结构，确保字段完整且取值合法：\n"
-        f"{JUDGE_OUTPUT_SCHEMA}"
+        f"{JUDGE_OUTPUT_SCHEMA}\n\n"
+        f"{config.introduction.strip()}\n\n"
+        "评价维度与权重（总和=1）：\n"
+        f"{weight_lines}"
     )
     if notes:
         base_prompt = f"{base_prompt}\n\n补充注意事项：\n{notes}"
@@ -160,58 +172,32 @@ def _build_system_prompt(config: PersonaConfig) -> str:
 async def _call_deepseek(
     messages: List[Dict[str, str]],
     temperature: Optional[float] = None,
-) -> Dict[str, Any]:
-    api_key = os.getenv("DEEPSEEK_API_KEY")
-    if not api_key:
-        logger.error("Missing DEEPSEEK_API_KEY environment variable.")
-        raise HTTPException(
-            status_code=500, detail="DeepSeek API key is not configured."
-        )
-
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
+) -> ChatResult:
+    api_key = require_api_key(provider="DeepSeek")
     payload: Dict[str, Any] = {
         "model": DEEPSEEK_REASONER_MODEL,
         "messages": messages,
         "temperature": temperature if temperature is not None else DEFAULT_TEMPERATURE,
         "response_format": {"type": "json_object"},
     }
-
     timeout = httpx.Timeout(30.0, connect=10.0)
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        try:
-            response = await client.post(
-                DEEPSEEK_API_URL, headers=headers, json=payload
-            )
-        except httpx.HTTPError as exc:
-            logger.exception("DeepSeek API request failed.")
-            raise HTTPException(
-                status_code=502, detail=f"DeepSeek API request failed: {exc}"
-            ) from exc
-
-    if response.status_code >= 400:
-        detail = response.text
-        logger.error(
-            "DeepSeek API returned error %s: %s", response.status_code, detail
-        )
-        raise HTTPException(
-            status_code=response.status_code,
-            detail="DeepSeek API error: " + detail,
-        )
-
-    return response.json()
+    return await get_gateway().chat_completion(
+        DEEPSEEK_API_URL, api_key, payload, timeout=timeout, provider="DeepSeek"
+    )
 
 
 def _prepare_messages(system_prompt: str, request: JudgeRequest) -> List[Dict[str, str]]:
-    context_block = _format_context(request.context)
+    # Transcript material goes before per-call context so re-judging shares a prefix.
+    context = dict(request.context)
+    if request.prompt and context.get("topic") and str(context["topic"]) in request.prompt:
+        context.pop("topic")
+    context_block = _format_context(context)
 
     user_sections: List[str] = []
-    if context_block:
-        user_sections.append(f"比赛上下文:\n{context_block}")
     if request.prompt:
         user_sections.append(f"评审材料:\n{request.prompt}")
+    if context_block:
+        user_sections.append(f"比赛上下文:\n{context_block}")
     user_sections.append("请基于以上内容完成评分并输出JudgeOutput v1。")
 
     return [
@@ -220,6 +206,13 @@ def _prepare_messages(system_prompt: str, request: JudgeRequest) -> List[Dict[st
     ]
 
 
+def _single_flight_enabled(request: JudgeRequest) -> bool:
+    """Callers opt out with ``tags.single_flight = false`` to get an independent sample."""
+    if not request.tags:
+        return True
+    return request.tags.get("single_flight", True) is not False
+
+
 def _normalise_json_payload(raw_text: str) -> Dict[str, Any]:
     try:
         parsed = json.loads(raw_text)
@@ -240,16 +233,29 @@ def _normalise_json_payload(raw_text: str) -> Dict[str, Any]:
 
 def build_judge_app(config: PersonaConfig) -> FastAPI:
     system_prompt = _build_system_prompt(config)
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        try:
+            yield
+        finally:
+            await close_gateway()
+
     app = FastAPI(
         title=f"Debate Judge · {config.display_name}",
         description=f"Persona: {config.display_name} powered by DeepSeek Reasoner.",
         version="1.0.0",
+        lifespan=lifespan,
     )
 
     @app.get("/health")
     async def health() -> Dict[str, str]:
         return {"status": "ok", "persona_id": config.persona_id}
 
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        return metrics_response()
+
     @app.get("/meta")
     async def meta() -> Dict[str, Any]:
         return {
@@ -260,10 +266,11 @@ def build_judge_app(config: PersonaConfig) -> FastAPI:
             "temperature": config.temperature or DEFAULT_TEMPERATURE,
         }
 
-    @app.post("/respond", response_model=JudgeResponse)
-    async def judge_reply(request: JudgeRequest) -> JudgeResponse:
-        messages = _prepare_messages(system_prompt, request)
-        api_result = await _call_deepseek(messages, temperature=config.temperature)
+    async def _judge_upstream(
+        messages: List[Dict[str, str]],
+    ) -> Tuple[ChatResult, Dict[str, Any]]:
+        result = await _call_deepseek(messages, temperature=config.temperature)
+        api_result = result.data
 
         try:
             choice = api_result["choices"][0]
@@ -276,7 +283,24 @@ def build_judge_app(config: PersonaConfig) -> FastAPI:
                 detail="DeepSeek API returned an unexpected payload.",
             ) from exc
 
-        parsed = _normalise_json_payload(content)
+        return result, _normalise_json_payload(content)
+
+    @app.post("/respond", response_model=JudgeResponse)
+    async def judge_reply(request: JudgeRequest) -> JudgeResponse:
+        messages = _prepare_messages(system_prompt, request)
+        coalesced = False
+        if _single_flight_enabled(request):
+            key = request_key(
+                messages,
+                DEEPSEEK_REASONER_MODEL,
+                config.temperature if config.temperature is not None else DEFAULT_TEMPERATURE,
+            )
+            (result, parsed), coalesced = await get_single_flight().do(
+                key, lambda: _judge_upstream(messages)
+            )
+        else:
+            result, parsed = await _judge_upstream(messages)
+        api_result = result.data
         serialised = json.dumps(parsed, ensure_ascii=False)
 
         metadata = {
@@ -286,6 +310,10 @@ def build_judge_app(config: PersonaConfig) -> FastAPI:
             "model": DEEPSEEK_REASONER_MODEL,
             "usage": api_result.get("usage"),
             "prompt_id": api_result.get("id"),
+            **prompt_cache_usage(api_result.get("usage")),
+            "upstream_latency_ms": result.latency_ms,
+            "upstream_attempts": result.attempts,
+            "coalesced": coalesced,
             "schema": parsed.get("schema"),
             "version": parsed.get("version"),
             "weighted_scores": parsed.get("weighted_scores"),
@@ -0,0 +1,424 @@
+"""Shared pooled gateway for upstream chat-completions providers (DeepSeek, OpenAI, ...)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from fastapi import HTTPException
+
+from .http_utils import (
+    MAX_RETRY_DELAY_SECONDS,
+    env_flag,
+    http2_available,
+    retry_delay_from_headers,
+)
+from .metrics import get_registry
+
+logger = logging.getLogger(__name__)
+
+_METRICS = get_registry()
+UPSTREAM_SECONDS = _METRICS.histogram(
+    "upstream_request_seconds",
+    "Upstream chat-completion latency, including retries (streams: until the last chunk).",
+    ("upstream", "model"),
+)
+UPSTREAM_TOKENS = _METRICS.counter(
+    "upstream_tokens_total",
+    "Tokens reported in upstream usage blocks.",
+    ("upstream", "model", "kind"),
+)
+UPSTREAM_ERRORS = _METRICS.counter(
+    "upstream_errors_total",
+    "Failed upstream attempts by HTTP status (0 = transport error).",
+    ("upstream", "model", "status"),
+)
+UPSTREAM_RETRIES = _METRICS.counter(
+    "upstream_retries_total",
+    "Upstream attempts that were retried.",
+    ("upstream", "model"),
+)
+
+RETRIABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+@dataclass
+class GatewaySettings:
+    max_connections: int = 50
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 60.0
+    http2: bool = False
+    max_retries: int = 2
+
+    @classmethod
+    def from_env(cls) -> "GatewaySettings":
+        return cls(
+            max_connections=int(os.getenv("UPSTREAM_POOL_MAX_CONNECTIONS", "50")),
+            max_keepalive_connections=int(os.getenv("UPSTREAM_POOL_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("UPSTREAM_POOL_KEEPALIVE_EXPIRY", "60")),
+            http2=env_flag("UPSTREAM_HTTP2", False),
+            max_retries=int(os.getenv("UPSTREAM_MAX_RETRIES", "2")),
+        )
+
+
+@dataclass
+class ChatResult:
+    data: Dict[str, Any]
+    latency_ms: float
+    attempts: int
+
+
+class ChatStream:
+    """An opened upstream SSE completion; iterate ``chunks()`` and always ``aclose()``."""
+
+    def __init__(
+        self,
+        response: httpx.Response,
+        stats: "ProviderStats",
+        started: float,
+        attempts: int,
+        provider: str,
+    ) -> None:
+        self.response = response
+        self.stats = stats
+        self.started = started
+        self.attempts = attempts
+        self.provider = provider
+        self.first_token_ms: Optional[float] = None
+        self.latency_ms: Optional[float] = None
+
+    async def chunks(self) -> AsyncIterator[Dict[str, Any]]:
+        content_type = self.response.headers.get("content-type", "")
+        if "text/event-stream" not in content_type:
+            # Provider ignored ``stream``; replay the whole completion as one chunk.
+            await self.response.aread()
+            data = self.response.json()
+            self._finish(data.get("usage") if isinstance(data, dict) else None)
+            try:
+                content = data["choices"][0]["message"]["content"]
+            except (KeyError, IndexError, TypeError):
+                content = None
+            yield {
+                "id": data.get("id") if isinstance(data, dict) else None,
+                "choices": [{"delta": {"content": content or ""}}],
+                "usage": data.get("usage") if isinstance(data, dict) else None,
+            }
+            return
+
+        usage: Optional[Mapping[str, Any]] = None
+        async for line in self.response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if not data:
+                continue
+            if data == "[DONE]":
+                break
+            try:
+                chunk = json.loads(data)
+            except json.JSONDecodeError:
+                logger.warning("%s stream sent an undecodable frame: %s", self.provider, data)
+                continue
+            if self.first_token_ms is None:
+                self.first_token_ms = round((time.monotonic() - self.started) * 1000, 1)
+            usage = chunk.get("usage") or usage
+            yield chunk
+        self._finish(usage)
+
+    def _finish(self, usage: Optional[Mapping[str, Any]]) -> None:
+        latency_ms = (time.monotonic() - self.started) * 1000
+        self.latency_ms = round(latency_ms, 1)
+        if self.first_token_ms is None:
+            self.first_token_ms = self.latency_ms
+        self.stats.record_latency(latency_ms)
+        self.stats.record_usage(usage)
+
+    async def aclose(self) -> None:
+        await self.response.aclose()
+
+
+@dataclass
+class ProviderStats:
+    upstream: str = ""
+    model: str = ""
+    calls: int = 0
+    retries: int = 0
+    errors: Dict[int, int] = field(default_factory=dict)
+    latency_ms_total: float = 0.0
+    latency_ms_max: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    prompt_cache_hit_tokens: int = 0
+    prompt_cache_miss_tokens: int = 0
+
+    def record_latency(self, latency_ms: float) -> None:
+        self.latency_ms_total += latency_ms
+        self.latency_ms_max = max(self.latency_ms_max, latency_ms)
+        UPSTREAM_SECONDS.labels(self.upstream, self.model).observe(latency_ms / 1000)
+
+    def record_error(self, status: int) -> None:
+        self.errors[status] = self.errors.get(status, 0) + 1
+        UPSTREAM_ERRORS.labels(self.upstream, self.model, status).inc()
+
+    def record_retry(self) -> None:
+        self.retries += 1
+        UPSTREAM_RETRIES.labels(self.upstream, self.model).inc()
+
+    def record_usage(self, usage: Optional[Mapping[str, Any]]) -> None:
+        if not usage:
+            return
+        counts = {
+            kind: int(usage.get(f"{kind}_tokens") or 0)
+            for kind in ("prompt", "completion", "prompt_cache_hit", "prompt_cache_miss")
+        }
+        self.prompt_tokens += counts["prompt"]
+        self.completion_tokens += counts["completion"]
+        self.prompt_cache_hit_tokens += counts["prompt_cache_hit"]
+        self.prompt_cache_miss_tokens += counts["prompt_cache_miss"]
+        for kind, tokens in counts.items():
+            if tokens:
+                UPSTREAM_TOKENS.labels(self.upstream, self.model, kind).inc(tokens)
+
+
+def base_url(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class ChatGateway:
+    def __init__(self, settings: Optional[GatewaySettings] = None) -> None:
+        self.settings = settings or GatewaySettings.from_env()
+        if self.settings.http2 and not http2_available():
+            self.settings.http2 = False
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self.stats: Dict[Tuple[str, str], ProviderStats] = {}
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        key = base_url(url)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self.settings.max_connections,
+                max_keepalive_connections=self.settings.max_keepalive_connections,
+                keepalive_expiry=self.settings.keepalive_expiry,
+            )
+            client = httpx.AsyncClient(limits=limits, http2=self.settings.http2)
+            self._clients[key] = client
+        return client
+
+    def register_client(self, url: str, client: httpx.AsyncClient) -> None:
+        """Use ``client`` for ``url``'s origin, e.g. one wired to an in-process transport."""
+        self._clients[base_url(url)] = client
+
+    def _stats_for(self, url: str, model: str) -> ProviderStats:
+        key = (base_url(url), model)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = ProviderStats(upstream=key[0], model=model)
+            self.stats[key] = stats
+        return stats
+
+    async def chat_completion(
+        self,
+        url: str,
+        api_key: str,
+        payload: Dict[str, Any],
+        timeout: httpx.Timeout,
+        provider: str = "Upstream",
+    ) -> ChatResult:
+        stats = self._stats_for(url, str(payload.get("model", "")))
+        started = time.monotonic()
+        response, attempts = await self._send(url, api_key, payload, timeout, provider, stats)
+        latency_ms = (time.monotonic() - started) * 1000
+        stats.record_latency(latency_ms)
+        data = response.json()
+        stats.record_usage(data.get("usage") if isinstance(data, dict) else None)
+        return ChatResult(data=data, latency_ms=round(latency_ms, 1), attempts=attempts)
+
+    async def open_chat_stream(
+        self,
+        url: str,
+        api_key: str,
+        payload: Dict[str, Any],
+        timeout: httpx.Timeout,
+        provider: str = "Upstream",
+    ) -> ChatStream:
+        """Open a ``stream: true`` completion; only failures before the first byte are retried."""
+        payload = {**payload, "stream": True, "stream_options": {"include_usage": True}}
+        stats = self._stats_for(url, str(payload.get("model", "")))
+        started = time.monotonic()
+        response, attempts = await self._send(
+            url, api_key, payload, timeout, provider, stats, stream=True
+        )
+        return ChatStream(response, stats, started, attempts, provider)
+
+    async def _send(
+        self,
+        url: str,
+        api_key: str,
+        payload: Dict[str, Any],
+        timeout: httpx.Timeout,
+        provider: str,
+        stats: ProviderStats,
+        stream: bool = False,
+    ) -> Tuple[httpx.Response, int]:
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+        if stream:
+            headers["Accept"] = "text/event-stream"
+        client = self.client_for(url)
+        attempt = 0
+        while True:
+            attempt += 1
+            stats.calls += 1
+            retry_delay: Optional[float] = None
+            try:
+                request = client.build_request(
+                    "POST", url, headers=headers, json=payload, timeout=timeout
+                )
+                response = await client.send(request, stream=stream)
+            except httpx.HTTPError as exc:
+                stats.record_error(0)
+                if attempt > self.settings.max_retries:
+                    logger.exception("%s API request failed.", provider)
+                    raise HTTPException(
+                        status_code=502, detail=f"{provider} API request failed: {exc}"
+                    ) from exc
+            else:
+                if response.status_code < 400:
+                    return response, attempt
+                if stream:
+                    await response.aread()
+                    await response.aclose()
+                stats.record_error(response.status_code)
+                if (
+                    response.status_code not in RETRIABLE_STATUS
+                    or attempt > self.settings.max_retries
+                ):
+                    detail = response.text
+                    logger.error(
+                        "%s API returned error %s: %s", provider, response.status_code, detail
+                    )
+                    raise HTTPException(
+                        status_code=response.status_code,
+                        detail=f"{provider} API error: " + detail,
+                    )
+                retry_delay = retry_delay_from_headers(response.headers)
+
+            stats.record_retry()
+            ceiling = min(MAX_RETRY_DELAY_SECONDS, 0.5 * 2 ** (attempt - 1))
+            backoff = ceiling / 2 + random.uniform(0, ceiling / 2)
+            await asyncio.sleep(min(MAX_RETRY_DELAY_SECONDS, max(backoff, retry_delay or 0.0)))
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+_gateway: Optional[ChatGateway] = None
+
+
+def get_gateway() -> ChatGateway:
+    global _gateway
+    if _gateway is None:
+        _gateway = ChatGateway()
+    return _gateway
+
+
+async def close_gateway() -> None:
+    global _gateway
+    if _gateway is None:
+        return
+    gateway, _gateway = _gateway, None
+    await gateway.aclose()
+
+
+def prompt_cache_usage(usage: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """DeepSeek prefix-cache counters from a ``usage`` block, for response metadata."""
+    if not usage:
+        return {}
+    hit = usage.get("prompt_cache_hit_tokens")
+    miss = usage.get("prompt_cache_miss_tokens")
+    if hit is None and miss is None:
+        return {}
+    hit, miss = int(hit or 0), int(miss or 0)
+    total = hit + miss
+    return {
+        "prompt_cache_hit_tokens": hit,
+        "prompt_cache_miss_tokens": miss,
+        "prompt_cache_hit_rate": round(hit / total, 3) if total else None,
+    }
+
+
+def sse_frame(data: Any) -> str:
+    if isinstance(data, str):
+        return f"data: {data}\n\n"
+    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def relay_chat_stream(
+    stream: ChatStream,
+    build_metadata: Callable[[ChatStream, Dict[str, Any]], Dict[str, Any]],
+) -> AsyncIterator[str]:
+    """Re-emit upstream deltas in the orchestrator's SSE framing.
+
+    Frames are ``{"delta": ...}`` per chunk, a final ``{"content", "metadata"}`` and
+    ``[DONE]``. ``build_metadata`` receives the stream and ``{"id", "usage"}`` of the
+    upstream completion. Closing the generator (client disconnect) closes the upstream
+    response so the provider stops generating.
+    """
+    parts = []
+    summary: Dict[str, Any] = {"id": None, "usage": None}
+    try:
+        async for chunk in stream.chunks():
+            summary["id"] = chunk.get("id") or summary["id"]
+            summary["usage"] = chunk.get("usage") or summary["usage"]
+            for choice in chunk.get("choices") or []:
+                delta = (choice.get("delta") or {}).get("content")
+                if delta:
+                    parts.append(delta)
+                    yield sse_frame({"delta": delta})
+        content = "".join(parts).strip()
+        if not content:
+            yield sse_frame({"error": f"{stream.provider} stream returned no content."})
+            return
+        yield sse_frame({"content": content, "metadata": build_metadata(stream, summary)})
+        yield sse_frame("[DONE]")
+    except httpx.HTTPError as exc:
+        logger.exception("%s stream failed mid-response.", stream.provider)
+        yield sse_frame({"error": f"{stream.provider} stream failed: {exc}"})
+    finally:
+        await stream.aclose()
+
+
+def require_api_key(env_var: str = "DEEPSEEK_API_KEY", provider: str = "DeepSeek") -> str:
+    api_key = os.getenv(env_var)
+    if not api_key:
+        logger.error("Missing %s environment variable.", env_var)
+        raise HTTPException(status_code=500, detail=f"{provider} API key is not configured.")
+    return api_key
+
+
+__all__ = [
+    "ChatGateway",
+    "ChatResult",
+    "ChatStream",
+    "GatewaySettings",
+    "close_gateway",
+    "get_gateway",
+    "prompt_cache_usage",
+    "relay_chat_stream",
+    "require_api_key",
+    "retry_delay_from_headers",
+    "sse_frame",
+]
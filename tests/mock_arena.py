@@ -0,0 +1,90 @@
+"""Scripted participants for running a whole ``DebateOrchestrator`` without a network."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.debate.http_pool import HTTPClientPool, PoolSettings
+from app.debate.models import DebateRequest
+from app.debate.orchestrator import DebateOrchestrator
+
+Reply = Callable[[str, Dict[str, Any]], Awaitable[httpx.Response]]
+
+
+def judge_ballot(winner: str) -> httpx.Response:
+    content = json.dumps({"winner": winner, "summary": {"overall": f"{winner} argued better"}})
+    return httpx.Response(200, json={"content": content, "metadata": {}})
+
+
+class MockArena:
+    """Routes every participant endpoint to ``reply`` and records the calls made."""
+
+    def __init__(self, reply: Optional[Reply] = None, judge_winner: str = "affirmative") -> None:
+        # Unique hosts keep the process-wide limiters, breakers and latency trackers apart.
+        self.prefix = uuid.uuid4().hex[:8]
+        self.judge_winner = judge_winner
+        self.reply = reply or self.default_reply
+        self.calls: List[Tuple[str, Dict[str, Any]]] = []
+        self.pool = _RoutedPool(self._handle)
+
+    def endpoint(self, name: str) -> str:
+        return f"http://{self.prefix}-{name}.test/respond"
+
+    def participant(self, name: str) -> str:
+        return name.split("-", 1)[1].split(".", 1)[0]
+
+    async def default_reply(self, name: str, body: Dict[str, Any]) -> httpx.Response:
+        await asyncio.sleep(0)
+        if name.startswith("judge"):
+            return judge_ballot(self.judge_winner)
+        stage = body["context"].get("stage")
+        return httpx.Response(200, json={"content": f"{name} speaks at {stage}.", "metadata": {}})
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        name = self.participant(request.url.host)
+        self.calls.append((name, body))
+        return await self.reply(name, body)
+
+    def request(self, judges: int = 5, **options: Any) -> DebateRequest:
+        return DebateRequest(
+            topic="Cities should ban private cars downtown",
+            debaters=[
+                {"name": "Ada", "endpoint": self.endpoint("ada")},
+                {"name": "Bo", "endpoint": self.endpoint("bo")},
+            ],
+            judges=[{"name": f"Judge {i}", "endpoint": self.endpoint(f"judge{i}")} for i in range(judges)],
+            host={"name": "Host", "endpoint": self.endpoint("host")},
+            options={"max_cross_questions": 1, "max_freeform_rounds": 1, "stream_turns": False, **options},
+        )
+
+    def orchestrator(
+        self,
+        request: Optional[DebateRequest] = None,
+        events: Optional[List[Tuple[str, Any]]] = None,
+        **kwargs: Any,
+    ) -> DebateOrchestrator:
+        async def record(event_type: str, payload: Any) -> None:
+            if events is not None:
+                events.append((event_type, payload))
+
+        return DebateOrchestrator(
+            request or self.request(),
+            event_callback=record if events is not None else None,
+            http_pool=self.pool,
+            **kwargs,
+        )
+
+
+class _RoutedPool(HTTPClientPool):
+    def __init__(self, handler: Callable[[httpx.Request], Awaitable[httpx.Response]]) -> None:
+        super().__init__(PoolSettings(local_dispatch=False))
+        self._handler = handler
+
+    def _build_client(self, local_app: Any = None) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self._handler))
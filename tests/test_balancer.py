@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from app.debate.balancer import BalancerSettings, BreakerState, CircuitBreaker, ReplicaRegistry
+from app.debate.llm_client import LLMClient, LLMClientError
+from app.debate.rate_limit import LimiterRegistry
+from mock_arena import MockArena
+
+
+def test_breaker_opens_after_threshold_and_half_opens_after_timeout() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+
+    breaker.record_failure(now=100)
+    assert breaker.available(now=100)
+    breaker.record_failure(now=101)
+    assert breaker.state == BreakerState.OPEN
+    assert not breaker.available(now=105)
+
+    # One probe at a time once the reset timeout has passed.
+    assert breaker.available(now=111)
+    assert breaker.on_dispatch(now=111) is True
+    assert not breaker.available(now=111)
+    breaker.record_failure(now=112)
+    assert breaker.state == BreakerState.OPEN and breaker.opened_at == 112
+
+    assert breaker.on_dispatch(now=122) is True
+    breaker.record_success()
+    assert breaker.state == BreakerState.CLOSED and breaker.available(now=122)
+
+
+def test_open_replica_is_skipped_and_all_open_falls_back_to_oldest() -> None:
+    registry = ReplicaRegistry(BalancerSettings(failure_threshold=1, reset_timeout=60))
+    replicas = registry.replica_set(["http://a.test", "http://b.test", "http://c.test"])
+    a, b, c = replicas.replicas
+
+    with a.dispatch() as call:
+        call.failed()
+    assert {replicas.pick().endpoint for _ in range(50)} == {"http://b.test", "http://c.test"}
+
+    with c.dispatch() as call:
+        call.failed()
+    with b.dispatch() as call:
+        call.failed()
+    assert replicas.pick() is a
+
+
+def test_lone_endpoint_is_never_excluded() -> None:
+    registry = ReplicaRegistry(BalancerSettings(failure_threshold=1, reset_timeout=60))
+    replicas = registry.replica_set(["http://solo.test"])
+    (solo,) = replicas.replicas
+    with solo.dispatch() as call:
+        call.failed()
+
+    assert solo.breaker.state == BreakerState.OPEN
+    assert replicas.pick() is solo
+
+
+def _client(arena: MockArena, registry: ReplicaRegistry, replicas: List[str]) -> LLMClient:
+    return LLMClient(
+        name="ada",
+        endpoint=replicas[0],
+        timeout=5,
+        max_retries=0,
+        pool=arena.pool,
+        limiters=LimiterRegistry(overrides={}),
+        replicas=replicas,
+        replica_registry=registry,
+    )
+
+
+@pytest.mark.parametrize("status, trips", [(500, True), (429, False), (404, False)])
+def test_only_server_failures_trip_the_breaker(status: int, trips: bool) -> None:
+    async def reply(name: str, body: Dict[str, Any]) -> httpx.Response:
+        return httpx.Response(status, json={"detail": "nope"})
+
+    arena = MockArena(reply)
+    registry = ReplicaRegistry(BalancerSettings(failure_threshold=1, reset_timeout=60))
+    client = _client(arena, registry, [arena.endpoint("ada")])
+
+    with pytest.raises(LLMClientError):
+        asyncio.run(client.complete("hi", {"stage": "opening"}))
+
+    breaker = registry.get(arena.endpoint("ada")).breaker
+    assert (breaker.state == BreakerState.OPEN) is trips
+
+
+def test_client_fails_over_to_a_healthy_replica() -> None:
+    async def reply(name: str, body: Dict[str, Any]) -> httpx.Response:
+        if name == "down":
+            return httpx.Response(503, json={"detail": "overloaded"})
+        return httpx.Response(200, json={"content": f"from {name}", "metadata": {}})
+
+    arena = MockArena(reply)
+    registry = ReplicaRegistry(BalancerSettings(failure_threshold=1, reset_timeout=60))
+    client = _client(arena, registry, [arena.endpoint("down"), arena.endpoint("up")])
+    client.max_retries = 3
+
+    async def main() -> List[str]:
+        return [(await client.complete("hi", {"stage": "opening"}))[0] for _ in range(4)]
+
+    assert asyncio.run(main()) == ["from up"] * 4
+    assert [name for name, _ in arena.calls].count("down") <= 1
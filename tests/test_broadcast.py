@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, List, Optional, Tuple
+
+import pytest
+
+from app.debate.broadcast import BroadcastHub, BroadcastSettings, DebateChannel, Subscriber
+
+
+def _delta(text: str, speaker: str = "Ada") -> dict:
+    return {"stage": "opening_affirmative", "speaker_name": speaker, "delta": text}
+
+
+async def _collect(subscriber: Subscriber) -> List[Tuple[Optional[int], str, Any]]:
+    return [(event_id, event["type"], event["payload"]) async for event_id, event in subscriber.events()]
+
+
+async def _live_subscriber(channel: DebateChannel) -> Tuple[Subscriber, "asyncio.Task"]:
+    """A subscriber that has caught up and is parked waiting, i.e. a viewer that stopped reading."""
+    subscriber = channel.subscribe()
+    events = subscriber.events()
+    first = asyncio.ensure_future(events.__anext__())
+    await asyncio.sleep(0)
+    assert subscriber.live
+
+    async def rest() -> List[Tuple[Optional[int], str, Any]]:
+        event_id, event = await first
+        return [(event_id, event["type"], event["payload"])] + [
+            (event_id, event["type"], event["payload"]) async for event_id, event in events
+        ]
+
+    return subscriber, asyncio.ensure_future(rest())
+
+
+def test_resume_from_last_event_id_has_no_gaps_or_duplicates() -> None:
+    async def main() -> List[Optional[int]]:
+        channel = DebateChannel("resume", BroadcastSettings())
+        for n in range(5):
+            channel.publish("debate_turn", {"n": n})
+        subscriber = channel.subscribe(last_event_id=2)
+        received = []
+        async for event_id, _ in subscriber.events():
+            received.append(event_id)
+            if event_id == 5:
+                channel.publish("debate_turn", {"n": 5})
+                channel.publish("complete", {})
+                channel.close()
+        return received
+
+    assert asyncio.run(main()) == [3, 4, 5, 6, 7]
+
+
+def test_backlogged_deltas_replay_as_one_chunk() -> None:
+    async def main() -> List[Tuple[Optional[int], str, Any]]:
+        channel = DebateChannel("replay", BroadcastSettings())
+        channel.publish("assignments", {})
+        for piece in ("Cars ", "should ", "go."):
+            channel.publish("turn_delta", _delta(piece))
+        channel.publish("turn_delta", _delta("No.", speaker="Bo"))
+        channel.close()
+        return await _collect(channel.subscribe())
+
+    assert asyncio.run(main()) == [
+        (1, "assignments", {}),
+        (4, "turn_delta", _delta("Cars should go.")),
+        (5, "turn_delta", _delta("No.", speaker="Bo")),
+    ]
+
+
+def test_slow_subscriber_coalesces_drops_deltas_then_folds_oldest_events() -> None:
+    async def main() -> Tuple[Subscriber, List[Tuple[Optional[int], str, Any]]]:
+        channel = DebateChannel("slow", BroadcastSettings(subscriber_buffer=4))
+        subscriber, received = await _live_subscriber(channel)
+        channel.publish("debate_turn", {"n": 1})
+        channel.publish("turn_delta", _delta("Cars "))
+        channel.publish("turn_delta", _delta("go."))
+        assert len(subscriber) == 2
+        for n in range(4, 9):
+            channel.publish("debate_turn", {"n": n})
+        channel.close()
+        return subscriber, await received
+
+    subscriber, received = asyncio.run(main())
+
+    assert received == [
+        (None, "events_dropped", {"count": 3, "first_id": 1, "last_id": 5}),
+        (6, "debate_turn", {"n": 6}),
+        (7, "debate_turn", {"n": 7}),
+        (8, "debate_turn", {"n": 8}),
+    ]
+    # The dropped delta plus the three folded turns; the refolded notice is not counted twice.
+    assert subscriber.dropped == 4
+
+
+def test_delta_flood_does_not_evict_turns_needed_for_resume() -> None:
+    async def main() -> List[Tuple[Optional[int], str, Any]]:
+        channel = DebateChannel("flood", BroadcastSettings(log_size=8, transient_log_size=16))
+        channel.publish("debate_turn", {"n": 1})
+        for _ in range(1000):
+            channel.publish("turn_delta", _delta("x"))
+        channel.publish("debate_turn", {"n": 2})
+        channel.close()
+        return await _collect(channel.subscribe(last_event_id=0))
+
+    received = asyncio.run(main())
+
+    assert [event_type for _, event_type, _ in received] == ["debate_turn", "turn_delta", "debate_turn"]
+    assert received[1][2]["delta"] == "x" * 16
+    assert received[2][0] == 1002
+
+
+def test_resume_past_rotated_events_starts_with_a_drop_notice() -> None:
+    async def main() -> List[Tuple[Optional[int], str, Any]]:
+        channel = DebateChannel("rotated", BroadcastSettings(log_size=3))
+        for n in range(6):
+            channel.publish("debate_turn", {"n": n})
+        channel.close()
+        return await _collect(channel.subscribe(last_event_id=1))
+
+    assert asyncio.run(main()) == [
+        (None, "events_dropped", {"count": 2, "first_id": 2, "last_id": 3}),
+        (4, "debate_turn", {"n": 3}),
+        (5, "debate_turn", {"n": 4}),
+        (6, "debate_turn", {"n": 5}),
+    ]
+
+
+def test_hub_keeps_one_live_channel_per_debate() -> None:
+    async def main() -> None:
+        hub = BroadcastHub(BroadcastSettings())
+        channel = hub.open("debate")
+        with pytest.raises(ValueError):
+            hub.open("debate")
+        channel.close()
+        assert hub.get("debate") is channel
+        assert hub.open("debate") is not channel
+
+    asyncio.run(main())
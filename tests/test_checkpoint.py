@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+from app.debate.checkpoint import CheckpointStore, DebateCheckpoint
+from app.debate.models import DebateRequest
+from mock_arena import MockArena
+
+
+def test_resume_replays_journaled_calls_without_calling_participants(tmp_path: Path) -> None:
+    store = CheckpointStore(tmp_path)
+    closing_reached = asyncio.Event()
+    answered: List[Tuple[str, str]] = []
+
+    async def reply_until_closing(name: str, body: Dict[str, Any]) -> httpx.Response:
+        if "closing" in str(body["context"].get("stage")):
+            closing_reached.set()
+            await asyncio.sleep(60)
+        response = await arena.default_reply(name, body)
+        answered.append((name, body["prompt"]))
+        return response
+
+    arena = MockArena(reply_until_closing)
+    orchestrator = arena.orchestrator(checkpoint_store=store)
+
+    async def interrupt() -> None:
+        task = asyncio.create_task(orchestrator.run())
+        await closing_reached.wait()
+        orchestrator.cancel("client_disconnected")
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(interrupt())
+
+    checkpoint = store.load(orchestrator.debate_id)
+    assert checkpoint is not None
+    assert checkpoint.status == "interrupted"
+    assert len(checkpoint.journal) == len(answered) > 0
+
+    arena.reply = arena.default_reply
+    arena.calls.clear()
+    resumed = arena.orchestrator(
+        DebateRequest.model_validate(checkpoint.request),
+        checkpoint_store=store,
+        resume_from=checkpoint,
+    )
+    response = asyncio.run(resumed.run())
+
+    repeated = {(name, body["prompt"]) for name, body in arena.calls} & set(answered)
+    assert repeated == set()
+    assert response.metadata["checkpoint"]["resumed"] is True
+    assert response.metadata["checkpoint"]["replayed_calls"] == len(answered)
+    assert len(arena.calls) + len(answered) == resumed.planned_calls()
+    assert response.transcript[-1].stage.startswith("closing")
+    assert len(response.judge_votes) == 5
+
+    # A completed debate has nothing left to resume, so its files are removed.
+    assert store.load(orchestrator.debate_id) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_prune_removes_only_stale_finished_checkpoints(tmp_path: Path) -> None:
+    store = CheckpointStore(tmp_path)
+    stale = time.time() - 7200
+    for debate_id, status, updated_at in (
+        ("old-failed", "failed", stale),
+        ("old-running", "running", stale),
+        ("new-interrupted", "interrupted", time.time()),
+    ):
+        checkpoint = DebateCheckpoint(debate_id, request={}, debater_order=[0, 1], status=status)
+        state = checkpoint.state()
+        state["updated_at"] = updated_at
+        store.write_state(state)
+        store.append_journal(debate_id, "opening", ("content", {}))
+
+    assert store.prune(3600) == 1
+    assert store.load("old-failed") is None
+    assert not (tmp_path / "old-failed.journal.jsonl").exists()
+    assert store.load("old-running") is not None
+    assert store.load("new-interrupted").journal == {"opening": ("content", {})}
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from app.debate.balancer import ReplicaRegistry
+from app.debate.hedging import HedgeBudget, HedgeSettings, LatencySketch, LatencyTracker
+from app.debate.llm_client import LLMClient
+from app.debate.rate_limit import LimiterRegistry
+from mock_arena import MockArena
+
+
+def test_sketch_quantiles_stay_within_relative_accuracy() -> None:
+    sketch = LatencySketch(accuracy=0.02, half_life=10_000)
+    for ms in range(1, 1001):
+        sketch.record(ms / 1000)
+
+    assert sketch.quantile(0.5) == pytest.approx(0.5, rel=0.02)
+    assert sketch.quantile(0.95) == pytest.approx(0.95, rel=0.02)
+    assert LatencySketch().quantile(0.95) is None
+
+
+def test_sketch_decay_follows_a_latency_shift() -> None:
+    sketch = LatencySketch(half_life=100)
+    for _ in range(1000):
+        sketch.record(0.1)
+    for _ in range(1000):
+        sketch.record(2.0)
+
+    assert sketch.quantile(0.5) == pytest.approx(2.0, rel=0.02)
+
+
+def test_budget_caps_hedges_at_the_configured_ratio() -> None:
+    budget = HedgeBudget(ratio=0.1, burst=2)
+    fired = 0
+    for _ in range(100):
+        budget.deposit()
+        fired += budget.try_spend()
+
+    # The initial burst plus one hedge per ten eligible calls.
+    assert fired == pytest.approx(2 + 100 * 0.1, abs=1)
+
+
+def test_tracker_waits_for_enough_samples_and_floors_the_delay() -> None:
+    tracker = LatencyTracker(HedgeSettings(min_samples=3, min_delay=0.5))
+    now = time.monotonic()
+    tracker.observe("http://e.test", now - 0.01)
+    tracker.observe("http://e.test", now - 0.01)
+    assert tracker.hedge_delay("http://e.test") is None
+
+    tracker.observe("http://e.test", now - 0.01)
+    assert tracker.hedge_delay("http://e.test") == 0.5
+
+
+def test_slow_primary_is_hedged_and_the_backup_wins() -> None:
+    requests: List[float] = []
+
+    async def reply(name: str, body: Dict[str, Any]) -> httpx.Response:
+        requests.append(time.monotonic())
+        if len(requests) == 1:
+            await asyncio.sleep(5)
+        return httpx.Response(200, json={"content": "ok", "metadata": {}})
+
+    arena = MockArena(reply)
+    tracker = LatencyTracker(HedgeSettings(min_samples=1, min_delay=0.05, budget_burst=1))
+    tracker.sketch(arena.endpoint("judge0")).record(0.01)
+    client = LLMClient(
+        name="judge0",
+        endpoint=arena.endpoint("judge0"),
+        timeout=10,
+        max_retries=0,
+        pool=arena.pool,
+        limiters=LimiterRegistry(overrides={}),
+        latency=tracker,
+        replica_registry=ReplicaRegistry(),
+    )
+
+    started = time.monotonic()
+    _, metadata = asyncio.run(client.complete("vote", {"stage": "judging"}, hedge=True))
+
+    assert time.monotonic() - started < 1
+    assert metadata["hedge"] == {"fired": True, "delay_ms": 50.0, "winner": "backup"}
+    assert requests[1] - requests[0] >= 0.05
+    assert tracker.budget.fired == 1
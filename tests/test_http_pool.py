@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+
+from app.debate.balancer import ReplicaRegistry
+from app.debate.http_pool import HTTPClientPool, PoolSettings
+from app.debate.llm_client import LLMClient, LLMClientError
+from app.debate.rate_limit import LimiterRegistry
+
+LOCAL_URL = "http://arena.local:8000"
+
+
+def _local_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/slow/respond")
+    async def slow() -> dict:
+        await asyncio.sleep(30)
+        return {"content": "too late"}
+
+    @app.post("/broken/respond")
+    async def broken() -> dict:
+        raise RuntimeError("participant crashed")
+
+    @app.post("/ok/respond")
+    async def ok() -> dict:
+        return {"content": "fine", "metadata": {}}
+
+    return app
+
+
+def _client(pool: HTTPClientPool, path: str, timeout: float = 0.2) -> LLMClient:
+    return LLMClient(
+        name=path,
+        endpoint=f"{LOCAL_URL}/{path}/respond",
+        timeout=timeout,
+        max_retries=0,
+        pool=pool,
+        limiters=LimiterRegistry(overrides={}),
+        replica_registry=ReplicaRegistry(),
+    )
+
+
+def _pool() -> HTTPClientPool:
+    pool = HTTPClientPool(PoolSettings(local_dispatch=True))
+    pool.register_local_app(LOCAL_URL, _local_app())
+    return pool
+
+
+def test_slow_local_app_honours_call_timeout() -> None:
+    async def scenario() -> float:
+        pool = _pool()
+        started = time.monotonic()
+        try:
+            with pytest.raises(LLMClientError, match="request failed"):
+                await _client(pool, "slow").complete("hi", {"stage": "opening"})
+        finally:
+            await pool.aclose()
+        return time.monotonic() - started
+
+    assert asyncio.run(scenario()) < 5
+
+
+def test_raising_local_app_is_reported_as_server_error() -> None:
+    async def scenario() -> None:
+        pool = _pool()
+        try:
+            with pytest.raises(LLMClientError, match="responded with 500"):
+                await _client(pool, "broken").complete("hi", {"stage": "opening"})
+            content, _ = await _client(pool, "ok").complete("hi", {"stage": "opening"})
+            assert content == "fine"
+        finally:
+            await pool.aclose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict
+
+import httpx
+
+from app.debate.models import DebateResponse
+from mock_arena import MockArena, judge_ballot
+
+HUNG = {"judge3", "judge4"}
+
+
+def _run(arena: MockArena, **options: Any) -> DebateResponse:
+    return asyncio.run(arena.orchestrator(arena.request(**options)).run())
+
+
+def _votes(response: DebateResponse) -> Dict[str, str]:
+    return {vote.judge_name: vote.vote for vote in response.judge_votes}
+
+
+def test_quorum_closes_judging_and_cancels_stragglers() -> None:
+    async def reply(name: str, body: Dict[str, Any]) -> httpx.Response:
+        if name in HUNG:
+            await asyncio.sleep(60)
+        return await arena.default_reply(name, body)
+
+    arena = MockArena(reply)
+    started = time.monotonic()
+    response = _run(arena, judge_quorum=3, judge_grace_seconds=0)
+
+    assert time.monotonic() - started < 5
+    assert _votes(response) == {
+        "Judge 0": "affirmative",
+        "Judge 1": "affirmative",
+        "Judge 2": "affirmative",
+        "Judge 3": "abstain",
+        "Judge 4": "abstain",
+    }
+    assert {vote.metadata["reason"] for vote in response.judge_votes[3:]} == {"cancelled"}
+    assert response.metadata["judging"] == {
+        "quorum": 3,
+        "closed_early": True,
+        "valid_ballots": 3,
+        "abstentions": 2,
+    }
+
+
+def test_ballots_arriving_within_the_grace_period_still_count() -> None:
+    async def reply(name: str, body: Dict[str, Any]) -> httpx.Response:
+        if name == "judge3":
+            await asyncio.sleep(0.05)
+        if name == "judge4":
+            await asyncio.sleep(60)
+        if name.startswith("judge"):
+            return judge_ballot("negative" if name == "judge3" else "affirmative")
+        return await arena.default_reply(name, body)
+
+    arena = MockArena(reply)
+    response = _run(arena, judge_quorum=3, judge_grace_seconds=1)
+
+    assert _votes(response)["Judge 3"] == "negative"
+    assert _votes(response)["Judge 4"] == "abstain"
+    assert response.metadata["judging"]["valid_ballots"] == 4
+
+
+def test_judging_closes_once_the_winner_cannot_change() -> None:
+    async def reply(name: str, body: Dict[str, Any]) -> httpx.Response:
+        if name in HUNG:
+            await asyncio.sleep(60)
+        return await arena.default_reply(name, body)
+
+    arena = MockArena(reply)
+    # Three unanimous ballots lead by more than the two still outstanding.
+    response = _run(arena, judge_quorum=5, judge_grace_seconds=0)
+
+    assert response.metadata["judging"]["closed_early"] is True
+    assert list(_votes(response).values()).count("abstain") == 2
+
+
+def test_failed_judge_abstains_without_failing_the_debate() -> None:
+    async def reply(name: str, body: Dict[str, Any]) -> httpx.Response:
+        if name == "judge2":
+            return httpx.Response(422, json={"detail": "unparseable prompt"})
+        return await arena.default_reply(name, body)
+
+    arena = MockArena(reply)
+    response = _run(arena)
+
+    failed = next(vote for vote in response.judge_votes if vote.judge_name == "Judge 2")
+    assert failed.vote == "abstain"
+    assert failed.metadata["reason"] == "failed"
+    assert response.metadata["judging"] == {
+        "quorum": None,
+        "closed_early": False,
+        "valid_ballots": 4,
+        "abstentions": 1,
+    }
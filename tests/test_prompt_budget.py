@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List
+
+import httpx
+
+from app.debate.models import StageKind
+from app.debate.prompt_budget import ELLIPSIS, MIN_ITEM_TOKENS, estimate_tokens, fit_prompt, trim_text
+from mock_arena import MockArena
+
+
+def _render(turns: List[str], notes: List[str] = ()) -> str:
+    return "Transcript:\n" + "\n".join(turns) + "\nNotes:\n" + "\n".join(notes)
+
+
+def _turn(n: int) -> str:
+    return f"Turn {n}: " + "cars pollute the downtown air " * 4
+
+
+def test_estimate_counts_cjk_wider_than_latin() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a" * 10) == 3
+    assert estimate_tokens("汽车" * 5) == 6
+
+
+def test_unbounded_stage_is_left_alone() -> None:
+    turns = [_turn(n) for n in range(20)]
+    prompt, report = fit_prompt(_render, {"turns": turns}, None)
+
+    assert prompt == _render(turns)
+    assert report.as_metadata() == {"prompt_tokens_estimate": estimate_tokens(prompt)}
+
+
+def test_oldest_items_go_first() -> None:
+    turns = [_turn(n) for n in range(10)]
+    budget = estimate_tokens(_render(turns[-3:]))
+    prompt, report = fit_prompt(_render, {"turns": turns}, budget)
+
+    assert prompt == _render(turns[-3:])
+    assert report.tokens <= budget
+    assert (report.dropped, report.trimmed) == (7, 0)
+
+
+def test_newest_first_lists_lose_their_tail() -> None:
+    notes = [_turn(n) for n in range(10)][::-1]
+    budget = estimate_tokens(_render([], notes[:3]))
+    prompt, report = fit_prompt(_render, {"turns": [], "notes": notes}, budget, newest_first=("notes",))
+
+    assert prompt == _render([], notes[:3])
+    assert report.dropped == 7
+
+
+def test_largest_list_is_shrunk_before_smaller_ones() -> None:
+    lists = {"turns": [_turn(n) for n in range(8)], "notes": ["short note"]}
+    budget = estimate_tokens(_render(lists["turns"][-2:], lists["notes"]))
+    prompt, _ = fit_prompt(_render, lists, budget)
+
+    assert "short note" in prompt
+    assert lists["turns"][0] not in prompt
+
+
+def test_last_item_is_trimmed_then_dropped() -> None:
+    turn = "Closing: " + "x " * 400
+    budget = estimate_tokens(_render([])) + 40
+    prompt, report = fit_prompt(_render, {"turns": [turn]}, budget)
+
+    assert report.tokens <= budget
+    assert report.trimmed == 1 and report.dropped == 0
+    assert ELLIPSIS in prompt
+
+    prompt, report = fit_prompt(_render, {"turns": [turn]}, estimate_tokens(_render([])) + MIN_ITEM_TOKENS - 1)
+    assert prompt == _render([])
+    assert report.dropped == 1
+
+    assert trim_text("short", 100) == "short"
+
+
+def test_judging_budget_is_applied_to_the_judge_prompt() -> None:
+    prompts: List[str] = []
+
+    async def reply(name: str, body: Dict[str, Any]) -> httpx.Response:
+        if name.startswith("judge"):
+            prompts.append(body["prompt"])
+        return await arena.default_reply(name, body)
+
+    arena = MockArena(reply)
+    unbounded = asyncio.run(arena.orchestrator(arena.request(max_freeform_rounds=4)).run())
+    unbounded_size = estimate_tokens(prompts[0])
+    prompts.clear()
+
+    budget = unbounded_size // 2
+    bounded = asyncio.run(
+        arena.orchestrator(
+            arena.request(max_freeform_rounds=4, prompt_token_budgets={StageKind.JUDGING: budget})
+        ).run()
+    )
+
+    assert all(estimate_tokens(prompt) <= budget for prompt in prompts)
+    assert bounded.judge_votes[0].metadata["prompt_budget"]["budget"] == budget
+    assert "prompt_budget" not in unbounded.judge_votes[0].metadata
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from app.debate.balancer import ReplicaRegistry
+from app.debate.llm_client import LLMClient
+from app.debate.rate_limit import EndpointLimiter, LimiterRegistry, LimiterSettings, TokenBucket
+from host_service.http_utils import MAX_RETRY_DELAY_SECONDS
+from mock_arena import MockArena
+
+
+def test_token_bucket_lets_a_burst_through_then_charges_debt() -> None:
+    bucket = TokenBucket(rate_per_second=10, capacity=2)
+
+    assert bucket.reserve(1) == 0
+    assert bucket.reserve(1) == 0
+    assert bucket.reserve(1) == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve(1) == pytest.approx(0.2, abs=0.01)
+
+
+def test_token_bucket_caps_oversized_reservations_and_disables_at_zero_rate() -> None:
+    bucket = TokenBucket(rate_per_second=100, capacity=1000)
+    # A prompt larger than a minute's budget waits for one full bucket, not forever.
+    assert bucket.reserve(50_000) == 0
+    assert bucket.reserve(50_000) == pytest.approx(10, abs=0.1)
+
+    assert TokenBucket(rate_per_second=0, capacity=0).reserve(1_000_000) == 0
+
+
+def test_slot_bounds_calls_in_flight() -> None:
+    peak: List[int] = []
+
+    async def main() -> None:
+        limiter = EndpointLimiter(LimiterSettings(max_in_flight=2))
+
+        async def call() -> None:
+            async with limiter.slot():
+                peak.append(limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(call() for _ in range(6)))
+        assert limiter.snapshot() == {"in_flight": 0, "queued": 0}
+
+    asyncio.run(main())
+    assert max(peak) == 2
+
+
+def test_defer_is_capped_like_the_gateway() -> None:
+    async def main() -> None:
+        limiter = EndpointLimiter(LimiterSettings())
+        limiter.defer(3600)
+        assert limiter.blocked_until - time.monotonic() <= MAX_RETRY_DELAY_SECONDS
+
+    asyncio.run(main())
+
+
+def test_retry_after_pauses_the_whole_endpoint() -> None:
+    statuses: List[int] = []
+
+    async def reply(name: str, body: Dict[str, Any]) -> httpx.Response:
+        if not statuses:
+            statuses.append(429)
+            return httpx.Response(429, headers={"Retry-After": "1"}, json={"detail": "slow down"})
+        statuses.append(200)
+        return httpx.Response(200, json={"content": "ok", "metadata": {}})
+
+    arena = MockArena(reply)
+    limiters = LimiterRegistry(defaults=LimiterSettings(), overrides={})
+    client = LLMClient(
+        name="ada",
+        endpoint=arena.endpoint("ada"),
+        timeout=5,
+        max_retries=1,
+        pool=arena.pool,
+        limiters=limiters,
+        replica_registry=ReplicaRegistry(),
+    )
+
+    async def main() -> Dict[str, Any]:
+        started = time.monotonic()
+        _, metadata = await client.complete("hi", {"stage": "opening"})
+        metadata["elapsed"] = time.monotonic() - started
+        return metadata
+
+    metadata = asyncio.run(main())
+
+    assert statuses == [429, 200]
+    assert metadata["rate_limit"]["attempts"] == 2
+    # Longer than the retry backoff alone (at most 0.5s), so the hint was honoured.
+    assert metadata["elapsed"] >= 1
+    assert limiters.get(arena.endpoint("ada")).blocked_until > 0
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Any, Dict, List, Tuple
+
+import httpx
+import pytest
+
+from app.debate.scheduler import StageNode, StageScheduler
+from mock_arena import MockArena
+
+
+def test_later_stage_events_are_held_until_earlier_stages_commit() -> None:
+    events: List[Tuple[str, Any]] = []
+    first_may_finish = asyncio.Event()
+
+    async def sink(event_type: str, data: Any) -> None:
+        events.append((event_type, data))
+
+    async def main() -> Dict[str, Any]:
+        scheduler: StageScheduler
+
+        async def first() -> None:
+            await scheduler.emit("debate_turn", {"stage": "first", "n": 1})
+            await first_may_finish.wait()
+            await scheduler.emit("debate_turn", {"stage": "first", "n": 2})
+
+        async def second() -> None:
+            await scheduler.emit("debate_turn", {"stage": "second", "n": 1})
+            # ``first`` is still running, so nothing from this node may have reached the sink.
+            assert [data["stage"] for _, data in events] == ["first"]
+            first_may_finish.set()
+
+        async def third() -> None:
+            await scheduler.emit("debate_turn", {"stage": "third", "n": 1})
+
+        scheduler = StageScheduler(
+            [
+                StageNode("first", first),
+                StageNode("second", second),
+                StageNode("third", third, after=("first", "second")),
+            ],
+            sink=sink,
+        )
+        return await scheduler.run()
+
+    report = asyncio.run(main())
+
+    assert [(data["stage"], data["n"]) for _, data in events] == [
+        ("first", 1),
+        ("first", 2),
+        ("second", 1),
+        ("third", 1),
+    ]
+    assert report["stages"]["third"]["after"] == ["first", "second"]
+    assert report["critical_path"][-1] == "third"
+
+
+def test_buffered_deltas_replay_as_one_chunk() -> None:
+    events: List[Tuple[str, Any]] = []
+    first_may_finish = asyncio.Event()
+
+    async def sink(event_type: str, data: Any) -> None:
+        events.append((event_type, data))
+
+    async def main() -> None:
+        scheduler: StageScheduler
+
+        async def first() -> None:
+            await first_may_finish.wait()
+
+        async def second() -> None:
+            for piece in ("Cars ", "should ", "go."):
+                await scheduler.emit("turn_delta", {"stage": "second", "delta": piece})
+            await scheduler.emit("debate_turn", {"stage": "second", "content": "Cars should go."})
+            first_may_finish.set()
+
+        scheduler = StageScheduler([StageNode("first", first), StageNode("second", second)], sink=sink)
+        await scheduler.run()
+
+    asyncio.run(main())
+
+    assert events == [
+        ("turn_delta", {"stage": "second", "delta": "Cars should go."}),
+        ("debate_turn", {"stage": "second", "content": "Cars should go."}),
+    ]
+
+
+@pytest.mark.parametrize(
+    "nodes",
+    [
+        [StageNode("a", None, after=("missing",))],
+        [StageNode("a", None, after=("b",)), StageNode("b", None)],
+    ],
+)
+def test_dependencies_must_name_earlier_stages(nodes: List[StageNode]) -> None:
+    with pytest.raises(ValueError):
+        StageScheduler(nodes)
+
+
+def test_concurrent_stages_stream_in_canonical_order() -> None:
+    jitter = random.Random(13)
+
+    async def reply(name: str, body: Dict[str, Any]) -> httpx.Response:
+        # Random latencies let later blocks finish before earlier ones.
+        await asyncio.sleep(jitter.uniform(0, 0.02))
+        return await arena.default_reply(name, body)
+
+    arena = MockArena(reply)
+    concurrent: List[Tuple[str, Any]] = []
+    sequential: List[Tuple[str, Any]] = []
+
+    async def main() -> None:
+        await arena.orchestrator(arena.request(concurrent_stages=True), events=concurrent).run()
+        await arena.orchestrator(arena.request(concurrent_stages=False), events=sequential).run()
+
+    asyncio.run(main())
+
+    def turns(events: List[Tuple[str, Any]]) -> List[str]:
+        return [data["stage"] for event_type, data in events if event_type in {"debate_turn", "host_interlude"}]
+
+    assert turns(concurrent) == turns(sequential)
+    assert concurrent[-1][0] == sequential[-1][0] == "complete"
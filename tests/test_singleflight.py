@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List, Tuple
+
+import pytest
+
+from host_service.singleflight import SingleFlight, request_key
+
+MESSAGES = [{"role": "user", "content": "Who won?"}]
+
+
+def test_request_key_covers_everything_that_shapes_the_completion() -> None:
+    key = request_key(MESSAGES, "deepseek-chat", 0.2)
+
+    assert key == request_key([dict(MESSAGES[0])], "deepseek-chat", 0.2)
+    assert key != request_key(MESSAGES, "deepseek-chat", 0.7)
+    assert key != request_key(MESSAGES, "deepseek-reasoner", 0.2)
+
+
+def test_identical_concurrent_calls_share_one_upstream_request() -> None:
+    calls: List[int] = []
+
+    async def upstream() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "affirmative"
+
+    async def main() -> Tuple[List[Tuple[str, bool]], SingleFlight]:
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("ballot", upstream) for _ in range(5)))
+        # Once settled the key is forgotten, so a later call goes upstream again.
+        results.append(await flight.do("ballot", upstream))
+        return results, flight
+
+    results, flight = asyncio.run(main())
+
+    assert [shared for _, shared in results] == [False, True, True, True, True, False]
+    assert {value for value, _ in results} == {"affirmative"}
+    assert len(calls) == 2
+    assert (flight.leaders, flight.followers, flight.in_flight) == (2, 4, 0)
+
+
+def test_errors_reach_every_waiter() -> None:
+    async def upstream() -> str:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream 500")
+
+    async def main() -> List[BaseException]:
+        flight = SingleFlight()
+        return await asyncio.gather(*(flight.do("ballot", upstream) for _ in range(3)), return_exceptions=True)
+
+    errors = asyncio.run(main())
+    assert [str(error) for error in errors] == ["upstream 500"] * 3
+
+
+def test_shared_call_survives_until_the_last_caller_leaves() -> None:
+    cancelled: List[bool] = []
+
+    async def upstream() -> str:
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "negative"
+
+    async def main() -> None:
+        flight = SingleFlight()
+        leader = asyncio.ensure_future(flight.do("ballot", upstream))
+        follower = asyncio.ensure_future(flight.do("ballot", upstream))
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert await follower == ("negative", True)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert cancelled == []
+
+        lone = asyncio.ensure_future(flight.do("other", upstream))
+        await asyncio.sleep(0)
+        lone.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await lone
+        await asyncio.sleep(0)
+        assert cancelled == [True]
+        assert flight.in_flight == 0
+
+    asyncio.run(main())
@@ -115,6 +115,8 @@ let isRequestInFlight = false;
 let judgePresets = [];
 let judgePresetCursor = 0;
 let streamAbortController = null;
+const MAX_STREAM_RECONNECTS = 5;
+const STREAM_RECONNECT_DELAY_MS = 1000;
 
 const MIN_JUDGES = Number((judgeGrid && judgeGrid.dataset && judgeGrid.dataset.min) || 5);
 const MAX_JUDGES = 12;
@@ -927,6 +929,8 @@ function renderJudgeVotes(debate) {
       voteTd.textContent = "正方";
     } else if (vote.vote === "negative") {
       voteTd.textContent = "反方";
+    } else if (vote.vote === "abstain") {
+      voteTd.textContent = "弃权";
     } else {
       voteTd.textContent = "平局";
     }
@@ -948,6 +952,18 @@ function renderDebate(debate) {
   saveButton.disabled = false;
 }
 
+function parseEventFrame(rawEvent) {
+  const lines = rawEvent.split("\n");
+  const dataLine = lines.find((line) => line.startsWith("data:"));
+  if (!dataLine) return null;
+  const jsonText = dataLine.replace(/^data:\s*/, "");
+  if (!jsonText) return null;
+  const idLine = lines.find((line) => line.startsWith("id:"));
+  const id = idLine ? Number(idLine.replace(/^id:\s*/, "")) : null;
+  return { event: JSON.parse(jsonText), id };
+}
+
+// onEvent(event, id) may return false to stop reading (the stream is then cancelled).
 async function readEventStream(stream, onEvent) {
   const reader = stream.getReader();
   const decoder = new TextDecoder("utf-8");
@@ -959,16 +975,10 @@ async function readEventStream(stream, onEvent) {
       const rawEvent = buffer.slice(0, boundaryIndex).trim();
       buffer = buffer.slice(boundaryIndex + 2);
       if (rawEvent) {
-        const dataLine = rawEvent
-          .split("\n")
-          .find((line) => line.startsWith("data:"));
-        if (dataLine) {
-          const jsonText = dataLine.replace(/^data:\s*/, "");
-          if (jsonText) {
-            const parsed = JSON.parse(jsonText);
-            // eslint-disable-next-line no-await-in-loop
-            await onEvent(parsed);
-          }
+        const frame = parseEventFrame(rawEvent);
+        // eslint-disable-next-line no-await-in-loop
+        if (frame && (await onEvent(frame.event, frame.id)) === false) {
+          return false;
         }
       }
       boundaryIndex = buffer.indexOf("\n\n");
@@ -977,34 +987,82 @@ async function readEventStream(stream, onEvent) {
     if (forceFlush && buffer.trim()) {
       const remaining = buffer.trim();
       buffer = "";
-      const dataLine = remaining
-        .split("\n")
-        .find((line) => line.startsWith("data:"));
-      if (dataLine) {
-        const jsonText = dataLine.replace(/^data:\s*/, "");
-        if (jsonText) {
-          await onEvent(JSON.parse(jsonText));
-        }
+      const frame = parseEventFrame(remaining);
+      if (frame) {
+        await onEvent(frame.event, frame.id);
       }
     }
+    return true;
   }
 
   while (true) {
-    const { value, done } = await reader.read();
+    let chunk;
+    try {
+      // eslint-disable-next-line no-await-in-loop
+      chunk = await reader.read();
+    } catch (error) {
+      // A dropped connection rejects here; the caller may resume from the last id.
+      if (error.name !== "AbortError") {
+        error.streamDropped = true;
+      }
+      throw error;
+    }
+    const { value, done } = chunk;
     if (done) break;
     buffer += decoder.decode(value, { stream: true });
     // eslint-disable-next-line no-await-in-loop
-    await processBuffer(false);
+    if ((await processBuffer(false)) === false) {
+      await reader.cancel();
+      return;
+    }
   }
   buffer += decoder.decode();
   await processBuffer(true);
 }
 
+let liveDraft = null;
+
+function renderLiveDraft(payload) {
+  if (!liveDraft || liveDraft.stage !== payload.stage) {
+    const container = document.createElement("article");
+    container.className = "timeline-item";
+    const title = document.createElement("h4");
+    const content = document.createElement("p");
+    content.className = "timeline-content";
+    if (payload.speaker_role === "host") {
+      container.classList.add("host");
+      title.textContent = HOST_STAGE_LABELS[payload.stage] || "主持人串场";
+    } else {
+      const speaker = payload.speaker_role === "affirmative" ? "正方" : "反方";
+      container.classList.add(payload.speaker_role);
+      title.textContent = `${speaker} · ${payload.speaker_name}`;
+    }
+    const meta = document.createElement("div");
+    meta.className = "timeline-meta";
+    meta.textContent = "正在发言…";
+    container.append(meta, title, content);
+    timeline.appendChild(container);
+    liveDraft = { stage: payload.stage, node: container, content };
+  }
+  liveDraft.content.textContent += payload.delta || "";
+  timeline.scrollTop = timeline.scrollHeight;
+}
+
 async function handleStreamingEvent(event) {
   if (!event || !event.type) return;
   const { type } = event;
   const payload = event.payload || {};
 
+  if (type === "turn_delta") {
+    if (!currentDebate) return;
+    renderLiveDraft(payload);
+    return;
+  }
+
+  if (type === "host_interlude" || type === "debate_turn") {
+    liveDraft = null;
+  }
+
   if (type === "host_interlude") {
     if (!currentDebate) return;
     currentDebate.interludes = currentDebate.interludes || [];
@@ -1123,12 +1181,56 @@ async function startDebate(event) {
       throw new Error(error.detail || "服务端返回错误。");
     }
 
-    await readEventStream(response.body, async (evt) => {
-      if (evt.type === "complete") {
-        receivedCompletion = true;
+    // Resume from the last event seen when the connection drops or the server
+    // reports that it had to drop events because this client fell behind.
+    const debateId = response.headers.get("X-Debate-Id");
+    let lastEventId = null;
+    let reconnects = 0;
+    let stream = response.body;
+    while (true) {
+      if (stream) {
+        try {
+          // eslint-disable-next-line no-await-in-loop
+          await readEventStream(stream, async (evt, id) => {
+            if (evt.type === "events_dropped") {
+              return false;
+            }
+            if (id !== null) {
+              lastEventId = id;
+            }
+            if (evt.type === "complete") {
+              receivedCompletion = true;
+            }
+            await handleStreamingEvent(evt);
+            return true;
+          });
+        } catch (error) {
+          if (!error.streamDropped) throw error;
+        }
       }
-      await handleStreamingEvent(evt);
-    });
+      if (receivedCompletion || !debateId || reconnects >= MAX_STREAM_RECONNECTS) {
+        break;
+      }
+      reconnects += 1;
+      const query = lastEventId === null ? "" : `?last_event_id=${lastEventId}`;
+      try {
+        // eslint-disable-next-line no-await-in-loop
+        const resumed = await fetch(
+          `/api/debate/${encodeURIComponent(debateId)}/events${query}`,
+          { signal: controller.signal },
+        );
+        if (!resumed.ok) break;
+        stream = resumed.body;
+      } catch (error) {
+        if (error.name === "AbortError") throw error;
+        // Server unreachable for now: back off and try again.
+        stream = null;
+        // eslint-disable-next-line no-await-in-loop
+        await new Promise((resolve) => {
+          setTimeout(resolve, STREAM_RECONNECT_DELAY_MS * reconnects);
+        });
+      }
+    }
 
     if (!receivedCompletion) {
       throw new Error("辩论尚未完成即断开连接。");